@@ -0,0 +1,86 @@
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+DEFAULT_BUDGET_FILE = "benchmarks/import_budget.yml"
+
+# "import time:      self [us] |  cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_import(module: str, repeats: int = 3) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Import ``module`` in fresh interpreters with ``-X importtime``.
+
+    Returns:
+        Tuple[float, List[Tuple[str, float]]]: Median cumulative import time in
+            seconds, and the top-level imports of the fastest run with their
+            cumulative seconds, slowest first.
+    """
+    runs = []
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+        imports = []
+        for line in completed.stderr.splitlines():
+            match = _IMPORTTIME_LINE.match(line)
+            # One space of indentation marks an import made directly by the -c statement
+            if match and len(match.group(3)) == 1:
+                imports.append((match.group(4), int(match.group(2)) / 1e6))
+        runs.append((sum(seconds for _, seconds in imports), imports))
+
+    fastest = min(runs, key=lambda run: run[0])[1]
+    return statistics.median(total for total, _ in runs), sorted(fastest, key=lambda i: -i[1])
+
+
+def check_budgets(budgets: Dict[str, float], repeats: int = 3, top: int = 5) -> List[str]:
+    """
+    Measure every module of ``budgets`` and return the ones over budget.
+    """
+    failures = []
+    for module, budget in budgets.items():
+        seconds, imports = measure_import(module, repeats)
+        status = "OK" if seconds <= budget else "OVER"
+        print(f"{status:>4} {module:<40} {seconds:7.3f}s (budget {budget:.3f}s)")
+        if status == "OVER":
+            for name, cumulative in imports[:top]:
+                print(f"       {name:<37} {cumulative:7.3f}s")
+            failures.append(f"{module}: {seconds:.3f}s > {budget:.3f}s")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fail when module import time exceeds its budget")
+    parser.add_argument("--budget-file", default=DEFAULT_BUDGET_FILE)
+    parser.add_argument("--modules", nargs="+", default=None, help="Only check these modules")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with open(args.budget_file, "r") as f:
+        budgets = {module: float(seconds) for module, seconds in yaml.safe_load(f).items()}
+    if args.modules:
+        unknown = set(args.modules) - set(budgets)
+        if unknown:
+            parser.error(f"No budget for {sorted(unknown)} in {args.budget_file}")
+        budgets = {module: budgets[module] for module in args.modules}
+
+    # Run from the project root, ``python -c`` puts the working directory on sys.path
+    failures = check_budgets(budgets, args.repeats)
+    for failure in failures:
+        print(f"Over budget: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+import argparse
+import csv
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import train_test_split
+
+from benchmarks.synthetic_data import generate_housing
+from helper.catalogue import get_asset_spec
+from helper.row_key import ROW_KEY
+
+RESULT_FIELDS = [
+    "recorded_at", "engine", "scale", "node", "rows", "seconds", "rows_per_second", "peak_memory_mb"
+]
+
+
+def _measure(engine: str, scale: int, node: str, func: Callable[[], int]) -> dict:
+    """
+    Run ``func`` (which returns the number of rows it produced) and time it.
+    """
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        rows = func()
+    finally:
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    result = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "engine": engine,
+        "scale": scale,
+        "node": node,
+        "rows": rows,
+        "seconds": round(seconds, 4),
+        "rows_per_second": round(rows / seconds, 1) if seconds > 0 else None,
+        "peak_memory_mb": round(peak / (1024 * 1024), 2),
+    }
+    print(f"{engine:>15} x{scale:<5} {node:<16} {rows:>10} rows {seconds:8.3f}s")
+    return result
+
+
+def _memory_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(index=True, deep=True).sum() / (1024 * 1024)
+
+
+def _read_raw(asset_name: str, path: Path) -> pd.DataFrame:
+    spec = get_asset_spec(asset_name)
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(
+        path,
+        engine="pyarrow",
+        header=0 if spec.has_header else None,
+        names=None if spec.has_header else list(spec.columns),
+        dtype=spec.pandas_dtypes(),
+    )
+
+
+def benchmark_pandas(scale: int, paths: dict) -> List[dict]:
+    """
+    Pandas equivalents of the DE nodes, then the DS split and train.
+    """
+    state = {}
+
+    def preprocess():
+        housing = _read_raw("housing", paths["housing"])
+        for column in ("AveRooms", "AveBedrms", "AveOccup"):
+            housing[column] = housing[column].round(2)
+        state["processed_housing"] = housing
+        return len(housing)
+
+    def process():
+        lookup = _read_raw("lookup", paths["lookup"])
+        mastertable = state["processed_housing"].merge(lookup, on=ROW_KEY).drop(columns=ROW_KEY)
+        state["mastertable"] = mastertable
+        return len(mastertable)
+
+    def compact():
+        # Memory of the mastertable as compacted reads hold it (see the catalogue's float_atol)
+        from helper.data_helper import compact_dtypes
+
+        mastertable = state["mastertable"]
+        compacted = compact_dtypes(mastertable, get_asset_spec("mastertable"))
+        before, after = _memory_mb(mastertable), _memory_mb(compacted)
+        print(f"mastertable: {before:.2f} MB -> {after:.2f} MB after dtype compaction")
+        return len(compacted)
+
+    def split():
+        mastertable = state["mastertable"]
+        X = mastertable.drop("MedHouseVal", axis=1)
+        y = mastertable[["MedHouseVal"]]
+        state["split"] = train_test_split(X, y, test_size=0.33, random_state=42)
+        return len(mastertable)
+
+    def train():
+        x_train, _, y_train, _ = state["split"]
+        LinearRegression().fit(x_train, y_train)
+        return len(x_train)
+
+    return [
+        _measure("pandas", scale, node, func)
+        for node, func in [
+            ("preprocess_data", preprocess),
+            ("process_data", process),
+            ("compact_dtypes", compact),
+            ("training_split", split),
+            ("train", train),
+        ]
+    ]
+
+
+def benchmark_snowpark_local(scale: int, paths: dict) -> List[dict]:
+    """
+    The DE node transforms on a Snowpark local-testing session.
+    Requires a snowflake-snowpark-python version with local testing support.
+    """
+    from snowflake.snowpark import Session
+    from de_pipeline.nodes.preprocess_data import round_housing_features
+    from de_pipeline.nodes.process_data import join_housing_lookup
+    from helper.data_helper import read_snowpark
+    from helper.model_sql import prediction_parity, regression_metrics
+
+    session = Session.builder.config("local_testing", True).create()
+    stage = "@benchmark_stage"
+    session.sql(f"CREATE STAGE IF NOT EXISTS {stage.lstrip('@')}").collect()
+    refs = {}
+    for name, path in paths.items():
+        session.file.put(str(path), stage, auto_compress=False, overwrite=True)
+        refs[name] = f"{stage}/{path.name}"
+
+    state = {}
+
+    def preprocess():
+        housing = round_housing_features(read_snowpark(session, "housing", refs["housing"]))
+        state["processed_housing"] = session.create_dataframe(housing.to_pandas())
+        return state["processed_housing"].count()
+
+    def process():
+        lookup = read_snowpark(session, "lookup", refs["lookup"])
+        mastertable = join_housing_lookup(state["processed_housing"], lookup).to_pandas()
+        state["mastertable"] = session.create_dataframe(mastertable)
+        return len(mastertable)
+
+    def evaluate():
+        # Fit on the client, then score and aggregate with the compiled expression
+        mastertable = state["mastertable"]
+        pdf = mastertable.to_pandas()
+        target = next(c for c in pdf.columns if c.upper() == "MEDHOUSEVAL")
+        model = LinearRegression().fit(pdf.drop(columns=target), pdf[[target]])
+        prediction_parity(mastertable, model, atol=1e-6)
+        return regression_metrics(mastertable, model, target)["n_rows"]
+
+    try:
+        return [
+            _measure("snowpark_local", scale, node, func)
+            for node, func in [
+                ("preprocess_data", preprocess),
+                ("process_data", process),
+                ("evaluate_pushdown", evaluate),
+            ]
+        ]
+    finally:
+        session.close()
+
+
+ENGINES = {
+    "pandas": benchmark_pandas,
+    "snowpark_local": benchmark_snowpark_local,
+}
+
+
+def write_results(results: List[dict], output: Path) -> None:
+    output.parent.mkdir(parents=True, exist_ok=True)
+    new_file = not output.exists()
+    with open(output, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerows(results)
+
+
+def find_regressions(results: List[dict], baseline: Path, tolerance: float) -> List[str]:
+    """
+    Compare results with the latest baseline run of the same engine, scale and node.
+    """
+    reference = {}
+    with open(baseline, newline="") as f:
+        for row in csv.DictReader(f):
+            reference[(row["engine"], int(row["scale"]), row["node"])] = float(row["seconds"])
+
+    regressions = []
+    for result in results:
+        key = (result["engine"], result["scale"], result["node"])
+        if key in reference and result["seconds"] > reference[key] * (1 + tolerance):
+            regressions.append(
+                f"{key}: {result['seconds']}s vs baseline {reference[key]}s (+{tolerance:.0%} allowed)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=["pandas"])
+    parser.add_argument("--file-type", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--data-dir", default="data/benchmarks")
+    parser.add_argument("--output", default="data/benchmarks/results.csv")
+    parser.add_argument("--baseline", default=None, help="Results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs baseline")
+    args = parser.parse_args(argv)
+
+    results = []
+    for scale in args.scales:
+        paths = generate_housing(scale, f"{args.data_dir}/scale_{scale}", args.file_type)
+        for engine in args.engines:
+            results.extend(ENGINES[engine](scale, paths))
+
+    # Compare before writing, the baseline may be the results file itself
+    regressions = find_regressions(results, Path(args.baseline), args.tolerance) if args.baseline else []
+
+    write_results(results, Path(args.output))
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import argparse
+from pathlib import Path
+from typing import Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from helper.catalogue import get_asset_spec
+from helper.row_key import ROW_KEY, row_keys
+
+
+def load_base_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Load the 1x housing and lookup data from the catalogue's raw files.
+    """
+    frames = []
+    for asset_name in ("housing", "lookup"):
+        spec = get_asset_spec(asset_name)
+        frames.append(pd.read_csv(
+            spec.local_path,
+            header=0 if spec.has_header else None,
+            names=None if spec.has_header else list(spec.columns),
+            dtype=spec.pandas_dtypes(),
+        ))
+    housing, lookup = frames
+    if len(housing) != len(lookup):
+        raise ValueError("Raw housing and lookup files must be row-aligned.")
+    return housing, lookup
+
+
+def iter_replicas(housing: pd.DataFrame, lookup: pd.DataFrame, scale: int, seed: int = 42) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Yield ``scale`` copies of the base data, one at a time to bound memory.
+
+    Replica 0 is the base data. Later replicas jitter the coordinates and
+    population, then recompute ``row_key`` and write the same value to both
+    sides, so every housing row still joins to exactly its lookup row.
+    """
+    rng = np.random.default_rng(seed)
+    for replica in range(scale):
+        housing_part = housing.copy()
+        lookup_part = lookup.copy()
+        if replica > 0:
+            n_rows = len(housing_part)
+            housing_part["Latitude"] = (housing_part["Latitude"] + rng.normal(0, 0.01, n_rows)).round(4)
+            housing_part["Longitude"] = (housing_part["Longitude"] + rng.normal(0, 0.01, n_rows)).round(4)
+            housing_part["Population"] = np.maximum(
+                1.0, housing_part["Population"] + rng.integers(-5, 6, n_rows)
+            )
+            row_key = row_keys(housing_part)
+            housing_part[ROW_KEY] = row_key
+            lookup_part[ROW_KEY] = row_key.to_numpy()
+        yield housing_part, lookup_part
+
+
+def _write_part(df: pd.DataFrame, path: Path, file_type: str, header: bool, writer=None, first: bool = True):
+    if file_type == "csv":
+        df.to_csv(path, mode="w" if first else "a", header=header and first, index=False)
+        return None
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if writer is None:
+        writer = pq.ParquetWriter(path, table.schema)
+    writer.write_table(table)
+    return writer
+
+
+def generate_housing(scale: int, output_dir: str, file_type: str = "csv", seed: int = 42) -> dict:
+    """
+    Write ``housing_main`` and ``housing_lookup`` at ``scale`` times the base size.
+
+    Args:
+        scale (int): Number of replicas of the base data (1 to 1000).
+        output_dir (str): Directory receiving housing_main.<ext> and housing_lookup.<ext>.
+        file_type (str): 'csv' (same header layout as the raw files) or 'parquet'.
+        seed (int): Seed of the jitter applied to replicas.
+
+    Returns:
+        dict: Asset name ('housing', 'lookup') to written path.
+    """
+    if not 1 <= scale <= 1000:
+        raise ValueError("scale must be between 1 and 1000")
+    if file_type not in ("csv", "parquet"):
+        raise ValueError(f"Unsupported file type: {file_type}")
+
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "housing": output / f"housing_main.{file_type}",
+        "lookup": output / f"housing_lookup.{file_type}",
+    }
+    headers = {name: get_asset_spec(name).has_header for name in paths}
+
+    housing, lookup = load_base_data()
+    writers = {"housing": None, "lookup": None}
+    try:
+        for replica, parts in enumerate(iter_replicas(housing, lookup, scale, seed)):
+            for name, part in zip(("housing", "lookup"), parts):
+                writers[name] = _write_part(
+                    part, paths[name], file_type, headers[name], writers[name], first=replica == 0
+                )
+    finally:
+        for writer in writers.values():
+            if writer is not None:
+                writer.close()
+
+    print(f"Generated {scale}x data ({scale * len(housing)} rows) in {output}")
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--output-dir", default="data/benchmarks/scale_1")
+    parser.add_argument("--file-type", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    generate_housing(args.scale, args.output_dir, args.file_type, args.seed)
@@ -1,68 +1,84 @@
 import pandas as pd
-from helper.data_helper import map_data_assets, get_data_reference, save_dataframes
+from helper.catalogue import get_asset_spec
+from helper.data_helper import _to_pandas, create_snowpark, map_data_assets, get_data_reference
 from helper.snowflake_data_helper import SnowflakeDataHelper
+from helper.fingerprint import fingerprinted
+from helper.fusion import active_fusion
+from helper.incremental import IncrementalReader
+from helper.profiling import profiled
+from helper.row_key import ROW_KEY, load_key_index
 from snowflake.snowpark import Session
-from snowflake.snowpark.types import StructType, StructField, IntegerType, FloatType
+from snowflake.snowpark import DataFrame as SPDataFrame
 from snowflake.snowpark.functions import col, round
 
-# Define the schema for CSV
-processed_housing_schema = StructType([
-    StructField("HouseAge", FloatType()),
-    StructField("AveRooms", FloatType()),
-    StructField("AveBedrms", FloatType()),
-    StructField("Population", FloatType()),
-    StructField("AveOccup", FloatType()),
-    StructField("Latitude", FloatType()),
-    StructField("Longitude", FloatType()),
-    StructField("data_id", FloatType())
-])
 
-lookup_schema = StructType([
-    StructField("MedInc", FloatType()),
-    StructField("MedHouseVal", FloatType()),
-    StructField("data_id", FloatType())
-])
+def join_housing_lookup(housing_df: SPDataFrame, lookup_df: SPDataFrame) -> SPDataFrame:
+    mastertable = housing_df.join(lookup_df, on=ROW_KEY)
+    return mastertable.drop(ROW_KEY)
 
 
-def process_data(session: Session, input_data: list[str], output_data: list[str], is_local) -> pd.DataFrame:
+def join_housing_lookup_indexed(session: Session, housing_df: SPDataFrame, sf_helper: SnowflakeDataHelper) -> SPDataFrame:
+    """
+    Local join against the saved sorted index of the lookup, which is only
+    rebuilt when the lookup files change.
+    """
+    # Snowpark returns upper-cased names, the index is probed with the declared ones
+    housing = _to_pandas(housing_df, get_asset_spec("processed_housing"))
+    mastertable = load_key_index("lookup", sf_helper).join(housing)
+    return create_snowpark(session, mastertable.drop(columns=ROW_KEY), "mastertable")
+
+
+@profiled
+@fingerprinted
+def process_data(
+    session: Session,
+    input_data: list[str],
+    output_data: list[str],
+    is_local,
+    mode: str = "full"
+) -> pd.DataFrame:
+    """
+    Args:
+        mode (str): 'full' rebuilds the mastertable, 'incremental' joins only
+            the processed_housing rows added since the last run with the full
+            lookup and appends them as a batch part.
+    """
     asset_paths = map_data_assets(input_data)
 
     sf_helper = SnowflakeDataHelper(session)
 
-    # Resolve the reference to the data (local path or Snowflake stage path)
-    housing_ref = get_data_reference(asset_paths["processed_housing"], sf_helper, is_local)
-    lookup_ref = get_data_reference(asset_paths["lookup"], sf_helper, is_local)
+    reader = IncrementalReader("process_data", input_data, output_data, session, is_local, sf_helper, mode=mode)
 
-    if is_local:
-        # housing_df = pd.read_csv(housing_ref)
-        housing_df = session.read.schema(processed_housing_schema).csv(housing_ref)
-        lookup_df = session.read.schema(lookup_schema).csv(lookup_ref)
+    # Handed over in memory in a fused run, otherwise read from its files
+    housing_df = reader.read("processed_housing")
+
+    if is_local and active_fusion() is None:
+        # Records the lookup's files for incremental runs, the join goes through its key index
+        reader.read("lookup")
+        mastertable = join_housing_lookup_indexed(session, housing_df, sf_helper)
+    elif is_local:
+        # Fused runs keep the join lazy, so it composes with the upstream plan
+        mastertable = join_housing_lookup(housing_df, reader.read("lookup"))
     else:
         try:
-            housing_df = session.read.schema(processed_housing_schema).csv(housing_ref)
-            lookup_df = session.read.schema(lookup_schema).csv(lookup_ref)
+            lookup_df = reader.read("lookup")
         except Exception as e:
             print(f"Snowflake read failed: {e}")
             print("Attempting to upload local file to Snowflake...")
 
             # Upload local file
+            lookup_ref = get_data_reference(asset_paths["lookup"], sf_helper, is_local)
             local_path = asset_paths["lookup"]["local_path"]
             sf_helper.save_file_to_stage(local_path, lookup_ref)
 
             # Retry reading after upload
-            lookup_df = session.read.schema(lookup_schema).csv(lookup_ref)
+            lookup_df = reader.read("lookup")
+
+        mastertable = join_housing_lookup(housing_df, lookup_df)
 
-    mastertable = housing_df.join(lookup_df, on="data_id")
-    
-    mastertable = mastertable.drop('data_id')
-    
     output_dict = {
         "mastertable": mastertable
     }
 
-    save_dataframes(
-        dataframes=output_dict,
-        data_assets=output_data,
-        is_local=is_local,
-        sf_helper=sf_helper
-    )
\ No newline at end of file
+    reader.save(output_dict, output_data, is_local)
+    reader.commit()
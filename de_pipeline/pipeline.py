@@ -1,39 +1,49 @@
-from de_pipeline.nodes.preprocess_data import preprocess_data
-from de_pipeline.nodes.process_data import process_data
+from helper.compute import NodeCompute
+from helper.data_helper import prewarm_catalogue_stages
+from helper.local_executor import LocalPipelineExecutor
 from helper.node import SnowflakeNodeBuilder
 from helper.pipeline import SnowflakePipelineBuilder
+from helper.snowflake_connect_manager import SessionPool
+from helper.snowflake_data_helper import SnowflakeDataHelper
 from snowflake.snowpark import Session
 
+# Lazy references, a node's module (and its dependencies) is only imported when it runs
+DE_NODES = {
+    "preprocess_data": "de_pipeline.nodes.preprocess_data:preprocess_data",
+    "process_data": "de_pipeline.nodes.process_data:process_data",
+}
+
 def register_de_nodes(session: Session):
     node_builder = SnowflakeNodeBuilder(session)
-    
-    node_builder.register_node(
-        func=preprocess_data,
-        name="de_preprocess_data_sproc",
-        database="KEDRO",
-        schema="PUBLIC"
-    )
 
-    node_builder.register_node(
-        func=process_data,
-        name="de_process_data_sproc",
+    # Node tasks run on the compute their pipeline definition node declares
+    pipeline_definition = get_de_pipeline_definition(is_local=False)
+    node_builder.register_nodes(
+        [
+            {
+                "func": DE_NODES[node],
+                "name": f"de_{config['function']}_sproc",
+                "compute": NodeCompute.from_config(config.get("compute"), node)
+            }
+            for node, config in pipeline_definition.items()
+        ],
         database="KEDRO",
         schema="PUBLIC"
     )
 
-def run_de_pipeline(session: Session, is_local: bool):
-    """
-        Orchestrate and run ML pipeline
-    """
-    pipeline_definition = {
+def get_de_pipeline_definition(is_local: bool, mode: str = "full") -> dict:
+    return {
         "preprocess_data": {
             "function": "preprocess_data",
             "depends_on": [],
             "params": {
                 "input_data": ['housing'], 
                 "output_data": ["processed_housing"], 
-                "is_local": is_local
-            }
+                "is_local": is_local,
+                "mode": mode
+            },
+            # Light cleaning step, serverless compute is billed per second of use
+            "compute": {"serverless": True, "initial_size": "XSMALL", "timeout_ms": 1800000}
         },
         "process_data": {
             "function": "process_data",
@@ -41,11 +51,47 @@ def run_de_pipeline(session: Session, is_local: bool):
             "params": {
                 "input_data": ['processed_housing', 'lookup'], 
                 "output_data": ["mastertable"], 
-                "is_local": is_local
-            }
+                "is_local": is_local,
+                "mode": mode
+            },
+            # The housing/lookup join, sized so it does not spill
+            "compute": {"warehouse_size": "MEDIUM", "timeout_ms": 3600000}
         }
     }
-    
+
+def run_de_pipeline(
+    session: Session,
+    is_local: bool,
+    max_workers: int = None,
+    session_pool: SessionPool = None,
+    fuse: bool = False,
+    mode: str = "full"
+):
+    """
+        Orchestrate and run ML pipeline
+
+        Local runs give each node its own session from ``session_pool`` when provided.
+        Fused runs (local or against the stage) execute the nodes from this
+        process on ``session``, composing their lazy DataFrames into one query
+        and only writing the assets the catalogue marks as persisted.
+        Incremental runs (``mode="incremental"``) only process the rows added
+        since the last run, as declared by each asset's ``incremental`` entry.
+    """
+    pipeline_definition = get_de_pipeline_definition(is_local, mode)
+
+    if is_local or fuse:
+        LocalPipelineExecutor(
+            pipeline_definition,
+            DE_NODES,
+            max_workers=max_workers,
+            session=session,
+            session_pool=session_pool,
+            fuse=fuse
+        ).run()
+        return
+
+    prewarm_catalogue_stages(SnowflakeDataHelper(session))
+
     pipeline_builder = SnowflakePipelineBuilder(
         session, 
         pipeline_definition, 
@@ -1,34 +1,67 @@
 import pandas as pd
 import numpy as np
 from sklearn.metrics import mean_squared_error, r2_score
+import io
 import pickle
-import shap
-import matplotlib.pyplot as pl
 
-from helper.data_helper import map_data_assets, save_dataframes
+from helper.catalogue import get_asset_spec
+from helper.data_helper import _open_source, get_data_reference, map_data_assets, read_snowpark, save_dataframes
+from helper.fingerprint import fingerprinted
+from helper.model_sql import regression_metrics
+from helper.profiling import profiled
+from helper.snowflake_data_helper import SnowflakeDataHelper
+from ds_pipeline.nodes.split_data import TARGET_COLUMN, read_partition
+from snowflake.snowpark import Session
 
-def evaluate(input_data: list[str], output_data: list[str], is_local) -> pd.DataFrame:
-    input_data_assets = map_data_assets(input_data, is_local)
-    output_data_assets = map_data_assets(output_data, is_local=is_local)
-    
-    x_test = pd.read_csv(input_data_assets['x_test'])
-    y_test = pd.read_csv(input_data_assets['y_test'])
+@profiled
+@fingerprinted
+def evaluate(
+    input_data: list[str],
+    output_data: list[str],
+    is_local,
+    fold: int = 0,
+    engine: str = "pandas",
+    score_asset: str = "mastertable",
+    session: Session = None
+) -> pd.DataFrame:
+    """
+    With the pandas engine, test rows come from the mastertable through the
+    split manifest when 'split_manifest' is an input, otherwise from x_test and y_test.
+
+    With the warehouse engine, the model is compiled to a SQL expression and
+    RMSE/R² are computed over ``score_asset`` in one aggregation, no rows are
+    pulled to the client. Positional split manifests cannot be pushed down, so
+    the whole asset is scored, training rows included. Those scores are not
+    comparable with test scores and are saved as ``<score_asset>_rmse`` and
+    ``<score_asset>_r2`` rather than ``rmse`` and ``r2``.
+
+    Args:
+        fold (int): Fold scored, for a k-fold split manifest.
+        engine (str): 'pandas' or 'warehouse'.
+        score_asset (str): Asset scored by the warehouse engine.
+        session (Session): Snowpark session, required by the warehouse engine.
+    """
+    sf_helper = SnowflakeDataHelper(session) if session is not None else None
 
     # load
-    with open(input_data_assets['lr_model'], 'rb') as f:
-        reg = pickle.load(f)
+    reg = _load_model(is_local, sf_helper)
 
-    y_pred = reg.predict(x_test)
-    
-    rmse = np.sqrt(mean_squared_error(y_test,y_pred))
-    r2 = r2_score(y_test, y_pred)
+    if engine == "warehouse":
+        if session is None:
+            raise ValueError("The warehouse engine needs a Snowpark session.")
+        score_ref = get_data_reference(map_data_assets([score_asset])[score_asset], sf_helper, is_local)
+        scores = regression_metrics(read_snowpark(session, score_asset, score_ref), reg, TARGET_COLUMN)
+        rmse, r2 = scores["rmse"], scores["r2"]
+        metric_names = [f"{score_asset}_rmse", f"{score_asset}_r2"]
+    elif engine == "pandas":
+        rmse, r2 = _pandas_metrics(reg, input_data, is_local, fold)
+        metric_names = ["rmse", "r2"]
+    else:
+        raise ValueError(f"Unsupported evaluation engine: {engine}")
 
     metrics_df = pd.DataFrame(
         {
-            "metrics":[
-                "rmse",
-                "r2"
-            ],
+            "metrics": metric_names,
             "score":[rmse, r2]
         }
     )
@@ -41,5 +74,28 @@ def evaluate(input_data: list[str], output_data: list[str], is_local) -> pd.Data
         dataframes=output_dict,
         data_assets=output_data,
         is_local=is_local,
-        save_type="csv"
-    )
\ No newline at end of file
+        sf_helper=sf_helper
+    )
+
+
+def _load_model(is_local, sf_helper: SnowflakeDataHelper = None):
+    # Inside a sproc the model is only on the stage, local runs read (or mirror) the local file
+    asset_spec = get_asset_spec("lr_model")
+    if not is_local and sf_helper is None:
+        raise ValueError("SnowflakeDataHelper must be provided for Snowflake read.")
+    source = _open_source(get_data_reference(asset_spec.to_dict(), sf_helper, is_local), sf_helper)
+    if isinstance(source, io.BytesIO):
+        return pickle.load(source)
+    with open(source, 'rb') as f:
+        return pickle.load(f)
+
+
+def _pandas_metrics(reg, input_data: list[str], is_local, fold: int):
+    # Only read the columns the model was fitted on
+    x_test, y_test = read_partition('test', input_data, is_local, fold=fold, features=list(reg.feature_names_in_))
+
+    y_pred = reg.predict(x_test)
+    
+    rmse = np.sqrt(mean_squared_error(y_test,y_pred))
+    r2 = r2_score(y_test, y_pred)
+    return rmse, r2
\ No newline at end of file
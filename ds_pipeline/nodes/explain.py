@@ -0,0 +1,167 @@
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from helper.data_helper import map_data_assets, save_dataframes
+from helper.fingerprint import fingerprinted
+from helper.profiling import profiled
+from ds_pipeline.nodes.split_data import TARGET_COLUMN, read_partition
+
+DEFAULT_PLOT_PATH = "data/08_reporting/shap_importance.png"
+
+
+def linear_shap_values(model, x: pd.DataFrame, background_mean: np.ndarray) -> Tuple[np.ndarray, float]:
+    """
+    Exact SHAP values of a linear model with independent features:
+    ``phi_ij = coef_j * (x_ij - E[x_j])``, computed in one vectorised operation.
+
+    Returns:
+        Tuple[np.ndarray, float]: Attributions (rows x features) and the base
+            value ``E[f(x)]``, so each row's attributions sum to its prediction
+            minus the base value.
+    """
+    coef = np.ravel(np.asarray(model.coef_, dtype=np.float64))
+    intercept = float(np.ravel(model.intercept_)[0])
+    values = (x.to_numpy(dtype=np.float64) - background_mean) * coef
+    return values, intercept + float(background_mean @ coef)
+
+
+def stratified_sample(x: pd.DataFrame, y: pd.Series, n_rows: int, seed: int = 42, n_strata: int = 10) -> pd.DataFrame:
+    """
+    Sample about ``n_rows`` rows of ``x`` keeping the distribution of ``y``
+    across its quantile bins.
+    """
+    if n_rows >= len(x):
+        return x
+    strata = pd.qcut(y.rank(method="first"), q=min(n_strata, n_rows), labels=False)
+    sample = x.groupby(strata.to_numpy(), group_keys=False).sample(frac=n_rows / len(x), random_state=seed)
+    return sample.sort_index()
+
+
+def _kernel_shap_batch(model, background: pd.DataFrame, batch: pd.DataFrame, nsamples) -> np.ndarray:
+    # Imported in the worker, shap is only needed for non-linear models
+    import shap
+
+    explainer = shap.KernelExplainer(model.predict, background)
+    return np.asarray(explainer.shap_values(batch, nsamples=nsamples, silent=True)).reshape(len(batch), -1)
+
+
+def kernel_shap_values(
+    model,
+    x: pd.DataFrame,
+    background: pd.DataFrame,
+    batch_rows: int = 200,
+    max_workers: Optional[int] = None,
+    nsamples="auto"
+) -> Tuple[np.ndarray, float]:
+    """
+    Model-agnostic SHAP values with KernelExplainer, evaluated in batches of
+    ``batch_rows`` rows on a process pool.
+    """
+    batches = [x.iloc[start:start + batch_rows] for start in range(0, len(x), batch_rows)]
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        results = list(pool.map(
+            _kernel_shap_batch,
+            [model] * len(batches),
+            [background] * len(batches),
+            batches,
+            [nsamples] * len(batches)
+        ))
+    base_value = float(np.mean(model.predict(background)))
+    return np.vstack(results), base_value
+
+
+def plot_importance(importance: pd.DataFrame, path: str = DEFAULT_PLOT_PATH) -> None:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    ordered = importance.sort_values("mean_abs_shap")
+    fig, ax = plt.subplots(figsize=(6, 0.4 * len(ordered) + 1))
+    ax.barh(ordered["feature"], ordered["mean_abs_shap"])
+    ax.set_xlabel("mean |SHAP value|")
+    fig.tight_layout()
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path)
+    plt.close(fig)
+
+
+@profiled
+@fingerprinted
+def explain(
+    input_data: list[str],
+    output_data: list[str],
+    is_local,
+    fold: int = 0,
+    background_rows: int = 100,
+    sample_rows: Optional[int] = 1000,
+    batch_rows: int = 200,
+    max_workers: Optional[int] = None,
+    plot: bool = False,
+    seed: int = 42
+) -> pd.DataFrame:
+    """
+    SHAP attributions of the model on the test partition, one row per
+    explained test row identified by its ``source_row`` in the mastertable
+    (its position in x_test when reading materialised splits).
+
+    Linear models get exact values for every test row. Other models use
+    KernelExplainer on ``sample_rows`` test rows against ``background_rows``
+    training rows, both sampled stratified on the target. As a fingerprinted
+    node, it is skipped while the model file and the data are unchanged.
+
+    Args:
+        fold (int): Test fold of a k-fold split manifest.
+        background_rows (int): Background rows for the kernel explainer.
+        sample_rows (int, optional): Test rows explained by the kernel explainer, None for all.
+        batch_rows (int): Rows per kernel explainer task.
+        max_workers (int, optional): Processes for the kernel explainer.
+        plot (bool): Also save a global importance bar chart.
+        seed (int): Seed of the samples.
+    """
+    input_data_assets = map_data_assets(input_data)
+    model_path = input_data_assets['lr_model']['local_path']
+    with open(model_path, 'rb') as f:
+        model_bytes = f.read()
+    model = pickle.loads(model_bytes)
+    model_hash = hashlib.sha256(model_bytes).hexdigest()[:16]
+
+    features = list(model.feature_names_in_)
+    x_test, y_test = read_partition('test', input_data, is_local, fold=fold, features=features)
+    x_train, y_train = read_partition('train', input_data, is_local, fold=fold, features=features)
+
+    if hasattr(model, "coef_") and hasattr(model, "intercept_"):
+        values, base_value = linear_shap_values(model, x_test, x_train.to_numpy(dtype=np.float64).mean(axis=0))
+    else:
+        if sample_rows:
+            x_test = stratified_sample(x_test, y_test[TARGET_COLUMN], sample_rows, seed)
+        background = stratified_sample(x_train, y_train[TARGET_COLUMN], background_rows, seed)
+        values, base_value = kernel_shap_values(model, x_test, background, batch_rows, max_workers)
+
+    shap_values_df = pd.DataFrame(values, columns=features)
+    # Position of the row in the split's source asset (the mastertable), kept by the manifest
+    shap_values_df.insert(0, "source_row", x_test.index.to_numpy(dtype=np.int64))
+    shap_values_df["base_value"] = base_value
+
+    shap_importance_df = pd.DataFrame({
+        "feature": features,
+        "mean_abs_shap": np.abs(values).mean(axis=0),
+        "mean_shap": values.mean(axis=0),
+    }).sort_values("mean_abs_shap", ascending=False, ignore_index=True)
+    shap_importance_df["model_hash"] = model_hash
+
+    save_dataframes(
+        dataframes={"shap_values": shap_values_df, "shap_importance": shap_importance_df},
+        data_assets=output_data,
+        is_local=is_local,
+        sf_helper=None
+    )
+
+    if plot:
+        plot_importance(shap_importance_df)
@@ -1,22 +1,140 @@
+import numpy as np
 import pandas as pd
 import pickle
 from pathlib import Path
+from typing import Iterable, Tuple
 
-from sklearn.linear_model import LinearRegression
-from helper.data_helper import map_data_assets
+from sklearn.linear_model import LinearRegression, SGDRegressor
+from helper.data_helper import iter_pandas_chunks, map_data_assets
+from helper.fingerprint import fingerprinted
+from helper.profiling import profiled
+from helper.split_manifest import iter_split_chunks, load_split_manifest
+from ds_pipeline.nodes.split_data import TARGET_COLUMN, read_partition
 
-def train(input_data: list[str], output_data: list[str], is_local) -> pd.DataFrame:
-    input_data_assets = map_data_assets(input_data, is_local)
-    output_data_assets = map_data_assets(output_data, is_local=is_local)
-    
-    x_train = pd.read_csv(input_data_assets['x_train'])
-    y_train = pd.read_csv(input_data_assets['y_train'])
+
+def fit_normal_equations(chunks: Iterable[Tuple[pd.DataFrame, pd.DataFrame]]) -> LinearRegression:
+    """
+    Fit an ordinary least squares model from (X, y) chunks by accumulating
+    XᵀX and Xᵀy, so memory depends on the number of features, not rows.
+
+    Sums are taken around the first chunk's means to limit cancellation when
+    centring. The result has the attributes of ``LinearRegression().fit`` on
+    the full data and agrees with it up to numerical tolerance: solving
+    XᵀX squares the condition number, so ill-conditioned features drift
+    further from sklearn's least-squares solution.
+    """
+    n_rows = 0
+    shift_x = shift_y = None
+    sum_x = sum_y = xtx = xty = None
+    feature_names = None
+
+    for x_chunk, y_chunk in chunks:
+        if len(x_chunk) != len(y_chunk):
+            raise ValueError("Feature and target chunks are not aligned.")
+        X = x_chunk.to_numpy(dtype=np.float64)
+        Y = y_chunk.to_numpy(dtype=np.float64)
+        if shift_x is None:
+            feature_names = list(x_chunk.columns)
+            shift_x, shift_y = X.mean(axis=0), Y.mean(axis=0)
+            sum_x = np.zeros(X.shape[1])
+            sum_y = np.zeros(Y.shape[1])
+            xtx = np.zeros((X.shape[1], X.shape[1]))
+            xty = np.zeros((X.shape[1], Y.shape[1]))
+        X = X - shift_x
+        Y = Y - shift_y
+        n_rows += len(X)
+        sum_x += X.sum(axis=0)
+        sum_y += Y.sum(axis=0)
+        xtx += X.T @ X
+        xty += X.T @ Y
+
+    if not n_rows:
+        raise ValueError("No training rows to fit.")
+
+    mean_x, mean_y = sum_x / n_rows, sum_y / n_rows
+    xtx_centred = xtx - n_rows * np.outer(mean_x, mean_x)
+    xty_centred = xty - n_rows * np.outer(mean_x, mean_y)
+    coef, _, rank, singular = np.linalg.lstsq(xtx_centred, xty_centred, rcond=None)
 
     reg = LinearRegression()
-    reg.fit(x_train,y_train)
+    reg.coef_ = coef.T
+    reg.intercept_ = (shift_y + mean_y) - (shift_x + mean_x) @ coef
+    reg.rank_ = rank
+    reg.singular_ = np.sqrt(singular)
+    reg.n_features_in_ = len(feature_names)
+    reg.feature_names_in_ = np.asarray(feature_names, dtype=object)
+    return reg
+
+
+def fit_partial(model, chunks: Iterable[Tuple[pd.DataFrame, pd.DataFrame]]):
+    """
+    Fit an estimator exposing ``partial_fit`` (e.g. SGDRegressor) chunk by chunk.
+    """
+    for x_chunk, y_chunk in chunks:
+        model.partial_fit(x_chunk, y_chunk.to_numpy().ravel())
+    return model
+
+
+@profiled
+@fingerprinted
+def train(
+    input_data: list[str],
+    output_data: list[str],
+    is_local,
+    mode: str = "in_memory",
+    model_type: str = "linear",
+    chunk_rows: int = 100_000,
+    epochs: int = 1,
+    fold: int = 0
+) -> pd.DataFrame:
+    """
+    Training rows come from the mastertable through the split manifest when
+    'split_manifest' is an input, otherwise from x_train and y_train.
+
+    Args:
+        mode (str): 'in_memory' reads the whole training set, 'streaming' reads
+            it in ``chunk_rows`` chunks so memory stays bounded.
+        model_type (str): 'linear' (exact OLS) or 'sgd' (SGDRegressor, streaming only).
+        chunk_rows (int): Rows per chunk in streaming mode.
+        epochs (int): Passes over the data for 'sgd'.
+        fold (int): Fold held out of training, for a k-fold split manifest.
+    """
+    output_data_assets = map_data_assets(output_data)
+    manifest = load_split_manifest('split_manifest', is_local) if 'split_manifest' in input_data else None
+
+    if mode == "in_memory":
+        if model_type != "linear":
+            raise ValueError(f"Unsupported model type for in-memory training: {model_type}")
+        x_train, y_train = read_partition('train', input_data, is_local, fold=fold)
+
+        # Fit in float64, whatever compact dtypes the training rows were read with
+        reg = LinearRegression()
+        reg.fit(x_train.astype(np.float64), y_train.astype(np.float64))
+    elif mode == "streaming":
+        def chunks():
+            if manifest is not None:
+                return (
+                    (chunk.drop(columns=TARGET_COLUMN), chunk[[TARGET_COLUMN]])
+                    for chunk in iter_split_chunks(manifest, 'train', is_local, chunk_rows, fold=fold)
+                )
+            return zip(
+                iter_pandas_chunks('x_train', is_local, chunk_rows),
+                iter_pandas_chunks('y_train', is_local, chunk_rows)
+            )
+
+        if model_type == "linear":
+            reg = fit_normal_equations(chunks())
+        elif model_type == "sgd":
+            reg = SGDRegressor()
+            for _ in range(epochs):
+                reg = fit_partial(reg, chunks())
+        else:
+            raise ValueError(f"Unsupported model type for streaming training: {model_type}")
+    else:
+        raise ValueError(f"Unsupported training mode: {mode}")
 
-    dir_path = "/".join(output_data_assets['lr_model'].split("/")[:-1])
-    if not Path(dir_path).exists():
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
-    with open(output_data_assets['lr_model'], 'wb') as file:
+    model_path = Path(output_data_assets['lr_model']['local_path'])
+    if not model_path.parent.exists():
+        model_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(model_path, 'wb') as file:
         pickle.dump(reg, file)
@@ -0,0 +1,192 @@
+import itertools
+import json
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import ElasticNet, Lasso, LinearRegression, Ridge
+from sklearn.model_selection import KFold
+
+from helper.data_helper import map_data_assets, save_dataframes
+from helper.fingerprint import fingerprinted
+from helper.profiling import profiled
+from ds_pipeline.nodes.split_data import read_partition
+
+ESTIMATORS = {
+    "linear": LinearRegression,
+    "ridge": Ridge,
+    "lasso": Lasso,
+    "elastic_net": ElasticNet,
+}
+
+# Model family to lists of hyperparameter values, every combination is a candidate
+DEFAULT_GRID = {
+    "linear": {},
+    "ridge": {"alpha": [0.01, 0.1, 1.0, 10.0, 100.0]},
+    "lasso": {"alpha": [0.0001, 0.001, 0.01, 0.1]},
+    "elastic_net": {"alpha": [0.001, 0.01, 0.1], "l1_ratio": [0.2, 0.5, 0.8]},
+}
+
+# Memory-mapped training matrices opened by this worker process, by file path
+_shared_arrays: dict[str, np.ndarray] = {}
+
+
+def expand_grid(grid: dict) -> list[tuple[str, dict]]:
+    """
+    Candidates of a grid as (family, params) pairs, in a stable order.
+    """
+    unknown = set(grid) - set(ESTIMATORS)
+    if unknown:
+        raise ValueError(f"Unsupported model families {sorted(unknown)}, expected some of {sorted(ESTIMATORS)}")
+
+    candidates = []
+    for family, space in grid.items():
+        names = sorted(space)
+        for values in itertools.product(*(space[name] for name in names)):
+            candidates.append((family, dict(zip(names, values))))
+    return candidates
+
+
+def _open_shared(path: str) -> np.ndarray:
+    array = _shared_arrays.get(path)
+    if array is None:
+        # Read-only map, the pages are shared with every other worker through the OS cache
+        array = _shared_arrays[path] = np.load(path, mmap_mode="r")
+    return array
+
+
+def _fit_candidate_fold(
+    x_path: str,
+    y_path: str,
+    family: str,
+    params: dict,
+    cv_folds: int,
+    fold: int,
+    seed: int
+) -> tuple[float, float, float]:
+    """
+    Fit one candidate on all but one CV fold and score it on that fold.
+
+    Returns:
+        tuple[float, float, float]: RMSE and R² on the held-out fold, fit seconds.
+    """
+    X, y = _open_shared(x_path), _open_shared(y_path)
+    train_idx, valid_idx = list(KFold(cv_folds, shuffle=True, random_state=seed).split(X))[fold]
+
+    start = time.perf_counter()
+    model = ESTIMATORS[family](**params).fit(X[train_idx], y[train_idx])
+    fit_seconds = time.perf_counter() - start
+
+    residuals = y[valid_idx] - model.predict(X[valid_idx])
+    y_valid = y[valid_idx]
+    rmse = float(np.sqrt(np.mean(residuals ** 2)))
+    r2 = float(1.0 - np.sum(residuals ** 2) / np.sum((y_valid - y_valid.mean()) ** 2))
+    return rmse, r2, fit_seconds
+
+
+def cross_validate_grid(
+    x: pd.DataFrame,
+    y: pd.DataFrame,
+    grid: dict,
+    cv_folds: int = 5,
+    max_workers: Optional[int] = None,
+    seed: int = 42
+) -> pd.DataFrame:
+    """
+    Cross-validate every candidate of ``grid`` on a process pool.
+
+    The training matrix is written once to ``.npy`` files that workers
+    memory-map, so it is neither pickled to each task nor copied per worker.
+
+    Returns:
+        pd.DataFrame: Leaderboard ranked by mean CV RMSE, best first.
+    """
+    candidates = expand_grid(grid)
+    tasks = [(c, fold) for c in range(len(candidates)) for fold in range(cv_folds)]
+
+    with tempfile.TemporaryDirectory(prefix="cv_grid_") as tmp_dir:
+        x_path, y_path = os.path.join(tmp_dir, "x.npy"), os.path.join(tmp_dir, "y.npy")
+        np.save(x_path, np.ascontiguousarray(x.to_numpy(dtype=np.float64)))
+        np.save(y_path, np.ascontiguousarray(y.to_numpy(dtype=np.float64).ravel()))
+
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+            results = list(pool.map(
+                _fit_candidate_fold,
+                [x_path] * len(tasks),
+                [y_path] * len(tasks),
+                [candidates[c][0] for c, _ in tasks],
+                [candidates[c][1] for c, _ in tasks],
+                [cv_folds] * len(tasks),
+                [fold for _, fold in tasks],
+                [seed] * len(tasks)
+            ))
+
+    scores = np.asarray(results).reshape(len(candidates), cv_folds, 3)
+    leaderboard = pd.DataFrame({
+        "model": [family for family, _ in candidates],
+        "params": [json.dumps(params, sort_keys=True) for _, params in candidates],
+        "mean_rmse": scores[:, :, 0].mean(axis=1),
+        "std_rmse": scores[:, :, 0].std(axis=1),
+        "mean_r2": scores[:, :, 1].mean(axis=1),
+        "fit_seconds": scores[:, :, 2].sum(axis=1),
+    })
+    leaderboard = leaderboard.sort_values(["mean_rmse", "fit_seconds"], ignore_index=True)
+    leaderboard.insert(0, "rank", np.arange(1, len(leaderboard) + 1, dtype=np.int64))
+    return leaderboard
+
+
+@profiled
+@fingerprinted
+def grid_search(
+    input_data: list[str],
+    output_data: list[str],
+    is_local,
+    grid: Optional[dict] = None,
+    cv_folds: int = 5,
+    max_workers: Optional[int] = None,
+    fold: int = 0,
+    seed: int = 42
+) -> pd.DataFrame:
+    """
+    Cross-validate a grid of model families and hyperparameters on the
+    training rows, refit the best candidate (lowest mean CV RMSE) on all of
+    them and save it as ``lr_model``, with every candidate's scores in
+    ``leaderboard``.
+
+    Args:
+        grid (dict, optional): Model family to hyperparameter value lists,
+            defaults to ``DEFAULT_GRID``.
+        cv_folds (int): Cross-validation folds within the training rows.
+        max_workers (int, optional): Processes fitting candidates, defaults to all cores.
+        fold (int): Fold held out of training, for a k-fold split manifest.
+        seed (int): Seed of the CV folds.
+    """
+    output_data_assets = map_data_assets(output_data)
+    x_train, y_train = read_partition('train', input_data, is_local, fold=fold)
+
+    leaderboard = cross_validate_grid(x_train, y_train, grid or DEFAULT_GRID, cv_folds, max_workers, seed)
+    best = leaderboard.iloc[0]
+    print(f"Best model: {best['model']} {best['params']} (CV RMSE {best['mean_rmse']:.4f})")
+
+    reg = ESTIMATORS[best["model"]](**json.loads(best["params"]))
+    # Same float64 precision as the cross-validation fits
+    reg.fit(x_train.astype(np.float64), y_train.to_numpy(dtype=np.float64).ravel())
+
+    model_path = Path(output_data_assets['lr_model']['local_path'])
+    if not model_path.parent.exists():
+        model_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(model_path, 'wb') as file:
+        pickle.dump(reg, file)
+
+    save_dataframes(
+        dataframes={"leaderboard": leaderboard},
+        data_assets=[asset for asset in output_data if asset != 'lr_model'],
+        is_local=is_local,
+        sf_helper=None
+    )
@@ -1,17 +1,86 @@
 import pandas as pd
-from helper.data_helper import map_data_assets, save_dataframes
+from helper.data_helper import read_pandas, save_dataframes
+from helper.fingerprint import fingerprinted
+from helper.profiling import profiled
+from helper.split_manifest import create_split_manifest, load_split_manifest, read_split, save_split_manifest
 from sklearn.model_selection import train_test_split
+from typing import Optional, Tuple
 
+TARGET_COLUMN = 'MedHouseVal'
 
-def training_split(input_data: list[str], output_data: list[str], is_local) -> pd.DataFrame:
-    data_assets = map_data_assets(input_data, is_local)
-    
-    housing_df = pd.read_csv(data_assets['mastertable'])
-    
-    X=housing_df.drop('MedHouseVal',axis=1)
-    y=housing_df['MedHouseVal']
-    
-    X_train,X_test,y_train,y_test=train_test_split(X,y,test_size=0.33)
+
+def read_partition(
+    partition: str,
+    input_data: list[str],
+    is_local,
+    fold: int = 0,
+    features: Optional[list[str]] = None
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Features and target of the 'train' or 'test' partition, resolved from the
+    mastertable through the split manifest when 'split_manifest' is an input,
+    otherwise read from the materialised x/y assets.
+
+    Args:
+        partition (str): 'train' or 'test'.
+        input_data (list[str]): Input assets of the calling node.
+        fold (int): Test fold of a k-fold split manifest.
+        features (list[str], optional): Feature columns to read, defaults to all.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Features and single-column target.
+    """
+    if 'split_manifest' in input_data:
+        manifest = load_split_manifest('split_manifest', is_local)
+        columns = features + [TARGET_COLUMN] if features else None
+        df = read_split(manifest, partition, is_local, fold=fold, columns=columns)
+        return df[features] if features else df.drop(columns=TARGET_COLUMN), df[[TARGET_COLUMN]]
+
+    x = read_pandas(f'x_{partition}', is_local, columns=features)
+    y = read_pandas(f'y_{partition}', is_local)
+    return x, y
+
+
+@profiled
+@fingerprinted
+def training_split(
+    input_data: list[str],
+    output_data: list[str],
+    is_local,
+    split_mode: str = "manifest",
+    strategy: str = "mask",
+    test_size: float = 0.33,
+    n_folds: int = 1,
+    seed: int = 42
+) -> pd.DataFrame:
+    """
+    Args:
+        split_mode (str): 'manifest' writes only a split manifest of the
+            mastertable, 'materialise' writes x/y train/test copies.
+        strategy (str): Manifest strategy, 'mask' (stored row assignment) or
+            'hash' (seeded hash of the row values).
+        test_size (float): Share of test rows for a holdout split.
+        n_folds (int): Number of folds, 1 for a holdout split.
+        seed (int): Seed making the split reproducible.
+    """
+    if split_mode == "manifest":
+        manifest = create_split_manifest(
+            'mastertable', is_local, strategy=strategy, test_size=test_size, n_folds=n_folds, seed=seed
+        )
+        save_split_manifest(manifest, 'split_manifest', is_local)
+        return
+
+    if split_mode != "materialise":
+        raise ValueError(f"Unsupported split mode: {split_mode}")
+    if n_folds > 1:
+        raise ValueError("k-fold splits are only supported in manifest mode.")
+
+    housing_df = read_pandas('mastertable', is_local)
+
+    X=housing_df.drop(TARGET_COLUMN,axis=1)
+    y=housing_df[[TARGET_COLUMN]]
+
+    X_train,X_test,y_train,y_test=train_test_split(X,y,test_size=test_size,random_state=seed)
 
     output_dict = {
         "x_train": X_train,
@@ -24,5 +93,5 @@ def training_split(input_data: list[str], output_data: list[str], is_local) -> p
         dataframes=output_dict,
         data_assets=output_data,
         is_local=is_local,
-        save_type="csv"
+        sf_helper=None
     )
\ No newline at end of file
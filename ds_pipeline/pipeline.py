@@ -1,26 +1,80 @@
-from ds_pipeline.nodes.split_data import training_split
-from ds_pipeline.nodes.model import train
-from ds_pipeline.nodes.evaluate import evaluate
+from helper.local_executor import LocalPipelineExecutor
 
-def run_ds_pipeline(is_local):
+# Lazy references, a node's module (and its dependencies) is only imported when it runs
+DS_NODES = {
+    "training_split": "ds_pipeline.nodes.split_data:training_split",
+    "train": "ds_pipeline.nodes.model:train",
+    "grid_search": "ds_pipeline.nodes.model_selection:grid_search",
+    "evaluate": "ds_pipeline.nodes.evaluate:evaluate",
+    "explain": "ds_pipeline.nodes.explain:explain",
+}
+
+def get_ds_pipeline_definition(is_local: bool, grid_search: bool = False) -> dict:
+    train_step = {
+        "function": "train",
+        "depends_on": ["training_split"],
+        "params": {
+            "input_data": ["mastertable", "split_manifest"],
+            "output_data": ["lr_model"],
+            "is_local": is_local
+        }
+    }
+    if grid_search:
+        # Cross-validates model families and keeps the best one as lr_model
+        train_step = {
+            "function": "grid_search",
+            "depends_on": ["training_split"],
+            "params": {
+                "input_data": ["mastertable", "split_manifest"],
+                "output_data": ["lr_model", "leaderboard"],
+                "is_local": is_local,
+                "cv_folds": 5
+            }
+        }
+
+    return {
+        "training_split": {
+            "function": "training_split",
+            "depends_on": [],
+            "params": {
+                "input_data": ["mastertable"],
+                "output_data": ["split_manifest"],
+                "is_local": is_local,
+                "split_mode": "manifest",
+                "seed": 42
+            }
+        },
+        "train": train_step,
+        "evaluate": {
+            "function": "evaluate",
+            "depends_on": ["train"],
+            "params": {
+                "input_data": ["lr_model", "mastertable", "split_manifest"],
+                "output_data": ["metrics"],
+                "is_local": is_local
+            }
+        },
+        "explain": {
+            "function": "explain",
+            "depends_on": ["train"],
+            "params": {
+                "input_data": ["lr_model", "mastertable", "split_manifest"],
+                "output_data": ["shap_values", "shap_importance"],
+                "is_local": is_local
+            }
+        }
+    }
+
+def run_ds_pipeline(is_local, max_workers: int = None, executor_type: str = "thread", grid_search: bool = False):
     """
         Orchestrate and run ML pipeline
-    """
-    training_split(
-        input_data=["mastertable"],
-        output_data=["x_train", "y_train", "x_test", "y_test"],
-        is_local=is_local
-    )
 
-    train(
-        input_data=["x_train", "y_train"],
-        output_data=["lr_model"],
-        is_local=is_local
-    )
-    
-    evaluate(
-        input_data=["lr_model", "x_test", "y_test"],
-        output_data=["metrics"],
-        is_local=is_local
-    )
-    
\ No newline at end of file
+        With ``grid_search``, the train step cross-validates a grid of models
+        on a process pool instead of fitting a single linear regression.
+    """
+    LocalPipelineExecutor(
+        get_ds_pipeline_definition(is_local, grid_search),
+        DS_NODES,
+        max_workers=max_workers,
+        executor_type=executor_type
+    ).run()
\ No newline at end of file
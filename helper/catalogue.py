@@ -0,0 +1,303 @@
+import os
+import pkgutil
+import threading
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Optional, Tuple
+
+import yaml
+
+SUPPORTED_FILE_TYPES = ("csv", "parquet", "pkl", "json")
+
+# How incremental runs find new rows of an asset: a monotonic key column, new or
+# appended files (LIST md5 on the stage, a local file manifest offline), or a Snowflake STREAM
+INCREMENTAL_STRATEGIES = ("key", "files", "stream")
+INCREMENTAL_OPTIONS = ("strategy", "key", "append_only")
+
+# Where Snowflake saves write an asset: stage files, or a transient table named by table_name
+SUPPORTED_STORAGE = ("stage", "transient_table")
+
+# Keys folder assets can be partitioned by, and the columns each is derived from
+# (see helper/partitioning.py)
+SUPPORTED_PARTITION_KEYS = {
+    "geo_bucket": ("Latitude", "Longitude"),
+}
+
+# Catalogue column types and their pandas equivalents
+SUPPORTED_DTYPES = {
+    "float32": "float32",
+    "float64": "float64",
+    "int32": "int32",
+    "int64": "int64",
+    "string": "string",
+    "bool": "bool",
+}
+
+
+@dataclass(frozen=True)
+class AssetSpec:
+    """
+    Typed, validated entry of the data catalogue.
+    """
+    name: str
+    local_path: str
+    target_path: str
+    is_folder: bool = False
+    file_type: str = "csv"
+    table_name: Optional[str] = None
+    has_header: bool = True
+    columns: Optional[dict] = None
+    # In fused runs, assets with persist False are only handed over in memory
+    persist: bool = True
+    storage: str = "stage"
+    incremental: Optional[dict] = None
+    # Hive-style partition directories (<key>=<value>/) of a folder asset
+    partition_by: Optional[Tuple[str, ...]] = None
+    # Pandas reads narrow the dtypes of the asset (see data_helper.compact_dtypes)
+    compact: bool = False
+    # float64 column to the largest absolute error per value accepted when
+    # compacted reads store it as float32
+    float_atol: Optional[dict] = None
+
+    @classmethod
+    def from_dict(cls, name: str, entry: dict) -> "AssetSpec":
+        if not isinstance(entry, dict):
+            raise ValueError(f"Catalogue entry '{name}' must be a mapping.")
+
+        known = {f.name for f in fields(cls)} - {"name"}
+        unknown = set(entry) - known
+        if unknown:
+            raise ValueError(f"Catalogue entry '{name}' has unknown keys: {sorted(unknown)}")
+
+        for key in ("local_path", "target_path"):
+            if not entry.get(key):
+                raise ValueError(f"Catalogue entry '{name}' is missing '{key}'.")
+
+        if not str(entry["target_path"]).startswith("@"):
+            raise ValueError(f"Catalogue entry '{name}': target_path must start with '@' for a named stage.")
+
+        values = dict(entry)
+        is_folder = bool(values.get("is_folder", False))
+        if "file_type" not in values:
+            # Infer from the file extension, folders default to csv
+            suffix = Path(values["local_path"]).suffix.lstrip(".")
+            values["file_type"] = suffix if suffix and not is_folder else "csv"
+
+        if values["file_type"] not in SUPPORTED_FILE_TYPES:
+            raise ValueError(
+                f"Catalogue entry '{name}': unsupported file_type '{values['file_type']}', "
+                f"expected one of {SUPPORTED_FILE_TYPES}"
+            )
+
+        if values.get("storage", "stage") not in SUPPORTED_STORAGE:
+            raise ValueError(
+                f"Catalogue entry '{name}': unsupported storage '{values['storage']}', "
+                f"expected one of {SUPPORTED_STORAGE}"
+            )
+        if values.get("storage") == "transient_table" and not values.get("table_name"):
+            raise ValueError(f"Catalogue entry '{name}': transient_table storage needs a table_name.")
+
+        incremental = values.get("incremental")
+        if incremental is not None:
+            if not isinstance(incremental, dict) or set(incremental) - set(INCREMENTAL_OPTIONS):
+                raise ValueError(f"Catalogue entry '{name}': incremental must be a mapping of {INCREMENTAL_OPTIONS}.")
+            strategy = incremental.get("strategy")
+            if strategy not in INCREMENTAL_STRATEGIES:
+                raise ValueError(
+                    f"Catalogue entry '{name}': unsupported incremental strategy '{strategy}', "
+                    f"expected one of {INCREMENTAL_STRATEGIES}"
+                )
+            if strategy == "key" and not incremental.get("key"):
+                raise ValueError(f"Catalogue entry '{name}': the key incremental strategy needs a 'key' column.")
+            if strategy == "stream" and not values.get("table_name"):
+                raise ValueError(f"Catalogue entry '{name}': the stream incremental strategy needs a table_name.")
+            values["incremental"] = dict(incremental)
+
+        columns = values.get("columns")
+        if columns is not None:
+            if not isinstance(columns, dict) or not columns:
+                raise ValueError(f"Catalogue entry '{name}': columns must be a mapping of column names to types.")
+            unsupported = {col: dtype for col, dtype in columns.items() if dtype not in SUPPORTED_DTYPES}
+            if unsupported:
+                raise ValueError(
+                    f"Catalogue entry '{name}': unsupported column types {unsupported}, "
+                    f"expected one of {list(SUPPORTED_DTYPES)}"
+                )
+            values["columns"] = dict(columns)
+
+        float_atol = values.get("float_atol")
+        if float_atol is not None:
+            declared = values.get("columns") or {}
+            if not isinstance(float_atol, dict) or any(
+                declared.get(col) != "float64" or isinstance(atol, bool) or not isinstance(atol, (int, float)) or atol < 0
+                for col, atol in float_atol.items()
+            ):
+                raise ValueError(
+                    f"Catalogue entry '{name}': float_atol must map declared float64 columns to non-negative tolerances."
+                )
+            values["float_atol"] = {col: float(atol) for col, atol in float_atol.items()}
+
+        partition_by = values.get("partition_by")
+        if partition_by is not None:
+            if isinstance(partition_by, str):
+                partition_by = [partition_by]
+            if not is_folder or values.get("storage", "stage") != "stage":
+                raise ValueError(f"Catalogue entry '{name}': only folder assets on the stage can be partitioned.")
+            for key in partition_by:
+                if key not in SUPPORTED_PARTITION_KEYS:
+                    raise ValueError(
+                        f"Catalogue entry '{name}': unsupported partition key '{key}', "
+                        f"expected one of {list(SUPPORTED_PARTITION_KEYS)}"
+                    )
+                missing = [c for c in SUPPORTED_PARTITION_KEYS[key] if c not in (values.get("columns") or {})]
+                if missing:
+                    raise ValueError(f"Catalogue entry '{name}': partition key '{key}' needs columns {missing}.")
+            values["partition_by"] = tuple(partition_by)
+
+        values["is_folder"] = is_folder
+        return cls(name=name, **values)
+
+    def pandas_dtypes(self, columns: Optional[list[str]] = None) -> dict:
+        """
+        Pandas dtypes of the declared columns, optionally restricted to ``columns``.
+        """
+        declared = self.columns or {}
+        names = columns if columns is not None else list(declared)
+        return {col: SUPPORTED_DTYPES[declared[col]] for col in names if col in declared}
+
+    def snowpark_schema(self, columns: Optional[list[str]] = None):
+        """
+        Snowpark StructType of the declared columns, optionally restricted to ``columns``.
+        """
+        from snowflake.snowpark.types import (
+            BooleanType, DoubleType, FloatType, IntegerType, LongType, StringType, StructField, StructType
+        )
+
+        snowpark_types = {
+            "float32": FloatType,
+            "float64": DoubleType,
+            "int32": IntegerType,
+            "int64": LongType,
+            "string": StringType,
+            "bool": BooleanType,
+        }
+        if not self.columns:
+            raise ValueError(f"Catalogue entry '{self.name}' declares no columns.")
+        names = columns if columns is not None else list(self.columns)
+        return StructType([StructField(col, snowpark_types[self.columns[col]]()) for col in names])
+
+    def to_dict(self) -> dict:
+        """
+        Plain dictionary view, as returned by ``map_data_assets``.
+        """
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+
+class DataCatalogue:
+    """
+    Parsed and validated data catalogue, indexed by asset name.
+    """
+
+    def __init__(self, specs: dict[str, AssetSpec], source: Optional[Path] = None, mtime: Optional[float] = None):
+        self._specs = specs
+        self.source = source
+        self.mtime = mtime
+
+    @classmethod
+    def from_yaml(cls, yaml_text: str, source: Optional[Path] = None, mtime: Optional[float] = None) -> "DataCatalogue":
+        raw = yaml.safe_load(yaml_text) or {}
+        if not isinstance(raw, dict):
+            raise ValueError("Data catalogue must be a mapping of asset names to entries.")
+        specs = {name: AssetSpec.from_dict(name, entry) for name, entry in raw.items()}
+        return cls(specs, source=source, mtime=mtime)
+
+    def get(self, name: str) -> AssetSpec:
+        try:
+            return self._specs[name]
+        except KeyError:
+            raise KeyError(f"Data asset '{name}' not found in catalogue.") from None
+
+    def __getitem__(self, name: str) -> AssetSpec:
+        return self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def __iter__(self):
+        return iter(self._specs.values())
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def is_stale(self) -> bool:
+        """
+        True when the catalogue was loaded from a file that changed since.
+        Catalogues read from package resources (sproc zip imports) never go stale.
+        """
+        if self.source is None:
+            return False
+        try:
+            return os.stat(self.source).st_mtime != self.mtime
+        except OSError:
+            return True
+
+
+_catalogues: dict[str, DataCatalogue] = {}
+_lock = threading.Lock()
+
+
+def _read_catalogue_source(data_catalogue_file: str) -> Tuple[str, Optional[Path], Optional[float]]:
+    """
+    Read the catalogue YAML, supporting both local and Snowflake sproc execution.
+    """
+    # Option 1: Local execution path (actual file system)
+    path = Path(__file__).resolve().parent / ".." / "conf" / data_catalogue_file
+    try:
+        path = path.resolve()
+        if path.exists():
+            mtime = os.stat(path).st_mtime
+            with open(path, "r") as f:
+                return f.read(), path, mtime
+    except Exception:
+        pass  # If path can't resolve (e.g. ZIP context), move on
+
+    # Option 2: Sproc execution via zipimport — try reading as resource
+    try:
+        yaml_bytes = pkgutil.get_data("conf", data_catalogue_file)
+        if yaml_bytes is not None:
+            return yaml_bytes.decode("utf-8"), None, None
+    except Exception:
+        pass
+
+    raise FileNotFoundError(f"Could not find {data_catalogue_file} in local paths or package resources.")
+
+
+def get_catalogue(data_catalogue_file: str = "data_catalogue.yml") -> DataCatalogue:
+    """
+    Return the process-wide catalogue, loading it on first use and reloading
+    it when the YAML file's mtime changes.
+
+    Args:
+        data_catalogue_file (str): Catalogue file name inside ``conf``.
+
+    Returns:
+        DataCatalogue: Validated catalogue.
+    """
+    catalogue = _catalogues.get(data_catalogue_file)
+    if catalogue is not None and not catalogue.is_stale():
+        return catalogue
+
+    with _lock:
+        catalogue = _catalogues.get(data_catalogue_file)
+        if catalogue is None or catalogue.is_stale():
+            yaml_text, source, mtime = _read_catalogue_source(data_catalogue_file)
+            catalogue = DataCatalogue.from_yaml(yaml_text, source=source, mtime=mtime)
+            _catalogues[data_catalogue_file] = catalogue
+    return catalogue
+
+
+def get_asset_spec(name: str, **kwargs) -> AssetSpec:
+    """
+    Look up a single asset spec in the cached catalogue.
+    """
+    return get_catalogue(**kwargs).get(name)
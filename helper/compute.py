@@ -0,0 +1,323 @@
+import copy
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from snowflake.snowpark import Session
+
+from helper.deploy import WarehouseSpec
+
+logger = logging.getLogger(__name__)
+
+# Warehouse sizes, smallest first
+WAREHOUSE_SIZES = (
+    "XSMALL", "SMALL", "MEDIUM", "LARGE", "XLARGE", "XXLARGE", "XXXLARGE", "X4LARGE", "X5LARGE", "X6LARGE"
+)
+
+# Largest size a serverless task can be given
+MAX_SERVERLESS_SIZE = "XXLARGE"
+
+# Other spellings of the sizes, as written in SQL or reported by QUERY_HISTORY ('X-Small', '2X-Large')
+_SIZE_ALIASES = {
+    "XSMALL": "XSMALL", "X-SMALL": "XSMALL",
+    "XLARGE": "XLARGE", "X-LARGE": "XLARGE",
+    "XXLARGE": "XXLARGE", "X2LARGE": "XXLARGE", "2X-LARGE": "XXLARGE", "2XLARGE": "XXLARGE",
+    "XXXLARGE": "XXXLARGE", "X3LARGE": "XXXLARGE", "3X-LARGE": "XXXLARGE", "3XLARGE": "XXXLARGE",
+    "X4LARGE": "X4LARGE", "4X-LARGE": "X4LARGE", "4XLARGE": "X4LARGE",
+    "X5LARGE": "X5LARGE", "5X-LARGE": "X5LARGE", "5XLARGE": "X5LARGE",
+    "X6LARGE": "X6LARGE", "6X-LARGE": "X6LARGE", "6XLARGE": "X6LARGE",
+}
+
+# Task parameters a node can set through task_parameters
+TASK_PARAMETERS = (
+    "USER_TASK_MANAGED_INITIAL_WAREHOUSE_SIZE",
+    "USER_TASK_TIMEOUT_MS",
+    "SUSPEND_TASK_AFTER_NUM_FAILURES",
+    "TASK_AUTO_RETRY_ATTEMPTS",
+    "SERVERLESS_TASK_MIN_STATEMENT_SIZE",
+    "SERVERLESS_TASK_MAX_STATEMENT_SIZE",
+)
+
+COMPUTE_OPTIONS = ("warehouse", "warehouse_size", "serverless", "initial_size", "timeout_ms", "task_parameters")
+
+# Warehouses created for sized nodes are shared by size: PIPELINE_WH_MEDIUM, ...
+DEFAULT_WAREHOUSE_PREFIX = "PIPELINE_WH"
+
+# Median run time above which a node is moved to the next size, and below which
+# a node that never spills is moved to the previous one
+SCALE_UP_SECONDS = 600
+SCALE_DOWN_SECONDS = 60
+
+
+def normalise_size(size: str) -> str:
+    """
+    Canonical name of a warehouse size, e.g. ``normalise_size("X-Small") == "XSMALL"``.
+    """
+    key = str(size).strip().upper().replace(" ", "")
+    key = _SIZE_ALIASES.get(key, key)
+    if key not in WAREHOUSE_SIZES:
+        raise ValueError(f"Unsupported warehouse size '{size}', expected one of {WAREHOUSE_SIZES}")
+    return key
+
+
+def _shift_size(size: str, steps: int, largest: str = WAREHOUSE_SIZES[-1]) -> str:
+    index = WAREHOUSE_SIZES.index(size) + steps
+    return WAREHOUSE_SIZES[max(0, min(index, WAREHOUSE_SIZES.index(largest)))]
+
+
+@dataclass(frozen=True)
+class NodeCompute:
+    """
+    Compute a node's task runs on, from the ``compute`` entry of its pipeline
+    definition node:
+
+    - ``warehouse``: existing warehouse to run on.
+    - ``warehouse_size``: run on a warehouse of that size, ``warehouse`` when
+      given, otherwise the shared ``PIPELINE_WH_<SIZE>``; it is created when missing.
+    - ``serverless``: run as a serverless task, first sized by ``initial_size``.
+    - ``timeout_ms``: USER_TASK_TIMEOUT_MS of the task.
+    - ``task_parameters``: other task parameters, see ``TASK_PARAMETERS``.
+
+    Nodes without a ``compute`` entry run on the pipeline's default warehouse.
+    """
+    warehouse: Optional[str] = None
+    warehouse_size: Optional[str] = None
+    serverless: bool = False
+    initial_size: Optional[str] = None
+    timeout_ms: Optional[int] = None
+    task_parameters: tuple = ()
+
+    @classmethod
+    def from_config(cls, config: Optional[dict], node_name: str = "") -> "NodeCompute":
+        if not config:
+            return cls()
+        if not isinstance(config, dict) or set(config) - set(COMPUTE_OPTIONS):
+            raise ValueError(f"Node '{node_name}': compute must be a mapping of {COMPUTE_OPTIONS}.")
+
+        values = dict(config)
+        serverless = bool(values.get("serverless", False))
+        if serverless and (values.get("warehouse") or values.get("warehouse_size")):
+            raise ValueError(f"Node '{node_name}': a serverless task cannot also set a warehouse.")
+        if values.get("initial_size") and not serverless:
+            raise ValueError(f"Node '{node_name}': initial_size only applies to serverless tasks.")
+
+        for key in ("warehouse_size", "initial_size"):
+            if values.get(key):
+                values[key] = normalise_size(values[key])
+        if values.get("initial_size") and \
+                WAREHOUSE_SIZES.index(values["initial_size"]) > WAREHOUSE_SIZES.index(MAX_SERVERLESS_SIZE):
+            raise ValueError(f"Node '{node_name}': serverless tasks go up to {MAX_SERVERLESS_SIZE}.")
+
+        parameters = values.get("task_parameters") or {}
+        unknown = set(parameters) - set(TASK_PARAMETERS)
+        if unknown:
+            raise ValueError(
+                f"Node '{node_name}': unsupported task parameters {sorted(unknown)}, "
+                f"expected some of {TASK_PARAMETERS}"
+            )
+        if "USER_TASK_MANAGED_INITIAL_WAREHOUSE_SIZE" in parameters or "USER_TASK_TIMEOUT_MS" in parameters:
+            raise ValueError(f"Node '{node_name}': set the initial size and timeout with initial_size and timeout_ms.")
+        values["task_parameters"] = tuple(sorted(parameters.items()))
+        values["serverless"] = serverless
+        return cls(**values)
+
+    def warehouse_spec(self) -> Optional[WarehouseSpec]:
+        """
+        Warehouse to create for the node, when it asks for a size.
+        """
+        if not self.warehouse_size:
+            return None
+        return WarehouseSpec(
+            name=self.warehouse or f"{DEFAULT_WAREHOUSE_PREFIX}_{self.warehouse_size}",
+            size=self.warehouse_size
+        )
+
+    def task_options(self, default_warehouse: Optional[str]) -> dict:
+        """
+        ``warehouse`` and ``parameters`` arguments of the node's ``TaskSpec``.
+        """
+        if self.serverless:
+            warehouse = None
+        elif self.warehouse_size:
+            warehouse = self.warehouse_spec().name
+        else:
+            warehouse = self.warehouse or default_warehouse
+
+        parameters = []
+        if self.serverless and self.initial_size:
+            parameters.append(("USER_TASK_MANAGED_INITIAL_WAREHOUSE_SIZE", self.initial_size))
+        if self.timeout_ms is not None:
+            parameters.append(("USER_TASK_TIMEOUT_MS", int(self.timeout_ms)))
+        parameters.extend(self.task_parameters)
+        return {"warehouse": warehouse, "parameters": tuple(parameters)}
+
+
+@dataclass
+class NodeUsage:
+    """
+    Recorded runs of a node's task over the planner's lookback window.
+    """
+    node: str
+    runs: int
+    median_seconds: float
+    warehouse_size: Optional[str] = None
+    local_spill_bytes: int = 0
+    remote_spill_bytes: int = 0
+
+
+def suggest_size(usage: NodeUsage, serverless: bool = False) -> Optional[str]:
+    """
+    Warehouse size suggested by a node's run history, ``None`` when there is
+    nothing to suggest (no runs, serverless tasks, which Snowflake sizes itself).
+
+    Spilling to remote storage moves the node up two sizes, spilling to local
+    storage or a median above ``SCALE_UP_SECONDS`` up one; a node that never
+    spills and finishes within ``SCALE_DOWN_SECONDS`` moves down one.
+    """
+    if serverless or not usage.runs or not usage.warehouse_size:
+        return None
+
+    size = normalise_size(usage.warehouse_size)
+    if usage.remote_spill_bytes:
+        return _shift_size(size, 2)
+    if usage.local_spill_bytes or usage.median_seconds > SCALE_UP_SECONDS:
+        return _shift_size(size, 1)
+    if usage.median_seconds < SCALE_DOWN_SECONDS:
+        return _shift_size(size, -1)
+    return size
+
+
+class WarehouseSizePlanner:
+    def __init__(self, session: Optional[Session], pipeline_definition: dict, pipeline_name: str, lookback_days: int = 7):
+        """
+        Suggest a warehouse size per node from the recorded runs of the
+        pipeline's tasks.
+
+        Run times come from ACCOUNT_USAGE.TASK_HISTORY; spills are summed over
+        the queries the node's sproc issued, found in QUERY_HISTORY through the
+        session of the task's CALL. ACCOUNT_USAGE lags by up to a few hours.
+
+        Args:
+            session (Session): Snowpark session, only needed to query the history.
+            pipeline_definition (dict): Definition the tasks were built from.
+            pipeline_name (str): Pipeline name used in task names (task_<pipeline>_<node>).
+            lookback_days (int): Days of history considered.
+        """
+        self.session = session
+        self.pipeline_definition = pipeline_definition
+        self.pipeline_name = pipeline_name
+        self.lookback_days = lookback_days
+        self.task_names = {
+            f"task_{pipeline_name}_{node}".upper(): node for node in pipeline_definition
+        }
+
+    def history_sql(self) -> str:
+        names = ", ".join(f"'{name}'" for name in self.task_names)
+        since = f"DATEADD('day', -{int(self.lookback_days)}, CURRENT_TIMESTAMP())"
+        return f"""
+            WITH runs AS (
+                SELECT NAME, QUERY_ID, QUERY_START_TIME, COMPLETED_TIME,
+                       DATEDIFF('millisecond', QUERY_START_TIME, COMPLETED_TIME) / 1000 AS SECONDS
+                FROM SNOWFLAKE.ACCOUNT_USAGE.TASK_HISTORY
+                WHERE NAME IN ({names})
+                  AND STATE = 'SUCCEEDED'
+                  AND COMPLETED_TIME >= {since}
+            ),
+            run_usage AS (
+                SELECT r.NAME, r.QUERY_ID,
+                       ANY_VALUE(r.SECONDS) AS SECONDS,
+                       ANY_VALUE(r.COMPLETED_TIME) AS COMPLETED_TIME,
+                       ANY_VALUE(c.WAREHOUSE_SIZE) AS WAREHOUSE_SIZE,
+                       COALESCE(SUM(q.BYTES_SPILLED_TO_LOCAL_STORAGE), 0) AS LOCAL_SPILL_BYTES,
+                       COALESCE(SUM(q.BYTES_SPILLED_TO_REMOTE_STORAGE), 0) AS REMOTE_SPILL_BYTES
+                FROM runs r
+                JOIN SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY c
+                  ON c.QUERY_ID = r.QUERY_ID
+                LEFT JOIN SNOWFLAKE.ACCOUNT_USAGE.QUERY_HISTORY q
+                  ON q.SESSION_ID = c.SESSION_ID
+                 AND q.START_TIME BETWEEN r.QUERY_START_TIME AND r.COMPLETED_TIME
+                 AND q.START_TIME >= {since}
+                GROUP BY r.NAME, r.QUERY_ID
+            )
+            SELECT NAME,
+                   COUNT(*) AS RUNS,
+                   MEDIAN(SECONDS) AS MEDIAN_SECONDS,
+                   MAX_BY(WAREHOUSE_SIZE, COMPLETED_TIME) AS WAREHOUSE_SIZE,
+                   MAX(LOCAL_SPILL_BYTES) AS LOCAL_SPILL_BYTES,
+                   MAX(REMOTE_SPILL_BYTES) AS REMOTE_SPILL_BYTES
+            FROM run_usage
+            GROUP BY NAME
+        """
+
+    def usage_from_rows(self, rows: list) -> Dict[str, NodeUsage]:
+        usage = {}
+        for row in rows:
+            node = self.task_names[row["NAME"].upper()]
+            usage[node] = NodeUsage(
+                node=node,
+                runs=int(row["RUNS"]),
+                median_seconds=float(row["MEDIAN_SECONDS"] or 0.0),
+                warehouse_size=row["WAREHOUSE_SIZE"],
+                local_spill_bytes=int(row["LOCAL_SPILL_BYTES"] or 0),
+                remote_spill_bytes=int(row["REMOTE_SPILL_BYTES"] or 0),
+            )
+        return usage
+
+    def usage(self) -> Dict[str, NodeUsage]:
+        return self.usage_from_rows(self.session.sql(self.history_sql()).collect())
+
+    def suggest(self, usage: Optional[Dict[str, NodeUsage]] = None) -> Dict[str, str]:
+        """
+        Suggested warehouse size of every node with recorded runs.
+        """
+        usage = self.usage() if usage is None else usage
+        suggestions = {}
+        for node, node_usage in usage.items():
+            compute = NodeCompute.from_config(self.pipeline_definition[node].get("compute"), node)
+            size = suggest_size(node_usage, serverless=compute.serverless)
+            if size is not None:
+                suggestions[node] = size
+        return suggestions
+
+    def summary(self, usage: Optional[Dict[str, NodeUsage]] = None) -> str:
+        usage = self.usage() if usage is None else usage
+        suggestions = self.suggest(usage)
+        lines = [f"Warehouse sizes for {self.pipeline_name} (last {self.lookback_days} days)"]
+        for node in self.pipeline_definition:
+            if node not in usage:
+                lines.append(f"  {node}: no recorded runs")
+                continue
+            node_usage = usage[node]
+            lines.append(
+                f"  {node}: {node_usage.runs} run(s), median {node_usage.median_seconds:.0f}s on "
+                f"{node_usage.warehouse_size}, spilled {node_usage.local_spill_bytes} local / "
+                f"{node_usage.remote_spill_bytes} remote bytes -> {suggestions.get(node, 'keep')}"
+            )
+        return "\n".join(lines)
+
+    def apply(self, suggestions: Optional[Dict[str, str]] = None) -> dict:
+        """
+        Copy of the pipeline definition with the suggested sizes as the
+        nodes' ``compute.warehouse_size``; serverless nodes are left as they are.
+        """
+        suggestions = self.suggest() if suggestions is None else suggestions
+        definition = copy.deepcopy(self.pipeline_definition)
+        for node, size in suggestions.items():
+            compute = definition[node].setdefault("compute", {})
+            if compute.get("serverless"):
+                continue
+            compute["warehouse_size"] = size
+            logger.debug(f"Node {node} sized {size}")
+        return definition
+
+
+def warehouse_specs(pipeline_definition: dict) -> List[WarehouseSpec]:
+    """
+    Warehouses the nodes of a pipeline definition ask for, without duplicates.
+    """
+    specs = []
+    for node, config in pipeline_definition.items():
+        spec = NodeCompute.from_config(config.get("compute"), node).warehouse_spec()
+        if spec is not None and spec not in specs:
+            specs.append(spec)
+    return specs
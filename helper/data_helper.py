@@ -1,41 +1,43 @@
-import yaml
+import io
+import logging
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from helper.catalogue import AssetSpec, get_asset_spec, get_catalogue
+from helper.fusion import active_fusion, fused_frame
+from helper.partitioning import (
+    PartitionFilter,
+    matches_partitions,
+    partition_expression,
+    partition_paths,
+    validate_partition_filter,
+)
+from helper.profiling import profiler, record_io, record_memory
 from helper.snowflake_data_helper import SnowflakeDataHelper
+from helper.stage_mirror import get_stage_mirror
 from snowflake.snowpark import DataFrame as SPDataFrame
+from snowflake.snowpark import Session
+from snowflake.snowpark.functions import col
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
 from pathlib import Path
-from typing import Union, List
-import pkgutil
+from typing import Iterator, Optional, Union, List
 
+logger = logging.getLogger(__name__)
 
-def _get_data_catalogue(data_catalogue_file: str = "data_catalogue.yml") -> dict:
-    """
-    Load data catalogue YAML, supporting both local and Snowflake sproc execution.
-    """
-    # Option 1: Local execution path (actual file system)
-    local_paths = [
-        Path(__file__).resolve().parent / ".." / "conf" / data_catalogue_file,
-    ]
+# Pandas outputs of folder assets are uploaded as part files of at most this many rows
+DEFAULT_CHUNK_ROWS = 1_000_000
 
-    for path in local_paths:
-        try:
-            path = path.resolve()
-            if path.exists():
-                with open(path, "r") as f:
-                    return yaml.safe_load(f)
-        except Exception:
-            pass  # If path can't resolve (e.g. ZIP context), move on
+# Files of a multi-file asset read concurrently by read_pandas
+DEFAULT_READ_WORKERS = 8
 
-    # Option 2: Sproc execution via zipimport — try reading as resource
-    try:
-        yaml_bytes = pkgutil.get_data("conf", data_catalogue_file)
-        if yaml_bytes is not None:
-            return yaml.safe_load(yaml_bytes.decode("utf-8"))
-    except Exception:
-        pass
-
-    raise FileNotFoundError(f"Could not find {data_catalogue_file} in local paths or package resources.")
+# Text columns with at most this share of distinct values are compacted to categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
 
+# Metadata column numbering the rows of each staged file
+FILE_ROW_NUMBER = "METADATA$FILE_ROW_NUMBER"
 
 def map_data_assets(data_assets: list[str], **kwargs) -> dict:
     """
@@ -47,20 +49,199 @@ def map_data_assets(data_assets: list[str], **kwargs) -> dict:
     Returns:
         dict: Dictionary of data assets and meta data
     """
-    yaml_data = _get_data_catalogue(**kwargs)
-    
-    data_dict = {}
-    
-    for data_asset in data_assets:
-        data_dict[data_asset] = yaml_data[data_asset]
-    
-    return data_dict
+    catalogue = get_catalogue(**kwargs)
+
+    return {data_asset: catalogue[data_asset].to_dict() for data_asset in data_assets}
+
+def prewarm_catalogue_stages(sf_helper: SnowflakeDataHelper, **kwargs) -> None:
+    """
+    Make sure every stage named in the catalogue exists, using one metadata query
+
+    Args:
+        sf_helper (SnowflakeDataHelper): Helper whose session cache gets pre-warmed.
+    """
+    catalogue = get_catalogue(**kwargs)
+    sf_helper.prewarm_stages(spec.target_path for spec in catalogue)
+
+def _match_declared_columns(columns: list[str], asset_spec: AssetSpec) -> dict:
+    """
+    Map actual column names (possibly upper-cased or quoted by Snowflake) to
+    the names declared in the catalogue.
+    """
+    declared = {name.lower(): name for name in (asset_spec.columns or {})}
+    return {
+        actual: declared[actual.strip('"').lower()]
+        for actual in columns
+        if actual.strip('"').lower() in declared
+    }
+
+def _to_pandas(df: Union[pd.DataFrame, pd.Series, SPDataFrame], asset_spec: AssetSpec) -> pd.DataFrame:
+    """
+    Convert to a pandas DataFrame with the column names and dtypes declared in the catalogue
+    """
+    if isinstance(df, SPDataFrame):
+        df = df.to_pandas()
+    elif isinstance(df, pd.Series):
+        df = df.to_frame()
+
+    df = df.rename(columns=_match_declared_columns(list(df.columns), asset_spec))
+    dtypes = asset_spec.pandas_dtypes([c for c in df.columns if c in (asset_spec.columns or {})])
+    return df.astype(dtypes) if dtypes else df
+
+def _narrow_float(values: np.ndarray, atol: float = 0.0) -> Optional[np.ndarray]:
+    finite = values[np.isfinite(values)]
+    if finite.size and np.abs(finite).max() > np.finfo(np.float32).max:
+        return None
+    narrowed = values.astype(np.float32)
+    # NaN and inf survive the cast, only finite values can lose precision
+    error = np.abs(narrowed[np.isfinite(values)].astype(np.float64) - finite)
+    return narrowed if np.all(error <= atol) else None
+
+def _narrow_int(values: np.ndarray) -> Optional[np.ndarray]:
+    if not values.size:
+        return None
+    low, high = values.min(), values.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        if dtype().itemsize < values.dtype.itemsize and np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+            return values.astype(dtype)
+    return None
+
+def _narrow_declared_floats(df: pd.DataFrame, asset_spec: AssetSpec) -> pd.DataFrame:
+    """
+    Cast the columns given a ``float_atol`` in the catalogue to float32. The
+    result only depends on the catalogue, so every chunk of an asset gets the
+    same dtypes.
+    """
+    narrowed = {}
+    for name, atol in (asset_spec.float_atol or {}).items():
+        if name not in df.columns or df[name].dtype != np.float64:
+            continue
+        values = _narrow_float(df[name].to_numpy(), atol)
+        if values is None:
+            raise ValueError(f"Data asset '{asset_spec.name}': {name} does not fit float32 within {atol}.")
+        narrowed[name] = values
+    if not narrowed:
+        return df
+    df = df.copy(deep=False)
+    for name, values in narrowed.items():
+        df[name] = values
+    return df
+
+def compact_dtypes(
+    df: pd.DataFrame,
+    asset_spec: Optional[AssetSpec] = None,
+    float_atol: Optional[dict[str, float]] = None,
+    category_ratio: float = CATEGORY_MAX_UNIQUE_RATIO
+) -> pd.DataFrame:
+    """
+    Narrow the dtypes of a frame to cut its memory: float64 to float32 when
+    every value round-trips exactly (or within the column's ``float_atol``),
+    integers to the smallest signed width holding their range, and
+    low-cardinality text to categoricals.
+    Columns declared float32/int32 in the catalogue are kept as declared, the
+    ones with a ``float_atol`` in the catalogue are always made float32 and
+    raise ValueError when a value is further off than it allows.
+
+    Args:
+        df (pd.DataFrame): Frame to compact.
+        asset_spec (AssetSpec, optional): Catalogue entry of the frame.
+        float_atol (dict, optional): Column name to the largest absolute error
+            accepted per value when narrowing it to float32, other float64
+            columns are only narrowed when no value changes.
+        category_ratio (float): Largest share of distinct values of a
+            categorical column.
+
+    Returns:
+        pd.DataFrame: Frame with narrowed columns.
+    """
+    declared = (asset_spec.columns or {}) if asset_spec is not None else {}
+    if asset_spec is not None:
+        df = _narrow_declared_floats(df, asset_spec)
+    narrowed = {}
+    for name in df.columns:
+        series = df[name]
+        if declared.get(name) in ("float32", "int32"):
+            continue
+        if series.dtype == np.float64:
+            values = _narrow_float(series.to_numpy(), (float_atol or {}).get(name, 0.0))
+        elif series.dtype.kind == "i":
+            values = _narrow_int(series.to_numpy())
+        elif series.dtype == object or isinstance(series.dtype, pd.StringDtype):
+            values = series.astype("category") if series.nunique() <= category_ratio * len(series) else None
+        else:
+            values = None
+        if values is not None:
+            narrowed[name] = values
+    if not narrowed:
+        return df
+    df = df.copy(deep=False)
+    for name, values in narrowed.items():
+        df[name] = values
+    return df
+
+def _memory_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+def _write_local(df: pd.DataFrame, local_path: Path, file_type: str) -> None:
+    if file_type == "csv":
+        df.to_csv(local_path, index=False)
+    elif file_type == "parquet":
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), local_path)
+    else:
+        raise ValueError(f"Unsupported file type: {file_type}")
+
+def _save_partitioned(
+    df: Union[pd.DataFrame, SPDataFrame],
+    asset_spec: AssetSpec,
+    is_local: bool,
+    sf_helper: Optional[SnowflakeDataHelper],
+    part_name: str,
+    append: bool
+) -> None:
+    """
+    Write a partitioned folder asset as ``<key>=<value>/<part_name>`` files,
+    replacing every data file of the asset unless ``append``.
+    """
+    file_type = asset_spec.file_type
+    partition_by = asset_spec.partition_by
+
+    if is_local:
+        local_dir = Path(asset_spec.local_path)
+        if not append and local_dir.exists():
+            for old_file in local_dir.rglob(f"*.{file_type}"):
+                old_file.unlink()
+        df = _to_pandas(df, asset_spec)
+        for partition, group in df.groupby(partition_paths(df, partition_by), sort=True):
+            partition_dir = local_dir / partition
+            partition_dir.mkdir(parents=True, exist_ok=True)
+            _write_local(group, partition_dir / f"{part_name}.{file_type}", file_type)
+        return
+
+    target_dir = asset_spec.target_path.rstrip("/")
+    if not append:
+        sf_helper._ensure_stage_exists(asset_spec.target_path)
+        sf_helper._snowflake_session.sql(f"REMOVE {target_dir}/ PATTERN = '.*[.]{file_type}'").collect()
+
+    if isinstance(df, SPDataFrame):
+        sf_helper.save_partitioned(df, f"{target_dir}/", file_type, partition_expression(partition_by))
+        return
+
+    df = _to_pandas(df, asset_spec)
+    for partition, group in df.groupby(partition_paths(df, partition_by), sort=True):
+        sf_helper.save_dataframe(
+            data=group,
+            local_path=asset_spec.local_path,
+            stage_path=f"{target_dir}/{partition}/{part_name}.{file_type}",
+            file_type=file_type,
+            chunk_rows=DEFAULT_CHUNK_ROWS
+        )
 
 def save_dataframes(
     dataframes: dict[str, Union[pd.DataFrame, SPDataFrame]],
     data_assets: list[str],
     is_local: bool,
-    sf_helper: SnowflakeDataHelper
+    sf_helper: SnowflakeDataHelper,
+    part_suffix: Optional[str] = None
 ):
     """
     Save dataframe using data asset name
@@ -70,14 +251,31 @@ def save_dataframes(
         data_assets (list[str]): List of asset names to save.
         is_local (bool): Whether running locally or in Snowflake.
         sf_helper (SnowflakeDataHelper): Required when not local.
+        part_suffix (str, optional): Append the data as a new part file
+            ``<asset><part_suffix>`` of folder assets (or rows of transient
+            tables) instead of replacing them.
+
+    Folder assets with ``partition_by`` in the catalogue are written as
+    Hive-style ``<key>=<value>/`` partition directories.
+
+    In a fused run, Snowpark DataFrames are handed to downstream nodes in
+    memory and only assets with ``persist`` set in the catalogue are written.
     """
     assets_details = map_data_assets(data_assets)
 
     if not is_local and sf_helper is None:
         raise ValueError("SnowflakeDataHelper must be provided for Snowflake save.")
 
+    fusion = active_fusion()
     for asset_name, df in dataframes.items():
         asset_info = assets_details[asset_name]
+
+        if fusion is not None and fusion.accepts(df):
+            fusion.put(asset_name, df)
+            if not asset_info.get("persist", True):
+                print(f"Fused {asset_name}, not persisted")
+                continue
+
         file_type = asset_info.get("file_type", "csv")
         is_folder = asset_info.get("is_folder", False)
         table_name = asset_info.get("table_name", None)
@@ -85,60 +283,442 @@ def save_dataframes(
         local_path = Path(asset_info["local_path"])
         target_file = asset_info["target_path"]
 
+        storage = asset_info.get("storage", "stage")
+        if part_suffix and not is_folder and (is_local or storage != "transient_table"):
+            raise ValueError(f"Data asset '{asset_name}' is a single file, it cannot be appended to.")
+        part_name = f"{asset_name}{part_suffix or ''}"
+
+        if asset_info.get("partition_by"):
+            _save_partitioned(df, get_asset_spec(asset_name), is_local, sf_helper, part_name, part_suffix is not None)
+            continue
+
         if is_local:
             # Local save
             if is_folder:
                 local_path.mkdir(parents=True, exist_ok=True)
-                local_path = local_path / f"{asset_name}.{file_type}"
+                local_path = local_path / f"{part_name}.{file_type}"
             else:
                 local_path.parent.mkdir(parents=True, exist_ok=True)
-            df.to_csv(local_path, index=False) if file_type == "csv" else df.to_parquet(local_path, index=False)
+            df = _to_pandas(df, get_asset_spec(asset_name))
+            _write_local(df, local_path, file_type)
+            if profiler.enabled:
+                record_io(asset_name, "write", rows=len(df), bytes=local_path.stat().st_size)
 
         else:
             # Snowflake save
+            if isinstance(df, (pd.DataFrame, pd.Series)):
+                df = _to_pandas(df, get_asset_spec(asset_name))
+            if storage == "transient_table":
+                sf_helper.save_transient_table(df, table_name, append=part_suffix is not None)
+                continue
             if is_folder:
-                target_file = f"{target_file.rstrip('/')}/{asset_name}.{file_type}"
+                target_file = f"{target_file.rstrip('/')}/{part_name}.{file_type}"
             sf_helper.save_dataframe(
                 data=df,
-                local_path=local_path,  # Still needed for Pandas temp file in Snowflake
+                local_path=local_path,  # Names the staged file when target_path is a directory
                 stage_path=target_file,
                 file_type=file_type,
-                table_name=table_name
+                table_name=table_name,
+                chunk_rows=DEFAULT_CHUNK_ROWS if is_folder else None
             )
+            if isinstance(df, pd.DataFrame) and profiler.enabled:
+                record_io(asset_name, "write", rows=len(df), bytes=int(df.memory_usage(deep=True).sum()))
 
 def get_data_reference(
     asset_details: dict,
     sf_helper: SnowflakeDataHelper,
     is_local: bool,
-    file_type: str = "csv"
-) -> Union[Path, List[Path], str]:
+    file_type: Optional[str] = None,
+    partitions: Optional[PartitionFilter] = None
+) -> Union[Path, List[Path], str, List[str]]:
     """
     Resolve path to data asset depending on execution mode (local or Snowflake task).
 
+    Local runs with a session first sync the local copy with the stage
+    through the process-wide ``StageMirror``.
+
     Args:
         asset_details (dict): Contains 'local_path', 'target_path', and optionally 'is_folder'.
         sf_helper (SnowflakeDataHelper): Instance of the helper with Snowflake session.
         is_local (bool): Flag to indicate if running locally.
-        file_type (str): File format to look for (e.g., 'csv', 'parquet').
+        file_type (str, optional): File format to look for (e.g., 'csv', 'parquet').
+            Defaults to the asset's file_type.
+        partitions (dict, optional): Partition key to accepted value(s) of a
+            partitioned folder asset, only matching files are referenced.
 
     Returns:
-        Union[Path, List[Path], str]: Local path(s) or Snowflake path string.
+        Union[Path, List[Path], str, List[str]]: Local path(s), or Snowflake path
+            string (partition directory paths when filtered).
     """
     print(asset_details)
     local_path = Path(asset_details["local_path"])
     target_path = asset_details["target_path"]
     is_folder = asset_details.get("is_folder", False)
+    file_type = file_type or asset_details.get("file_type", "csv")
+    partition_by = asset_details.get("partition_by")
+    validate_partition_filter(partition_by, partitions, asset_details.get("name", str(local_path)))
+    # Partitioned assets keep their files in <key>=<value>/ subdirectories
+    pattern = f"**/*.{file_type}" if partition_by else f"*.{file_type}"
+
+    if not is_folder and target_path.endswith("/"):
+        # Directory targets hold the file under its local name
+        target_path = f"{target_path}{local_path.name}"
 
     if is_local:
+        if sf_helper is not None:
+            # Download missing or changed stage files, once per asset and run
+            get_stage_mirror().sync(sf_helper._snowflake_session, asset_details, partitions)
         if is_folder:
-            if not local_path.exists() or not any(local_path.glob(f"*.{file_type}")):
-                local_path.mkdir(parents=True, exist_ok=True)
-                sf_helper._snowflake_session.file.get(target_path, str(local_path))
-            return list(local_path.glob(f"*.{file_type}"))
+            # Sorted so folder assets keep a stable row order
+            files = sorted(
+                f for f in local_path.glob(pattern)
+                if matches_partitions(f.relative_to(local_path).as_posix(), partitions)
+            )
+            if profiler.enabled:
+                record_io(asset_details.get("name", str(local_path)), "read", bytes=sum(f.stat().st_size for f in files))
+            return files
         else:
-            if not local_path.exists():
-                local_path.parent.mkdir(parents=True, exist_ok=True)
-                sf_helper._snowflake_session.file.get(target_path, str(local_path.parent))
+            if profiler.enabled:
+                record_io(asset_details.get("name", str(local_path)), "read", bytes=local_path.stat().st_size)
             return local_path
+    elif partitions:
+        # Only the directories of the matching partitions are read
+        rows = sf_helper._snowflake_session.sql(f"LIST {target_path}").collect()
+        return sorted({
+            f"@{row['name'].rsplit('/', 1)[0]}/" for row in rows
+            if row["name"].endswith(f".{file_type}") and matches_partitions(row["name"], partitions)
+        })
+    else:
+        return target_path  # Use directly in Snowpark (e.g. session.read.csv(path))
+
+def _read_snowpark_ref(session: Session, asset_spec: AssetSpec, ref: str, with_row_number: bool = False) -> SPDataFrame:
+    reader = session.read.with_metadata(FILE_ROW_NUMBER) if with_row_number else session.read
+    if asset_spec.file_type == "csv":
+        return (
+            reader.schema(asset_spec.snowpark_schema())
+            .option("skip_header", 1 if asset_spec.has_header else 0)
+            .csv(ref)
+        )
+    if asset_spec.file_type == "parquet":
+        df = reader.parquet(ref)
+        if not asset_spec.columns:
+            return df
+        # Parquet carries its own schema, re-impose declared names and types
+        matched = {declared: actual for actual, declared in _match_declared_columns(df.columns, asset_spec).items()}
+        missing = [name for name in asset_spec.columns if name not in matched]
+        if missing:
+            raise ValueError(f"Data asset '{asset_spec.name}' is missing declared columns {missing}.")
+        return df.select([
+            col(matched[name]).cast(field.datatype).alias(name)
+            for name, field in zip(asset_spec.columns, asset_spec.snowpark_schema().fields)
+        ] + ([col(FILE_ROW_NUMBER)] if with_row_number else []))
+    raise ValueError(f"Unsupported file type for Snowpark read: {asset_spec.file_type}")
+
+def read_snowpark(
+    session: Session,
+    asset_name: str,
+    ref: Union[str, Path, List[Path]],
+    columns: Optional[list[str]] = None
+) -> SPDataFrame:
+    """
+    Read a data asset into a lazy Snowpark DataFrame using its catalogue schema
+
+    Args:
+        session (Session): Snowpark session.
+        asset_name (str): Asset name in catalogue.
+        ref (str | Path | list[Path]): Reference returned by ``get_data_reference``.
+        columns (list[str], optional): Columns to project.
+
+    Returns:
+        SPDataFrame: Lazy Snowpark DataFrame.
+    """
+    asset_spec = get_asset_spec(asset_name)
+    refs = ref if isinstance(ref, list) else [ref]
+    if not refs:
+        raise FileNotFoundError(f"No files found for data asset '{asset_name}'.")
+
+    frames = [_read_snowpark_ref(session, asset_spec, str(r)) for r in refs]
+    df = reduce(lambda left, right: left.union_all_by_name(right), frames)
+    return df.select(columns) if columns else df
+
+def read_snowpark_after_row(
+    session: Session,
+    asset_name: str,
+    ref: str,
+    after_row: int = 0
+) -> SPDataFrame:
+    """
+    Read the rows of a staged file past ``after_row``, keeping their
+    ``FILE_ROW_NUMBER`` so the caller can record how far it has read.
+
+    Args:
+        session (Session): Snowpark session.
+        asset_name (str): Asset name in catalogue.
+        ref (str): Stage path of a single file.
+        after_row (int): Last file row number already read.
+
+    Returns:
+        SPDataFrame: Lazy Snowpark DataFrame with a ``FILE_ROW_NUMBER`` column.
+    """
+    df = _read_snowpark_ref(session, get_asset_spec(asset_name), ref, with_row_number=True)
+    return df.filter(col(FILE_ROW_NUMBER) > after_row) if after_row else df
+
+def create_snowpark(session: Session, df: pd.DataFrame, asset_name: str) -> SPDataFrame:
+    """
+    Snowpark DataFrame of pandas rows with the catalogue schema of an asset,
+    so its columns resolve like those of frames read by ``read_snowpark``
+    (``create_dataframe`` alone quotes mixed-case pandas names, e.g. ``"AveRooms"``).
+
+    Args:
+        session (Session): Snowpark session.
+        df (pd.DataFrame): Rows of the asset, with its declared columns.
+        asset_name (str): Asset name in catalogue.
+
+    Returns:
+        SPDataFrame: DataFrame of the declared columns present in ``df``.
+    """
+    asset_spec = get_asset_spec(asset_name)
+    df = df.rename(columns=_match_declared_columns(list(df.columns), asset_spec))
+    columns = [name for name in asset_spec.columns if name in df.columns]
+    # Python scalars, with NULL for missing values
+    values = df[columns].astype(object).where(df[columns].notna(), None)
+    rows = list(values.itertuples(index=False, name=None))
+    return session.create_dataframe(rows, schema=asset_spec.snowpark_schema(columns))
+
+def load_snowpark(
+    session: Session,
+    asset_name: str,
+    is_local: bool,
+    sf_helper: Optional[SnowflakeDataHelper] = None,
+    columns: Optional[list[str]] = None,
+    partitions: Optional[PartitionFilter] = None
+) -> SPDataFrame:
+    """
+    Lazy Snowpark DataFrame of a data asset: the frame handed over by its
+    producer in a fused run, its transient table, or its files.
+
+    Args:
+        session (Session): Snowpark session.
+        asset_name (str): Asset name in catalogue.
+        is_local (bool): Read local files, otherwise the stage or table.
+        sf_helper (SnowflakeDataHelper, optional): Defaults to a helper on ``session``.
+        columns (list[str], optional): Columns to project.
+        partitions (dict, optional): Only read these partitions of a partitioned asset.
+
+    Returns:
+        SPDataFrame: Lazy Snowpark DataFrame.
+    """
+    df = fused_frame(asset_name, session)
+    if df is not None and not partitions:
+        return df.select(columns) if columns else df
+
+    asset_spec = get_asset_spec(asset_name)
+    if not is_local and asset_spec.storage == "transient_table":
+        df = session.table(asset_spec.table_name)
+        return df.select(columns) if columns else df
+
+    sf_helper = sf_helper or SnowflakeDataHelper(session)
+    ref = get_data_reference(asset_spec.to_dict(), sf_helper, is_local, partitions=partitions)
+    return read_snowpark(session, asset_name, ref, columns)
+
+def _read_pandas_source(source, asset_spec: AssetSpec, columns: Optional[list[str]]) -> pd.DataFrame:
+    if asset_spec.file_type == "parquet":
+        return pq.read_table(source, columns=columns).to_pandas()
+    if asset_spec.file_type == "csv":
+        return pd.read_csv(
+            source,
+            engine="pyarrow",
+            header=0 if asset_spec.has_header else None,
+            names=None if asset_spec.has_header else list(asset_spec.columns),
+            usecols=columns,
+            dtype=asset_spec.pandas_dtypes(columns) or None,
+        )
+    raise ValueError(f"Unsupported file type: {asset_spec.file_type}")
+
+def _pandas_sources(
+    asset_spec: AssetSpec,
+    is_local: bool,
+    sf_helper: Optional[SnowflakeDataHelper],
+    partitions: Optional[PartitionFilter] = None
+) -> list:
+    """
+    Local paths, or stage file paths when not local, holding the asset's data
+    (in the requested partitions only).
+    """
+    validate_partition_filter(asset_spec.partition_by, partitions, asset_spec.name)
+    ref = get_data_reference(asset_spec.to_dict(), sf_helper, is_local, partitions=partitions if is_local else None)
+
+    if is_local:
+        sources = ref if isinstance(ref, list) else [ref]
+    else:
+        if sf_helper is None:
+            raise ValueError("SnowflakeDataHelper must be provided for Snowflake read.")
+        if asset_spec.is_folder:
+            rows = sf_helper._snowflake_session.sql(f"LIST {ref}").collect()
+            sources = sorted(
+                f"@{row['name']}" for row in rows
+                if row["name"].endswith(f".{asset_spec.file_type}") and matches_partitions(row["name"], partitions)
+            )
+        else:
+            sources = [ref]
+
+    if not sources:
+        raise FileNotFoundError(f"No files found for data asset '{asset_spec.name}'.")
+    return sources
+
+def _open_source(source, sf_helper: Optional[SnowflakeDataHelper]):
+    if isinstance(source, str) and source.startswith("@"):
+        return io.BytesIO(sf_helper._snowflake_session.file.get_stream(source).read())
+    return source
+
+def _compact(df: pd.DataFrame, asset_spec: AssetSpec, compact: Optional[bool]) -> pd.DataFrame:
+    if not (asset_spec.compact if compact is None else compact):
+        return df
+    before = _memory_bytes(df)
+    df = compact_dtypes(df, asset_spec)
+    after = _memory_bytes(df)
+    logger.info(f"{asset_spec.name}: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB after dtype compaction")
+    record_memory(asset_spec.name, before, after)
+    return df
+
+def read_pandas(
+    asset_name: str,
+    is_local: bool,
+    sf_helper: Optional[SnowflakeDataHelper] = None,
+    columns: Optional[list[str]] = None,
+    partitions: Optional[PartitionFilter] = None,
+    max_workers: int = DEFAULT_READ_WORKERS,
+    compact: Optional[bool] = None
+) -> pd.DataFrame:
+    """
+    Read a data asset into pandas through Arrow, with the dtypes declared in the catalogue
+
+    Files of folder assets are read concurrently, partitioned assets can be
+    pruned to the files of the requested partitions.
+
+    Args:
+        asset_name (str): Asset name in catalogue.
+        is_local (bool): Read local files, otherwise stream the files from the stage.
+        sf_helper (SnowflakeDataHelper, optional): Required when not local, or
+            locally when the asset still has to be downloaded.
+        columns (list[str], optional): Columns to project.
+        partitions (dict, optional): Partition key to accepted value(s), e.g.
+            ``{"geo_bucket": ["37_-123", "37_-122"]}``.
+        max_workers (int): Files read at the same time.
+        compact (bool, optional): Narrow the dtypes with ``compact_dtypes``
+            and log the memory saved. Defaults to the asset's ``compact``.
+
+    Returns:
+        pd.DataFrame: Asset data.
+    """
+    asset_spec = get_asset_spec(asset_name)
+    if not is_local and asset_spec.storage == "transient_table":
+        if sf_helper is None:
+            raise ValueError("SnowflakeDataHelper must be provided for Snowflake read.")
+        table = sf_helper._snowflake_session.table(asset_spec.table_name)
+        df = _to_pandas(table.select(columns) if columns else table, asset_spec)
+        record_io(asset_name, "read", rows=len(df))
+        return _compact(df, asset_spec, compact)
+
+    sources = _pandas_sources(asset_spec, is_local, sf_helper, partitions)
+
+    def read_source(source) -> pd.DataFrame:
+        return _read_pandas_source(_open_source(source, sf_helper), asset_spec, columns)
+
+    if len(sources) == 1 or max_workers <= 1:
+        frames = [read_source(source) for source in sources]
     else:
-        return target_path  # Use directly in Snowpark (e.g. session.read.csv(path))
\ No newline at end of file
+        # Arrow parsing and stage downloads release the GIL, map keeps the file order
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(sources))) as pool:
+            frames = list(pool.map(read_source, sources))
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    df = _to_pandas(df, asset_spec)
+    record_io(asset_name, "read", rows=len(df))
+    return _compact(df, asset_spec, compact)
+
+def _iter_source_batches(source, asset_spec: AssetSpec, chunk_rows: int, columns: Optional[list[str]]) -> Iterator[pd.DataFrame]:
+    if asset_spec.file_type == "parquet":
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    elif asset_spec.file_type == "csv":
+        yield from pd.read_csv(
+            source,
+            header=0 if asset_spec.has_header else None,
+            names=None if asset_spec.has_header else list(asset_spec.columns),
+            usecols=columns,
+            dtype=asset_spec.pandas_dtypes(columns) or None,
+            chunksize=chunk_rows,
+        )
+    else:
+        raise ValueError(f"Unsupported file type: {asset_spec.file_type}")
+
+def iter_pandas_chunks(
+    asset_name: str,
+    is_local: bool,
+    chunk_rows: int,
+    sf_helper: Optional[SnowflakeDataHelper] = None,
+    columns: Optional[list[str]] = None,
+    partitions: Optional[PartitionFilter] = None,
+    compact: Optional[bool] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a data asset as consecutive chunks of exactly ``chunk_rows`` rows (the
+    last one may be shorter), whatever the file and row group boundaries are.
+    Two assets with the same row order can therefore be iterated in lock-step.
+
+    Args:
+        asset_name (str): Asset name in catalogue.
+        is_local (bool): Read local files, otherwise stream the files from the stage.
+        chunk_rows (int): Rows per chunk.
+        sf_helper (SnowflakeDataHelper, optional): Required when not local.
+        columns (list[str], optional): Columns to project.
+        partitions (dict, optional): Only read these partitions of a partitioned asset.
+        compact (bool, optional): Make the columns given a ``float_atol`` in
+            the catalogue float32. Only the catalogue decides the dtypes, so
+            they are the same for every chunk. Defaults to the asset's ``compact``.
+
+    Yields:
+        pd.DataFrame: Chunks with the dtypes declared in the catalogue.
+    """
+    asset_spec = get_asset_spec(asset_name)
+    compact = asset_spec.compact if compact is None else compact
+    pending: list[pd.DataFrame] = []
+    pending_rows = 0
+    total_rows = 0
+
+    for source in _pandas_sources(asset_spec, is_local, sf_helper, partitions):
+        for batch in _iter_source_batches(_open_source(source, sf_helper), asset_spec, chunk_rows, columns):
+            pending.append(batch)
+            pending_rows += len(batch)
+            while pending_rows >= chunk_rows:
+                buffer = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+                chunk, rest = buffer.iloc[:chunk_rows], buffer.iloc[chunk_rows:]
+                pending, pending_rows = ([rest] if len(rest) else []), len(rest)
+                total_rows += len(chunk)
+                chunk = _to_pandas(chunk.reset_index(drop=True), asset_spec)
+                yield _narrow_declared_floats(chunk, asset_spec) if compact else chunk
+
+    if pending_rows:
+        chunk = _to_pandas(pd.concat(pending, ignore_index=True), asset_spec)
+        total_rows += len(chunk)
+        yield _narrow_declared_floats(chunk, asset_spec) if compact else chunk
+    record_io(asset_name, "read", rows=total_rows)
+
+def count_rows(
+    asset_name: str,
+    is_local: bool,
+    sf_helper: Optional[SnowflakeDataHelper] = None
+) -> int:
+    """
+    Number of rows of a data asset, from the Parquet footers when possible.
+    """
+    asset_spec = get_asset_spec(asset_name)
+    n_rows = 0
+    for source in _pandas_sources(asset_spec, is_local, sf_helper):
+        source = _open_source(source, sf_helper)
+        if asset_spec.file_type == "parquet":
+            n_rows += pq.ParquetFile(source).metadata.num_rows
+        else:
+            first_column = list(asset_spec.columns)[:1] if asset_spec.columns else None
+            n_rows += sum(len(batch) for batch in _iter_source_batches(source, asset_spec, DEFAULT_CHUNK_ROWS, first_column))
+    return n_rows
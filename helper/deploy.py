@@ -0,0 +1,312 @@
+import hashlib
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from snowflake.snowpark import Session
+
+logger = logging.getLogger(__name__)
+
+_DEPLOY_HASH_PATTERN = re.compile(r"deploy_hash=([0-9a-f]+)")
+
+
+def _short_name(name: str) -> str:
+    # SHOW commands return unqualified, upper-cased identifiers
+    return name.split(".")[-1].strip('"').upper()
+
+
+def _parse_deploy_hash(comment: Optional[str]) -> Optional[str]:
+    match = _DEPLOY_HASH_PATTERN.search(comment or "")
+    return match.group(1) if match else None
+
+
+@dataclass(frozen=True)
+class TaskSpec:
+    """
+    Desired state of a Snowflake task.
+    """
+    name: str
+    body: str
+    warehouse: Optional[str] = None
+    after: tuple = ()
+    schedule: Optional[str] = None
+    resume: bool = False
+    # (NAME, value) task parameters, e.g. ("USER_TASK_TIMEOUT_MS", 3600000). Without
+    # a warehouse the task is serverless, sized by USER_TASK_MANAGED_INITIAL_WAREHOUSE_SIZE
+    parameters: tuple = ()
+
+    def render(self, comment: Optional[str] = None) -> str:
+        lines = [f"CREATE OR REPLACE TASK {self.name}"]
+        if self.warehouse:
+            lines.append(f"WAREHOUSE = {self.warehouse}")
+        if self.schedule:
+            lines.append(f"SCHEDULE = '{self.schedule}'")
+        for name, value in self.parameters:
+            lines.append(f"{name} = {value}" if isinstance(value, (int, float)) else f"{name} = '{value}'")
+        if comment:
+            lines.append(f"COMMENT = '{comment}'")
+        if self.after:
+            lines.append("AFTER " + ", ".join(self.after))
+        lines.append(f"AS {self.body}")
+        return "\n".join(lines)
+
+    @property
+    def deploy_hash(self) -> str:
+        return hashlib.sha256(self.render().encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class WarehouseSpec:
+    """
+    Warehouse a task runs on, created suspended when it does not exist and
+    resized when it exists with another size.
+    """
+    name: str
+    size: str
+    auto_suspend: int = 60
+
+    def render(self) -> str:
+        return "\n".join([
+            f"CREATE WAREHOUSE IF NOT EXISTS {self.name}",
+            f"WAREHOUSE_SIZE = {self.size}",
+            f"AUTO_SUSPEND = {self.auto_suspend}",
+            "AUTO_RESUME = TRUE",
+            "INITIALLY_SUSPENDED = TRUE",
+        ])
+
+    def render_resize(self) -> str:
+        return f"ALTER WAREHOUSE {self.name} SET WAREHOUSE_SIZE = {self.size}"
+
+
+@dataclass(frozen=True)
+class SprocSpec:
+    """
+    Desired state of a stored procedure. ``register`` performs the registration,
+    ``signature`` is the argument type list used to comment the procedure.
+    """
+    name: str
+    deploy_hash: str
+    register: Callable[[], None]
+    signature: str = "ARRAY, ARRAY, BOOLEAN, STRING"
+
+
+@dataclass
+class DeployPlan:
+    warehouses: List[WarehouseSpec] = field(default_factory=list)
+    resizes: List[WarehouseSpec] = field(default_factory=list)
+    sprocs: List[SprocSpec] = field(default_factory=list)
+    tasks: List[TaskSpec] = field(default_factory=list)
+    resumes: List[TaskSpec] = field(default_factory=list)
+    suspends: List[TaskSpec] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.warehouses or self.resizes or self.sprocs or self.tasks or self.resumes)
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.warehouses)} warehouse(s) to create, {len(self.resizes)} to resize, "
+            f"{len(self.sprocs)} sproc(s) to register, {len(self.tasks)} task(s) to create, "
+            f"{len(self.resumes)} task(s) to resume, {len(self.unchanged)} unchanged"
+        )
+
+
+class DeployPlanner:
+    def __init__(self, session: Session, database: Optional[str] = None, schema: Optional[str] = None, max_workers: int = 8):
+        """
+        Compare desired sprocs and tasks with what exists in a schema and apply only the differences.
+
+        The deployed state is recognised through a ``deploy_hash=...`` comment
+        written on every object the planner creates.
+
+        Args:
+            session (Session): Snowpark session.
+            database (str, optional): Defaults to the session's current database.
+            schema (str, optional): Defaults to the session's current schema.
+            max_workers (int): Concurrent sproc registrations.
+        """
+        self.session = session
+        self.database = database or session.get_current_database()
+        self.schema = schema or session.get_current_schema()
+        self.max_workers = max_workers
+        self._existing_tasks: Optional[Dict[str, dict]] = None
+        self._existing_sprocs: Optional[Dict[str, Optional[str]]] = None
+        self._existing_warehouses: Optional[Dict[str, Optional[str]]] = None
+
+    def _show(self, object_type: str) -> list:
+        try:
+            return self.session.sql(f"SHOW {object_type} IN SCHEMA {self.database}.{self.schema}").collect()
+        except Exception as e:
+            logger.debug(f"SHOW {object_type} failed, assuming none exist: {e}")
+            return []
+
+    def existing_tasks(self) -> Dict[str, dict]:
+        if self._existing_tasks is None:
+            self._existing_tasks = {
+                row["name"].upper(): {"state": row["state"], "deploy_hash": _parse_deploy_hash(row["comment"])}
+                for row in self._show("TASKS")
+            }
+        return self._existing_tasks
+
+    def existing_sprocs(self) -> Dict[str, Optional[str]]:
+        if self._existing_sprocs is None:
+            self._existing_sprocs = {
+                row["name"].upper(): _parse_deploy_hash(row["description"])
+                for row in self._show("USER PROCEDURES")
+            }
+        return self._existing_sprocs
+
+    def existing_warehouses(self) -> Dict[str, Optional[str]]:
+        """
+        Existing warehouses and their sizes, as spelled in ``WarehouseSpec``
+        ('XSMALL' where SHOW WAREHOUSES says 'X-Small').
+        """
+        # Imported here, helper.compute builds on this module
+        from helper.compute import normalise_size
+
+        if self._existing_warehouses is None:
+            try:
+                rows = self.session.sql("SHOW WAREHOUSES").collect()
+            except Exception as e:
+                logger.debug(f"SHOW WAREHOUSES failed, assuming none exist: {e}")
+                rows = []
+            self._existing_warehouses = {}
+            for row in rows:
+                try:
+                    size = normalise_size(row["size"])
+                except ValueError:
+                    size = None
+                self._existing_warehouses[row["name"].upper()] = size
+        return self._existing_warehouses
+
+    def plan(
+        self,
+        sprocs: List[SprocSpec] = (),
+        tasks: List[TaskSpec] = (),
+        warehouses: List[WarehouseSpec] = ()
+    ) -> DeployPlan:
+        """
+        Work out which warehouses are missing or sized differently and which
+        sprocs and tasks differ from the deployed state.
+        """
+        deploy_plan = DeployPlan()
+
+        existing_warehouses = self.existing_warehouses() if warehouses else {}
+        for warehouse in dict.fromkeys(warehouses):
+            name = _short_name(warehouse.name)
+            if name not in existing_warehouses:
+                deploy_plan.warehouses.append(warehouse)
+            elif existing_warehouses[name] != warehouse.size:
+                deploy_plan.resizes.append(warehouse)
+
+        existing_sprocs = self.existing_sprocs() if sprocs else {}
+        for sproc in sprocs:
+            if existing_sprocs.get(_short_name(sproc.name)) == sproc.deploy_hash:
+                deploy_plan.unchanged.append(sproc.name)
+            else:
+                deploy_plan.sprocs.append(sproc)
+
+        existing_tasks = self.existing_tasks() if tasks else {}
+        for task in tasks:
+            current = existing_tasks.get(_short_name(task.name))
+            if current is None or current["deploy_hash"] != task.deploy_hash:
+                deploy_plan.tasks.append(task)
+                if task.resume:
+                    deploy_plan.resumes.append(task)
+            elif task.resume and current["state"].lower() == "suspended":
+                deploy_plan.resumes.append(task)
+            else:
+                deploy_plan.unchanged.append(task.name)
+
+        if deploy_plan.tasks:
+            # Tasks in a graph can only be replaced while its root is suspended
+            for task in tasks:
+                current = existing_tasks.get(_short_name(task.name))
+                if not task.after and current is not None and current["state"].lower() == "started":
+                    deploy_plan.suspends.append(task)
+                    if task not in deploy_plan.resumes:
+                        deploy_plan.resumes.append(task)
+
+        return deploy_plan
+
+    def _task_levels(self, tasks: List[TaskSpec]) -> List[List[TaskSpec]]:
+        """
+        Group tasks so every task comes in a later level than the planned tasks it runs after.
+        """
+        by_name = {_short_name(task.name): task for task in tasks}
+        remaining = {
+            name: {_short_name(dep) for dep in task.after} & set(by_name)
+            for name, task in by_name.items()
+        }
+        levels = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Task graph has a cycle between {sorted(remaining)}")
+            levels.append([by_name[name] for name in ready])
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return levels
+
+    def _run_concurrently(self, statements: List[str]) -> None:
+        # Submit every statement asynchronously, then wait for all of them
+        jobs = [self.session.sql(statement).collect_nowait() for statement in statements]
+        for job in jobs:
+            job.result()
+
+    def _register_sproc(self, sproc: SprocSpec) -> None:
+        sproc.register()
+        self.session.sql(
+            f"ALTER PROCEDURE {sproc.name}({sproc.signature}) SET COMMENT = 'deploy_hash={sproc.deploy_hash}'"
+        ).collect()
+        print(f"Registered stored procedure: {sproc.name}")
+
+    def apply(self, deploy_plan: DeployPlan) -> None:
+        """
+        Apply a plan: register sprocs concurrently, then create tasks level by
+        level in task-graph order, then resume tasks children first.
+        """
+        print(f"Deploy plan: {deploy_plan.summary()}")
+        if deploy_plan.is_empty():
+            return
+
+        if deploy_plan.warehouses or deploy_plan.resizes:
+            self._run_concurrently(
+                [warehouse.render() for warehouse in deploy_plan.warehouses]
+                + [warehouse.render_resize() for warehouse in deploy_plan.resizes]
+            )
+            for warehouse in deploy_plan.warehouses:
+                print(f"Created warehouse: {warehouse.name}")
+            for warehouse in deploy_plan.resizes:
+                print(f"Resized warehouse: {warehouse.name} to {warehouse.size}")
+
+        if deploy_plan.sprocs:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for future in [pool.submit(self._register_sproc, sproc) for sproc in deploy_plan.sprocs]:
+                    future.result()
+
+        if deploy_plan.suspends:
+            self._run_concurrently([f"ALTER TASK {task.name} SUSPEND" for task in deploy_plan.suspends])
+
+        levels = self._task_levels(deploy_plan.tasks)
+        for level in levels:
+            self._run_concurrently([
+                task.render(comment=f"deploy_hash={task.deploy_hash}") for task in level
+            ])
+            for task in level:
+                print(f"Created task: {task.name}")
+
+        resume_levels = self._task_levels(deploy_plan.resumes)
+        for level in reversed(resume_levels):
+            self._run_concurrently([f"ALTER TASK {task.name} RESUME" for task in level])
+            for task in level:
+                print(f"Resumed task: {task.name}")
+
+        # Refresh the deployed state on next plan
+        self._existing_tasks = None
+        self._existing_sprocs = None
+        self._existing_warehouses = None
@@ -0,0 +1,259 @@
+import functools
+import hashlib
+import inspect
+import io
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from helper.data_helper import map_data_assets
+from helper.fusion import has_fused_inputs
+from helper.registry import node_dependencies
+from helper.snowflake_data_helper import SnowflakeDataHelper
+from helper.stage_mirror import get_stage_mirror
+
+logger = logging.getLogger(__name__)
+
+# Set to "1" to ignore stored fingerprints and always execute nodes
+FORCE_RERUN_ENV = "PIPELINE_FORCE_RERUN"
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Project root, local modules a node imports are found below it
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _hash_local_asset(asset_details: dict) -> str:
+    """
+    Hash the content of a local asset (single file or every file in a folder).
+    """
+    local_path = Path(asset_details["local_path"])
+    file_type = asset_details.get("file_type", "csv")
+
+    if asset_details.get("is_folder", False):
+        files = sorted(local_path.rglob(f"*.{file_type}")) if local_path.exists() else []
+    else:
+        files = [local_path] if local_path.exists() else []
+
+    if not files:
+        return "missing"
+
+    digest = hashlib.sha256()
+    for file in files:
+        digest.update(file.relative_to(local_path.parent).as_posix().encode())
+        with open(file, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_stage_asset(asset_details: dict, sf_helper: SnowflakeDataHelper) -> str:
+    """
+    Hash a stage asset from its LIST metadata (name, size and md5 of every file).
+    """
+    try:
+        rows = sf_helper._snowflake_session.sql(f"LIST {asset_details['target_path']}").collect()
+    except Exception as e:
+        logger.debug(f"Could not list {asset_details['target_path']}: {e}")
+        return "missing"
+
+    if asset_details.get("is_folder", False):
+        file_type = asset_details.get("file_type", "csv")
+        rows = [row for row in rows if row["name"].endswith(f".{file_type}")]
+
+    if not rows:
+        return "missing"
+
+    digest = hashlib.sha256()
+    for row in sorted(rows, key=lambda r: r["name"]):
+        digest.update(f"{row['name']}|{row['size']}|{row['md5']}".encode())
+    return digest.hexdigest()
+
+
+def hash_node_code(func) -> str:
+    """
+    Hash the source of the module defining the node and of every local module
+    it imports (the files ``registry.node_dependencies`` bundles for its
+    sproc), so changes to the helpers a node calls also invalidate the fingerprint.
+    """
+    digest = hashlib.sha256()
+    try:
+        files, _ = node_dependencies(func, root=_PROJECT_ROOT)
+    except (OSError, SyntaxError, ValueError) as e:
+        logger.debug(f"Could not resolve the dependencies of {func.__name__}: {e}")
+        files = []
+    for file in files:
+        digest.update(file.relative_to(_PROJECT_ROOT).as_posix().encode())
+        digest.update(file.read_bytes())
+    if files:
+        return digest.hexdigest()
+
+    # Sources not on disk (e.g. zip imports in a sproc), hash the node's module alone
+    try:
+        source = inspect.getsource(inspect.getmodule(func))
+    except (OSError, TypeError):
+        code = func.__code__
+        source = repr((code.co_code, code.co_consts, code.co_names))
+    digest.update(source.encode())
+    return digest.hexdigest()
+
+
+def compute_node_fingerprint(
+    func,
+    input_data: list[str],
+    params: dict,
+    is_local: bool,
+    sf_helper: Optional[SnowflakeDataHelper] = None
+) -> dict:
+    """
+    Compute the fingerprint of a node run.
+
+    Args:
+        func (callable): Node function.
+        input_data (list[str]): Input asset names in catalogue.
+        params (dict): Remaining node arguments (output names, flags, options).
+        is_local (bool): Whether inputs are hashed from local files or stage metadata.
+        sf_helper (SnowflakeDataHelper): Required when not local. Local runs
+            with a helper first sync each input through the ``StageMirror``,
+            so a stale local copy cannot match the stored fingerprint.
+
+    Returns:
+        dict: Hashes of the node code, params and each input asset.
+    """
+    assets_details = map_data_assets(input_data)
+
+    inputs = {}
+    for asset_name, asset_details in assets_details.items():
+        if is_local:
+            if sf_helper is not None:
+                get_stage_mirror().sync(sf_helper._snowflake_session, asset_details)
+            inputs[asset_name] = _hash_local_asset(asset_details)
+        else:
+            inputs[asset_name] = _hash_stage_asset(asset_details, sf_helper)
+
+    return {
+        "code": hash_node_code(func),
+        "params": hashlib.sha256(json.dumps(params, sort_keys=True, default=repr).encode()).hexdigest(),
+        "inputs": inputs,
+    }
+
+
+class NodeManifest:
+    """
+    Fingerprint of the last successful run of a node, stored next to the node's
+    first output asset (``.<node>.<kind>.json``) locally or on the stage.
+    """
+
+    def __init__(
+        self,
+        node_name: str,
+        output_data: list[str],
+        is_local: bool,
+        sf_helper: Optional[SnowflakeDataHelper] = None,
+        kind: str = "fingerprint"
+    ):
+        self.node_name = node_name
+        self.is_local = is_local
+        self.sf_helper = sf_helper
+        self.assets_details = map_data_assets(output_data)
+
+        first_output = next(iter(self.assets_details.values()))
+        file_name = f".{node_name}.{kind}.json"
+        local_path = Path(first_output["local_path"])
+        local_dir = local_path if first_output.get("is_folder", False) else local_path.parent
+        self.local_path = local_dir / file_name
+
+        target_path = first_output["target_path"]
+        if not first_output.get("is_folder", False) and not target_path.endswith("/"):
+            target_path = target_path.rsplit("/", 1)[0]
+        self.target_path = f"{target_path.rstrip('/')}/{file_name}"
+
+    def load(self) -> Optional[dict]:
+        try:
+            if self.is_local:
+                if not self.local_path.exists():
+                    return None
+                with open(self.local_path, "r") as f:
+                    return json.load(f)
+            stream = self.sf_helper._snowflake_session.file.get_stream(self.target_path)
+            return json.loads(stream.read().decode("utf-8"))
+        except Exception as e:
+            logger.debug(f"No fingerprint manifest for {self.node_name}: {e}")
+            return None
+
+    def save(self, fingerprint: dict) -> None:
+        payload = json.dumps(fingerprint, indent=2, sort_keys=True)
+        if self.is_local:
+            self.local_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.local_path, "w") as f:
+                f.write(payload)
+        else:
+            self.sf_helper._ensure_stage_exists(self.target_path)
+            self.sf_helper._snowflake_session.file.put_stream(
+                io.BytesIO(payload.encode("utf-8")),
+                self.target_path,
+                auto_compress=False,
+                overwrite=True
+            )
+
+    def delete(self) -> None:
+        if self.is_local:
+            self.local_path.unlink(missing_ok=True)
+        else:
+            self.sf_helper._snowflake_session.sql(f"REMOVE {self.target_path}").collect()
+
+    def outputs_exist(self) -> bool:
+        for asset_details in self.assets_details.values():
+            if self.is_local:
+                if _hash_local_asset(asset_details) == "missing":
+                    return False
+            elif _hash_stage_asset(asset_details, self.sf_helper) == "missing":
+                return False
+        return True
+
+
+def fingerprinted(func):
+    """
+    Skip a node when its code, params and input assets are unchanged since its
+    last successful run and its outputs still exist.
+
+    The node must take ``input_data``, ``output_data`` and ``is_local`` arguments,
+    and optionally ``session`` (required to fingerprint stage assets).
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if os.getenv(FORCE_RERUN_ENV) == "1":
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+
+        session = arguments.pop("session", None)
+        input_data = arguments["input_data"]
+        is_local = arguments["is_local"]
+        sf_helper = SnowflakeDataHelper(session) if session is not None else None
+
+        if not is_local and sf_helper is None:
+            return func(*args, **kwargs)
+
+        if has_fused_inputs(input_data):
+            # Fused inputs are not on disk, their stored hashes say nothing about them
+            return func(*args, **kwargs)
+
+        fingerprint = compute_node_fingerprint(func, input_data, arguments, is_local, sf_helper)
+        manifest = NodeManifest(func.__name__, arguments["output_data"], is_local, sf_helper)
+
+        if manifest.load() == fingerprint and manifest.outputs_exist():
+            print(f"Skipping {func.__name__}: inputs, code and params unchanged")
+            return None
+
+        result = func(*args, **kwargs)
+        manifest.save(fingerprint)
+        return result
+
+    return wrapper
@@ -0,0 +1,84 @@
+import logging
+import threading
+from typing import Optional
+
+from snowflake.snowpark import DataFrame as SPDataFrame
+from snowflake.snowpark import Session
+
+logger = logging.getLogger(__name__)
+
+_active: Optional["FusionContext"] = None
+_active_lock = threading.Lock()
+
+
+class FusionContext:
+    """
+    In-memory handoff of lazy Snowpark DataFrames between nodes sharing a session.
+
+    While the context is active, ``save_dataframes`` hands Snowpark outputs to
+    the context (and only writes assets with ``persist`` set in the catalogue),
+    and ``load_snowpark`` returns them to consumers. The consumer's plan then
+    composes with the producer's into one query, instead of an unload to the
+    stage and a parse back.
+
+    Only one context can be active at a time, it is visible from every thread
+    so the nodes of a parallel local run can share it.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._frames: dict[str, SPDataFrame] = {}
+        # Assets whose producer rebuilt them in full rather than handing over a delta
+        self.refreshed: set[str] = set()
+        self._lock = threading.Lock()
+
+    def accepts(self, df) -> bool:
+        return isinstance(df, SPDataFrame) and getattr(df, "session", self.session) is self.session
+
+    def put(self, asset_name: str, df: SPDataFrame) -> None:
+        with self._lock:
+            self._frames[asset_name] = df
+        logger.debug(f"Fused {asset_name} for downstream nodes")
+
+    def get(self, asset_name: str, session: Session) -> Optional[SPDataFrame]:
+        if session is not self.session:
+            return None
+        with self._lock:
+            return self._frames.get(asset_name)
+
+    def __contains__(self, asset_name: str) -> bool:
+        with self._lock:
+            return asset_name in self._frames
+
+    def __enter__(self) -> "FusionContext":
+        global _active
+        with _active_lock:
+            if _active is not None:
+                raise RuntimeError("A fused run is already active.")
+            _active = self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _active
+        with _active_lock:
+            _active = None
+        with self._lock:
+            self._frames.clear()
+            self.refreshed.clear()
+
+
+def active_fusion() -> Optional[FusionContext]:
+    return _active
+
+
+def fused_frame(asset_name: str, session: Session) -> Optional[SPDataFrame]:
+    """
+    Lazy DataFrame handed over for ``asset_name`` in the active fused run, if any.
+    """
+    fusion = _active
+    return fusion.get(asset_name, session) if fusion is not None else None
+
+
+def has_fused_inputs(input_data: list[str]) -> bool:
+    fusion = _active
+    return fusion is not None and any(asset_name in fusion for asset_name in input_data)
@@ -0,0 +1,329 @@
+import hashlib
+import logging
+import uuid
+from datetime import datetime, timezone
+from functools import reduce
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+from snowflake.snowpark import DataFrame as SPDataFrame
+from snowflake.snowpark import Session
+from snowflake.snowpark.functions import col
+from snowflake.snowpark.functions import max as max_
+
+from helper.catalogue import AssetSpec, get_asset_spec
+from helper.data_helper import (
+    FILE_ROW_NUMBER,
+    _read_pandas_source,
+    create_snowpark,
+    get_data_reference,
+    load_snowpark,
+    read_snowpark,
+    read_snowpark_after_row,
+    save_dataframes,
+)
+from helper.fingerprint import NodeManifest
+from helper.fusion import active_fusion
+from helper.snowflake_data_helper import SnowflakeDataHelper
+
+logger = logging.getLogger(__name__)
+
+INCREMENTAL_MODES = ("full", "incremental")
+
+_STREAM_METADATA = "METADATA$ACTION, METADATA$ISUPDATE, METADATA$ROW_ID"
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _md5_file(path: Union[str, Path]) -> str:
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def list_asset_files(asset_spec: AssetSpec, is_local: bool, sf_helper: Optional[SnowflakeDataHelper]) -> dict:
+    """
+    Files holding an asset with their md5: LIST metadata on the stage, or
+    hashes of the local files as an offline stand-in.
+
+    Returns:
+        dict: File name to ``{"ref": path to read, "md5": hash}``.
+    """
+    ref = get_data_reference(asset_spec.to_dict(), sf_helper, is_local)
+    if is_local:
+        files = ref if isinstance(ref, list) else [ref]
+        root = Path(asset_spec.local_path) if asset_spec.is_folder else Path(asset_spec.local_path).parent
+        return {Path(f).relative_to(root).as_posix(): {"ref": str(f), "md5": _md5_file(f)} for f in files}
+
+    rows = sf_helper._snowflake_session.sql(f"LIST {ref}").collect()
+    if asset_spec.is_folder:
+        rows = [row for row in rows if row["name"].endswith(f".{asset_spec.file_type}")]
+    else:
+        rows = [row for row in rows if row["name"].endswith(ref.rsplit("/", 1)[-1])]
+    return {row["name"]: {"ref": f"@{row['name']}", "md5": row["md5"]} for row in rows}
+
+
+def remove_batch_parts(asset_name: str, is_local: bool, sf_helper: Optional[SnowflakeDataHelper] = None) -> None:
+    """
+    Delete the part files appended to a folder asset by incremental runs.
+    """
+    asset_spec = get_asset_spec(asset_name)
+    if not asset_spec.is_folder or asset_spec.storage == "transient_table":
+        return
+
+    if is_local:
+        for part in Path(asset_spec.local_path).rglob(f"{asset_name}_batch*.{asset_spec.file_type}"):
+            part.unlink()
+    else:
+        target_dir = asset_spec.target_path.rstrip("/")
+        sf_helper._snowflake_session.sql(f"REMOVE {target_dir}/ PATTERN = '.*{asset_name}_batch.*'").collect()
+
+
+class IncrementalReader:
+    """
+    Reads the inputs of a node as deltas since its last committed run.
+
+    Each asset declares how its new rows are found in the catalogue's
+    ``incremental`` entry:
+
+    - ``key``: rows whose ``key`` column is above the stored watermark.
+    - ``files``: files that are new since the last run (by md5). With
+      ``append_only``, the rows past the last read row of a changed file too.
+    - ``stream``: a Snowflake STREAM on the asset's table. Local runs fall
+      back to ``files``.
+
+    Inputs without an ``incremental`` entry are read in full; any change to
+    their files, or a removed or rewritten file of a ``files`` asset, makes
+    the run a full refresh. The first run, and runs in ``full`` mode, are full
+    refreshes too. Watermarks are stored per asset next to the node's first
+    output (``.<node>.watermarks.json``) and only advance on ``commit``.
+    """
+
+    def __init__(
+        self,
+        node_name: str,
+        input_data: list[str],
+        output_data: list[str],
+        session: Session,
+        is_local: bool,
+        sf_helper: Optional[SnowflakeDataHelper] = None,
+        mode: str = "incremental"
+    ):
+        if mode not in INCREMENTAL_MODES:
+            raise ValueError(f"Unsupported mode '{mode}', expected one of {INCREMENTAL_MODES}")
+
+        self.node_name = node_name
+        self.session = session
+        self.is_local = is_local
+        self.sf_helper = sf_helper or SnowflakeDataHelper(session)
+        # Microseconds keep batches in time order, the suffix keeps concurrent runs apart
+        self.batch_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}_{uuid.uuid4().hex[:8]}"
+
+        self._store = NodeManifest(node_name, output_data, is_local, self.sf_helper, kind="watermarks")
+        self._stored = self._store.load() if mode == "incremental" else None
+        self._assets = {} if self._stored is None else dict(self._stored.get("assets", {}))
+        self._state = dict(self._assets)
+        self._files = {}
+
+        self.full_refresh = self._stored is None or self._needs_full_refresh(input_data)
+        if self.full_refresh:
+            print(f"{node_name}: full refresh")
+        else:
+            print(f"{node_name}: incremental batch {self.batch_id}")
+
+    def _strategy(self, asset_spec: AssetSpec) -> tuple[str, bool]:
+        if asset_spec.incremental is None:
+            return "untracked", False
+        strategy = asset_spec.incremental["strategy"]
+        if strategy == "stream" and self.is_local:
+            strategy = "files"
+        return strategy, bool(asset_spec.incremental.get("append_only", False))
+
+    def _tracks_files(self, asset_spec: AssetSpec) -> bool:
+        strategy, _ = self._strategy(asset_spec)
+        if strategy == "untracked":
+            # Tables hold no files, untracked table inputs are assumed unchanged
+            return self.is_local or asset_spec.storage != "transient_table"
+        return strategy == "files"
+
+    def _needs_full_refresh(self, input_data: list[str]) -> bool:
+        fusion = active_fusion()
+        for asset_name in input_data:
+            if fusion is not None and asset_name in fusion:
+                if asset_name in fusion.refreshed:
+                    return True
+                continue
+
+            asset_spec = get_asset_spec(asset_name)
+            stored = self._assets.get(asset_name)
+            if stored is None:
+                logger.debug(f"No watermark for {asset_name}")
+                return True
+            if not self._tracks_files(asset_spec):
+                continue
+
+            files = list_asset_files(asset_spec, self.is_local, self.sf_helper)
+            self._files[asset_name] = files
+            strategy, append_only = self._strategy(asset_spec)
+            stored_files = stored.get("files", {})
+            for name, previous in stored_files.items():
+                if name not in files:
+                    logger.debug(f"{asset_name}: {name} was removed")
+                    return True
+                if files[name]["md5"] != previous["md5"] and not append_only:
+                    logger.debug(f"{asset_name}: {name} was rewritten")
+                    return True
+            if strategy == "untracked" and set(files) != set(stored_files):
+                logger.debug(f"{asset_name}: files were added")
+                return True
+        return False
+
+    def read(self, asset_name: str) -> SPDataFrame:
+        """
+        Lazy Snowpark DataFrame of the rows of ``asset_name`` to process:
+        all of them on a full refresh, otherwise the rows added since the
+        last commit (all of them for untracked inputs).
+        """
+        fusion = active_fusion()
+        if fusion is not None and asset_name in fusion:
+            # Handed over by the producer, which already read its own delta
+            return load_snowpark(self.session, asset_name, self.is_local, self.sf_helper)
+
+        asset_spec = get_asset_spec(asset_name)
+        strategy, append_only = self._strategy(asset_spec)
+        if strategy == "key":
+            return self._read_key(asset_spec)
+        if strategy == "stream":
+            return self._read_stream(asset_spec)
+
+        files = self._files.get(asset_name)
+        if files is None:
+            files = list_asset_files(asset_spec, self.is_local, self.sf_helper) if self._tracks_files(asset_spec) else {}
+        if strategy == "untracked":
+            self._state[asset_name] = {"files": {name: {"md5": f["md5"]} for name, f in files.items()}}
+            return load_snowpark(self.session, asset_name, self.is_local, self.sf_helper)
+        return self._read_files(asset_spec, files, append_only)
+
+    def _read_key(self, asset_spec: AssetSpec) -> SPDataFrame:
+        key = asset_spec.incremental["key"]
+        df = load_snowpark(self.session, asset_spec.name, self.is_local, self.sf_helper)
+        watermark = None if self.full_refresh else self._assets[asset_spec.name].get("watermark")
+        if watermark is not None:
+            df = df.filter(col(key) > watermark)
+
+        latest = df.agg(max_(col(key))).collect()[0][0]
+        if latest is not None and not isinstance(latest, (int, float, str)):
+            latest = str(latest)
+        self._state[asset_spec.name] = {"watermark": watermark if latest is None else latest}
+        return df
+
+    def _read_stream(self, asset_spec: AssetSpec) -> SPDataFrame:
+        table = asset_spec.table_name
+        stream = f"{table}_STREAM"
+        delta_table = f"{table}_DELTA"
+        sql = self.session.sql
+
+        if self.full_refresh:
+            # Restart the stream from now, the full table covers everything before
+            sql(f"CREATE OR REPLACE STREAM {stream} ON TABLE {table} APPEND_ONLY = TRUE").collect()
+            self._state[asset_spec.name] = {"stream": stream, "pending": False}
+            return self.session.table(table)
+
+        stored = self._assets[asset_spec.name]
+        if not stored.get("pending", False):
+            # Consuming the stream in DML advances it, so its rows are kept in a
+            # delta table until the run commits and retried from there on failure
+            sql(f"CREATE TRANSIENT TABLE IF NOT EXISTS {delta_table} LIKE {table}").collect()
+            sql(f"TRUNCATE TABLE {delta_table}").collect()
+            sql(f"INSERT INTO {delta_table} SELECT * EXCLUDE ({_STREAM_METADATA}) FROM {stream}").collect()
+            self._assets[asset_spec.name] = {"stream": stream, "pending": True}
+            self._store.save({**self._stored, "assets": self._assets})
+
+        self._state[asset_spec.name] = {"stream": stream, "pending": False}
+        return self.session.table(delta_table)
+
+    def _count_rows(self, asset_spec: AssetSpec, ref: str) -> int:
+        if self.is_local:
+            return len(_read_pandas_source(ref, asset_spec, None))
+        return self._last_row(asset_spec, ref)[1]
+
+    def _last_row(self, asset_spec: AssetSpec, ref: str, after_row: int = 0) -> tuple[Optional[SPDataFrame], int]:
+        """
+        Rows of one file past ``after_row``, and the last row number read.
+        """
+        if self.is_local:
+            # Offline stand-in for the file row number metadata of staged files
+            pdf = _read_pandas_source(ref, asset_spec, None)
+            tail = pdf.iloc[after_row:]
+            return (create_snowpark(self.session, tail, asset_spec.name) if len(tail) else None), len(pdf)
+
+        df = read_snowpark_after_row(self.session, asset_spec.name, ref, after_row)
+        last_row = df.agg(max_(col(FILE_ROW_NUMBER))).collect()[0][0]
+        if last_row is None:
+            return None, after_row
+        return df.drop(FILE_ROW_NUMBER), int(last_row)
+
+    def _read_files(self, asset_spec: AssetSpec, files: dict, append_only: bool) -> SPDataFrame:
+        stored = {} if self.full_refresh else self._assets[asset_spec.name].get("files", {})
+
+        state = {}
+        for name, file in files.items():
+            state[name] = {"md5": file["md5"]}
+            if append_only and self.full_refresh:
+                state[name]["last_row"] = self._count_rows(asset_spec, file["ref"])
+            elif append_only:
+                state[name]["last_row"] = stored.get(name, {}).get("last_row", 0)
+        self._state[asset_spec.name] = {"files": state}
+
+        if self.full_refresh:
+            return load_snowpark(self.session, asset_spec.name, self.is_local, self.sf_helper)
+
+        changed = [name for name, file in files.items() if stored.get(name, {}).get("md5") != file["md5"]]
+        print(f"{asset_spec.name}: {len(changed)} new or changed file(s)")
+
+        frames = []
+        if append_only:
+            for name in changed:
+                df, state[name]["last_row"] = self._last_row(asset_spec, files[name]["ref"], state[name]["last_row"])
+                if df is not None:
+                    frames.append(df)
+        elif changed:
+            # Without append_only only new files get here, rewritten ones force a full refresh
+            frames.append(read_snowpark(self.session, asset_spec.name, [files[name]["ref"] for name in changed]))
+
+        if not frames:
+            return load_snowpark(self.session, asset_spec.name, self.is_local, self.sf_helper).limit(0)
+        return reduce(lambda left, right: left.union_all_by_name(right), frames)
+
+    def save(
+        self,
+        dataframes: dict[str, Union[pd.DataFrame, SPDataFrame]],
+        output_data: list[str],
+        is_local: bool
+    ) -> None:
+        """
+        Replace the outputs on a full refresh, otherwise append the batch to
+        them as ``<asset>_batch<batch_id>`` part files.
+        """
+        if self.full_refresh:
+            for asset_name in output_data:
+                remove_batch_parts(asset_name, is_local, self.sf_helper)
+            fusion = active_fusion()
+            if fusion is not None:
+                fusion.refreshed.update(dataframes)
+
+        save_dataframes(
+            dataframes=dataframes,
+            data_assets=output_data,
+            is_local=is_local,
+            sf_helper=self.sf_helper,
+            part_suffix=None if self.full_refresh else f"_batch{self.batch_id}"
+        )
+
+    def commit(self) -> None:
+        """
+        Store the watermarks of the inputs read by this run.
+        """
+        self._store.save({"batch_id": self.batch_id, "assets": self._state})
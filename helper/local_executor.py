@@ -0,0 +1,197 @@
+import contextlib
+import functools
+import inspect
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from snowflake.snowpark import Session
+
+from helper.fusion import FusionContext
+from helper.registry import NodeRef, node_parameters, resolve_node, validate_node_ref
+from helper.snowflake_connect_manager import SessionPool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NodeRun:
+    """
+    Outcome and timing of one node executed by ``LocalPipelineExecutor``.
+    """
+    name: str
+    status: str
+    start_time: float
+    end_time: float
+
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time
+
+
+def _run_node(func: NodeRef, kwargs: dict) -> tuple:
+    # Timed inside the worker so process pools report execution, not queueing.
+    # Lazy references are imported here, so a node's imports count towards its time.
+    start_time = time.time()
+    resolve_node(func)(**kwargs)
+    return start_time, time.time()
+
+
+def _run_with_pooled_session(pool: SessionPool, func, **kwargs):
+    with pool.session() as session:
+        return func(session=session, **kwargs)
+
+
+def topological_order(pipeline_definition: dict) -> List[str]:
+    """
+    Order pipeline nodes so every node comes after its ``depends_on`` nodes.
+
+    Args:
+        pipeline_definition (dict): Node name to config with optional 'depends_on'.
+
+    Returns:
+        List[str]: Node names in execution order.
+    """
+    remaining = {
+        node: set(config.get("depends_on", []))
+        for node, config in pipeline_definition.items()
+    }
+    for node, deps in remaining.items():
+        unknown = deps - set(remaining)
+        if unknown:
+            raise ValueError(f"Node '{node}' depends on unknown nodes {sorted(unknown)}")
+
+    order = []
+    while remaining:
+        ready = sorted(node for node, deps in remaining.items() if not deps)
+        if not ready:
+            raise ValueError(f"Pipeline has a dependency cycle between {sorted(remaining)}")
+        for node in ready:
+            order.append(node)
+            del remaining[node]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return order
+
+
+class LocalPipelineExecutor:
+    def __init__(
+        self,
+        pipeline_definition: dict,
+        node_functions: Dict[str, NodeRef],
+        max_workers: Optional[int] = None,
+        executor_type: str = "thread",
+        session: Optional[Session] = None,
+        session_pool: Optional[SessionPool] = None,
+        fuse: bool = False
+    ):
+        """
+        Run a ``pipeline_definition`` locally, executing independent nodes concurrently.
+
+        Args:
+            pipeline_definition (dict): Same definition used by ``SnowflakePipelineBuilder``.
+            node_functions (dict): Maps each node's 'function' name to a callable
+                or a lazy "package.module:function" reference, imported when
+                the node is first scheduled (in the worker for process pools).
+            max_workers (int, optional): Pool size. Defaults to the number of CPUs.
+            executor_type (str): 'thread' or 'process'. Process pools cannot run
+                nodes that take a Snowpark session.
+            session (Session, optional): Passed to nodes that take a 'session' argument.
+            session_pool (SessionPool, optional): When given, each such node checks
+                out its own session for the duration of its run instead.
+            fuse (bool): Run nodes on ``session`` and hand Snowpark outputs to
+                downstream nodes in memory (see ``helper.fusion``). Only assets
+                with ``persist`` set in the catalogue are written.
+        """
+        if executor_type not in ("thread", "process"):
+            raise ValueError(f"Unsupported executor type: {executor_type}")
+        if fuse and (executor_type != "thread" or session is None):
+            raise ValueError("Fused runs need a thread executor and a shared session")
+
+        self.pipeline_definition = pipeline_definition
+        self.node_functions = node_functions
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor_type = executor_type
+        self.session = session
+        self.session_pool = session_pool
+        self.fuse = fuse
+        self.order = topological_order(pipeline_definition)
+
+    def _node_ref(self, node: str) -> NodeRef:
+        config = self.pipeline_definition[node]
+        ref = self.node_functions.get(config["function"])
+        if ref is None:
+            raise KeyError(f"No function registered for '{config['function']}' (node '{node}')")
+        validate_node_ref(ref)
+        return ref
+
+    def _node_call(self, node: str) -> tuple:
+        ref = self._node_ref(node)
+        kwargs = dict(self.pipeline_definition[node].get("params", {}))
+
+        if self.executor_type == "process":
+            # Keep lazy references unresolved, the worker imports them (their
+            # arguments are read from source, so the check holds for them too)
+            if "session" in node_parameters(ref):
+                raise ValueError(f"Node '{node}' needs a Snowpark session and cannot run in a process pool")
+            return ref, kwargs
+
+        func = resolve_node(ref)
+        if "session" in inspect.signature(func).parameters:
+            if self.session_pool is not None and not self.fuse:
+                func = functools.partial(_run_with_pooled_session, self.session_pool, func)
+            else:
+                kwargs["session"] = self.session
+        return func, kwargs
+
+    def run(self) -> Dict[str, NodeRun]:
+        """
+        Execute the pipeline, stopping at the first failing node.
+
+        Returns:
+            Dict[str, NodeRun]: Timing of every executed node, in completion order.
+        """
+        # Check every reference up front so configuration errors fail before any
+        # node runs, but only import a node's module once it is scheduled
+        for node in self.order:
+            self._node_ref(node)
+        pending_deps = {
+            node: set(self.pipeline_definition[node].get("depends_on", []))
+            for node in self.order
+        }
+        runs: Dict[str, NodeRun] = {}
+        running: Dict[Future, str] = {}
+        pool_class = ThreadPoolExecutor if self.executor_type == "thread" else ProcessPoolExecutor
+        # Fused outputs live for the duration of the run
+        fusion = FusionContext(self.session) if self.fuse else contextlib.nullcontext()
+
+        with fusion, pool_class(max_workers=self.max_workers) as pool:
+            def submit_ready():
+                for node in [n for n in self.order if n in pending_deps and not pending_deps[n]]:
+                    del pending_deps[node]
+                    func, kwargs = self._node_call(node)
+                    print(f"Starting node: {node}")
+                    running[pool.submit(_run_node, func, kwargs)] = node
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        start_time, end_time = future.result()
+                    except BaseException as e:
+                        print(f"Node failed: {node}, not scheduling remaining nodes")
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        raise RuntimeError(f"Pipeline node '{node}' failed") from e
+
+                    runs[node] = NodeRun(node, "success", start_time, end_time)
+                    print(f"Finished node: {node} in {end_time - start_time:.2f}s")
+                    for deps in pending_deps.values():
+                        deps.discard(node)
+                submit_ready()
+
+        return runs
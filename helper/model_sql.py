@@ -0,0 +1,134 @@
+import logging
+from functools import reduce
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from snowflake.snowpark import Column
+from snowflake.snowpark import DataFrame as SPDataFrame
+from snowflake.snowpark.functions import col, count, lit, sqrt, sum as sum_
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_COLUMN = "PREDICTION"
+
+
+def linear_model_terms(model) -> Tuple[list[str], np.ndarray, float]:
+    """
+    Feature names, coefficients and intercept of a fitted single-target linear
+    model (LinearRegression, Ridge, Lasso, SGDRegressor...).
+    """
+    if not hasattr(model, "coef_") or not hasattr(model, "intercept_"):
+        raise TypeError(f"{type(model).__name__} is not a fitted linear model.")
+
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    intercept = np.atleast_1d(np.asarray(model.intercept_, dtype=np.float64))
+    if coef.ndim == 2:
+        if coef.shape[0] != 1:
+            raise ValueError("Only single-target linear models can be compiled.")
+        coef = coef[0]
+    if intercept.shape != (1,):
+        raise ValueError("Only single-target linear models can be compiled.")
+
+    feature_names = getattr(model, "feature_names_in_", None)
+    if feature_names is None:
+        raise ValueError("The model must be fitted on a DataFrame to know its feature columns.")
+    return list(feature_names), coef, float(intercept[0])
+
+
+def compile_linear_model(model, column_map: Optional[dict] = None) -> Column:
+    """
+    Compile a fitted linear model into a Snowpark column expression
+    ``intercept + coef_1 * x_1 + ... + coef_p * x_p``.
+
+    Args:
+        model: Fitted single-target linear model with ``feature_names_in_``.
+        column_map (dict, optional): Feature name to column name, when the
+            table's columns are named differently.
+
+    Returns:
+        Column: Prediction expression.
+    """
+    feature_names, coef, intercept = linear_model_terms(model)
+    column_map = column_map or {}
+    terms = [
+        col(column_map.get(name, name)) * lit(float(weight))
+        for name, weight in zip(feature_names, coef)
+    ]
+    return reduce(lambda left, right: left + right, terms, lit(intercept))
+
+
+def score_dataframe(
+    df: SPDataFrame,
+    model,
+    prediction_column: str = PREDICTION_COLUMN,
+    column_map: Optional[dict] = None
+) -> SPDataFrame:
+    """
+    Add the model's prediction to a lazy Snowpark DataFrame.
+    """
+    return df.with_column(prediction_column, compile_linear_model(model, column_map))
+
+
+def regression_metrics(
+    df: SPDataFrame,
+    model,
+    target_column: str,
+    column_map: Optional[dict] = None
+) -> dict:
+    """
+    RMSE and R² of the model over ``df`` computed in a single aggregation,
+    so only one row comes back from the warehouse.
+
+    Returns:
+        dict: 'rmse', 'r2' and 'n_rows'.
+    """
+    target = col(target_column)
+    residual = target - compile_linear_model(model, column_map)
+    n_rows = count(target)
+    sse = sum_(residual * residual)
+    # Total sum of squares from plain sums, which local-testing sessions support too
+    sst = sum_(target * target) - sum_(target) * sum_(target) / n_rows
+
+    row = df.select(
+        n_rows.alias("N_ROWS"),
+        sqrt(sse / n_rows).alias("RMSE"),
+        (lit(1) - sse / sst).alias("R2"),
+    ).collect()[0]
+    return {"rmse": row["RMSE"], "r2": row["R2"], "n_rows": row["N_ROWS"]}
+
+
+def prediction_parity(
+    df: SPDataFrame,
+    model,
+    sample_rows: int = 1000,
+    atol: float = 1e-6,
+    column_map: Optional[dict] = None
+) -> float:
+    """
+    Compare the compiled expression with ``model.predict`` on a sample of rows.
+
+    Returns:
+        float: Largest absolute difference between the two predictions.
+
+    Raises:
+        ValueError: When the difference exceeds ``atol``.
+    """
+    feature_names, _, _ = linear_model_terms(model)
+    column_map = column_map or {}
+    scored = score_dataframe(df.limit(sample_rows), model, column_map=column_map).to_pandas()
+
+    # Unquoted Snowflake identifiers come back upper-cased
+    lookup = {column.upper(): column for column in scored.columns}
+    features = pd.DataFrame({
+        name: scored[lookup[column_map.get(name, name).upper()]].astype("float64")
+        for name in feature_names
+    })
+    expected = np.ravel(model.predict(features))
+    actual = scored[lookup[PREDICTION_COLUMN]].to_numpy(dtype=np.float64)
+
+    max_diff = float(np.max(np.abs(expected - actual))) if len(actual) else 0.0
+    logger.debug(f"Prediction parity over {len(actual)} rows: max abs diff {max_diff}")
+    if max_diff > atol:
+        raise ValueError(f"Compiled model differs from predict() by up to {max_diff} (atol {atol}).")
+    return max_diff
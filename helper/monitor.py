@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from snowflake.snowpark import Session
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = {"SUCCEEDED", "FAILED", "CANCELLED", "SKIPPED", "FAILED_AND_AUTO_SUSPENDED"}
+FAILED_STATES = {"FAILED", "CANCELLED", "FAILED_AND_AUTO_SUSPENDED"}
+
+
+@dataclass
+class NodeRunStats:
+    node: str
+    task_name: str
+    state: str
+    scheduled_time: Optional[datetime] = None
+    query_start_time: Optional[datetime] = None
+    completed_time: Optional[datetime] = None
+    error_message: Optional[str] = None
+
+    @property
+    def queued_seconds(self) -> Optional[float]:
+        if self.scheduled_time is None or self.query_start_time is None:
+            return None
+        return (self.query_start_time - self.scheduled_time).total_seconds()
+
+    @property
+    def execution_seconds(self) -> Optional[float]:
+        if self.query_start_time is None or self.completed_time is None:
+            return None
+        return (self.completed_time - self.query_start_time).total_seconds()
+
+
+@dataclass
+class RunReport:
+    pipeline_name: str
+    status: str
+    started_at: datetime
+    nodes: Dict[str, NodeRunStats] = field(default_factory=dict)
+    critical_path: List[str] = field(default_factory=list)
+
+    @property
+    def finished_at(self) -> Optional[datetime]:
+        completed = [stats.completed_time for stats in self.nodes.values() if stats.completed_time]
+        return max(completed) if completed else None
+
+    @property
+    def critical_path_seconds(self) -> Optional[float]:
+        if not self.critical_path:
+            return None
+        last = self.nodes[self.critical_path[-1]]
+        return (last.completed_time - self.started_at).total_seconds()
+
+    def summary(self) -> str:
+        lines = [f"Pipeline {self.pipeline_name}: {self.status}"]
+        for stats in self.nodes.values():
+            lines.append(
+                f"  {stats.node}: {stats.state}, queued {stats.queued_seconds}s, "
+                f"executed {stats.execution_seconds}s"
+            )
+        lines.append(f"  critical path: {' -> '.join(self.critical_path)} ({self.critical_path_seconds}s)")
+        return "\n".join(lines)
+
+
+class PipelineRunMonitor:
+    def __init__(
+        self,
+        session: Session,
+        pipeline_definition: dict,
+        pipeline_name: str,
+        poll_interval: float = 2.0,
+        max_poll_interval: float = 30.0,
+        backoff: float = 1.5
+    ):
+        """
+        Follow a task-graph run through TASK_HISTORY until every node is done.
+
+        Each poll issues a single TASK_HISTORY query covering all the pipeline's
+        tasks, and the delay between polls grows by ``backoff`` up to ``max_poll_interval``.
+
+        Args:
+            session (Session): Snowpark session.
+            pipeline_definition (dict): Definition the tasks were built from.
+            pipeline_name (str): Pipeline name used in task names (task_<pipeline>_<node>).
+            poll_interval (float): First delay between polls, in seconds.
+            max_poll_interval (float): Upper bound of the delay between polls.
+            backoff (float): Multiplier applied to the delay after each poll.
+        """
+        self.session = session
+        self.pipeline_definition = pipeline_definition
+        self.pipeline_name = pipeline_name
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.task_names = {
+            f"task_{pipeline_name}_{node}".upper(): node for node in pipeline_definition
+        }
+
+    def current_time(self) -> datetime:
+        """
+        Warehouse clock, to mark the start of a run without local clock skew.
+        """
+        return self.session.sql("SELECT CURRENT_TIMESTAMP()").collect()[0][0]
+
+    def _history_sql(self, since: datetime) -> str:
+        names = ", ".join(f"'{name}'" for name in self.task_names)
+        return f"""
+            SELECT NAME, STATE, SCHEDULED_TIME, QUERY_START_TIME, COMPLETED_TIME, ERROR_MESSAGE
+            FROM TABLE(INFORMATION_SCHEMA.TASK_HISTORY(
+                SCHEDULED_TIME_RANGE_START => TO_TIMESTAMP_LTZ('{since.isoformat()}'),
+                RESULT_LIMIT => 10000
+            ))
+            WHERE NAME IN ({names})
+            ORDER BY SCHEDULED_TIME
+        """
+
+    def _fetch(self, since: datetime) -> list:
+        return self.session.sql(self._history_sql(since)).collect()
+
+    def _build_report(self, rows: list, since: datetime) -> RunReport:
+        nodes: Dict[str, NodeRunStats] = {}
+        # Rows are ordered by scheduled time, keep the latest attempt of each task
+        for row in rows:
+            node = self.task_names[row["NAME"].upper()]
+            nodes[node] = NodeRunStats(
+                node=node,
+                task_name=row["NAME"],
+                state=row["STATE"],
+                scheduled_time=row["SCHEDULED_TIME"],
+                query_start_time=row["QUERY_START_TIME"],
+                completed_time=row["COMPLETED_TIME"],
+                error_message=row["ERROR_MESSAGE"],
+            )
+
+        states = {stats.state for stats in nodes.values()}
+        failed = bool(states & FAILED_STATES)
+        if failed and "EXECUTING" not in states:
+            status = "FAILED"
+        elif len(nodes) == len(self.task_names) and states <= TERMINAL_STATES:
+            status = "SUCCEEDED"
+        else:
+            status = "RUNNING"
+
+        if status == "FAILED":
+            # Downstream nodes of a failure never get a history row
+            for task_name, node in self.task_names.items():
+                nodes.setdefault(node, NodeRunStats(node=node, task_name=task_name, state="NOT_RUN"))
+
+        return RunReport(
+            pipeline_name=self.pipeline_name,
+            status=status,
+            started_at=since,
+            nodes=nodes,
+            critical_path=self._critical_path(nodes) if status != "RUNNING" else [],
+        )
+
+    def _critical_path(self, nodes: Dict[str, NodeRunStats]) -> List[str]:
+        """
+        Chain of nodes that determined the run's end: start from the last node
+        to complete and repeatedly step to its latest-completing dependency.
+        """
+        completed = {node: stats for node, stats in nodes.items() if stats.completed_time}
+        if not completed:
+            return []
+
+        path = [max(completed, key=lambda node: completed[node].completed_time)]
+        while True:
+            deps = [
+                dep for dep in self.pipeline_definition[path[-1]].get("depends_on", [])
+                if dep in completed
+            ]
+            if not deps:
+                break
+            path.append(max(deps, key=lambda dep: completed[dep].completed_time))
+        return list(reversed(path))
+
+    def _next_delay(self, delay: float) -> float:
+        return min(delay * self.backoff, self.max_poll_interval)
+
+    def _jittered(self, delay: float) -> float:
+        return delay * random.uniform(0.8, 1.2)
+
+    def wait(self, since: datetime, timeout: Optional[float] = None) -> RunReport:
+        """
+        Block until the run started at ``since`` finishes.
+
+        Args:
+            since (datetime): Warehouse time taken just before the run was triggered.
+            timeout (float, optional): Seconds to wait before raising TimeoutError.
+
+        Returns:
+            RunReport: Per-node timings and the critical path.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        delay = self.poll_interval
+        while True:
+            report = self._build_report(self._fetch(since), since)
+            if report.status != "RUNNING":
+                return report
+            if deadline and time.monotonic() + delay > deadline:
+                raise TimeoutError(f"Pipeline {self.pipeline_name} still running after {timeout}s")
+            logger.debug(f"Pipeline {self.pipeline_name} running, next poll in {delay:.1f}s")
+            time.sleep(self._jittered(delay))
+            delay = self._next_delay(delay)
+
+    async def wait_async(self, since: datetime, timeout: Optional[float] = None) -> RunReport:
+        """
+        Awaitable version of ``wait``, the history query runs in a worker thread.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        delay = self.poll_interval
+        while True:
+            rows = await asyncio.to_thread(self._fetch, since)
+            report = self._build_report(rows, since)
+            if report.status != "RUNNING":
+                return report
+            if deadline and time.monotonic() + delay > deadline:
+                raise TimeoutError(f"Pipeline {self.pipeline_name} still running after {timeout}s")
+            await asyncio.sleep(self._jittered(delay))
+            delay = self._next_delay(delay)
@@ -1,91 +1,198 @@
 from snowflake.snowpark import Session
 from pathlib import Path
+import hashlib
+import inspect
+import io
 import zipfile
-import os
 import yaml
-from typing import List
+from typing import List, Optional
+from helper.compute import NodeCompute
+from helper.deploy import DeployPlanner, SprocSpec, TaskSpec
+from helper.fingerprint import hash_node_code
+from helper.registry import node_dependencies, resolve_node
+
+# Fixed entry timestamp so bundle bytes (and their hashes) only depend on content
+_ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+
+# Arguments every node sproc takes, pipeline tasks CALL them in this order.
+# Part of the deploy hash so sprocs registered with an older signature are replaced
+SPROC_ARGUMENTS = ("input_data", "output_data", "is_local", "mode")
+
+# Warehouse of node tasks without a compute entry
+DEFAULT_WAREHOUSE = "COMPUTE_WH"
+
+# Configuration sprocs read at runtime, credentials files stay out of the bundles
+_CONF_FILES = ("conf/__init__.py", "conf/data_catalogue.yml")
 
 class SnowflakeNodeBuilder:
     def __init__(self, session: Session, stage: str = "@my_stage"):
         self.session = session
         self.stage = stage
+        self._staged: Optional[set] = None
+        self._planners: dict = {}
 
     def register_node(self, func, name, database, schema):
-        def wrapper(session: Session, input_data: list, output_data: list, is_local: bool = False) -> str:
-            func(session, input_data, output_data, is_local)
-            return "OK"
+        self.register_nodes([{"func": func, "name": name}], database, schema)
 
-        self._upload_dependencies_to_stage()
-        self.session.sproc.register(
-            func=wrapper,
-            name=name,
-            stage_location=self.stage,
-            is_permanent=True,
-            replace=True,
-            packages=[self._get_snowpark_package_version()],
-            imports=self._generate_imports_for_sproc(),
-            database=database,
-            schema=schema
-        )
-        print(f"Registered stored procedure: {name}")
-        
-        task_name = f"task_{name}"
-        sql = f"""
-        CREATE OR REPLACE TASK {task_name}
-        WAREHOUSE = COMPUTE_WH
-        AFTER KEDRO.PUBLIC.DEFAULT_START_TASK
-        AS CALL {database}.{schema}.{name}();
+    def register_nodes(self, nodes: List[dict], database: str, schema: str):
         """
-        self.session.sql(sql).collect()
-        
-        # Check status before resuming
-        status_result = self.session.sql(
-            f"SHOW TASKS LIKE '{task_name}' IN SCHEMA {database}.{schema}"
-        ).collect()
-        if status_result and status_result[0]["state"] == "SUSPENDED":
-            self.session.sql(f"ALTER TASK {task_name} RESUME").collect()
-            print(f"Resumed task: {task_name}")
-        else:
-            print(f"Task already active: {task_name}")
-
-    def _generate_imports_for_sproc(self) -> List[str]:
-        stage_path = Path(".snowflake_dependency")
-        return [f"{self.stage}/{f.name}" for f in stage_path.glob("*") if f.is_file()]
+        Register node sprocs and their tasks, only touching the ones whose code,
+        imports or task definition changed since the last deploy.
+
+        Each sproc only imports the modules its node uses and only requests the
+        packages they import, which keeps cold starts short.
+
+        Args:
+            nodes (List[dict]): Each with 'func' (callable or "package.module:function"
+                reference) and 'name' (sproc name), optionally 'packages' to add
+                and 'compute' (a NodeCompute or its config mapping) for the
+                task's warehouse, size or serverless parameters (see helper/compute.py).
+            database (str): Target database.
+            schema (str): Target schema.
+        """
+        snowpark_package = self._get_snowpark_package_version()
+
+        sprocs, tasks, warehouses = [], [], []
+        for node in nodes:
+            func, name = resolve_node(node["func"]), node["name"]
+            files, node_packages = node_dependencies(func)
+            imports = self._generate_imports_for_sproc(name, files)
+            packages = [snowpark_package, *sorted(set(node_packages) | set(node.get("packages", [])))]
+
+            deploy_hash = hashlib.sha256(
+                "|".join([name, hash_node_code(func), *SPROC_ARGUMENTS, *imports, *packages]).encode()
+            ).hexdigest()[:16]
+            sprocs.append(SprocSpec(
+                name=f"{database}.{schema}.{name}",
+                deploy_hash=deploy_hash,
+                register=self._sproc_registration(func, name, database, schema, imports, packages)
+            ))
+            compute = node.get("compute")
+            if not isinstance(compute, NodeCompute):
+                compute = NodeCompute.from_config(compute, name)
+            if compute.warehouse_spec() is not None:
+                warehouses.append(compute.warehouse_spec())
+            tasks.append(TaskSpec(
+                name=f"task_{name}",
+                body=f"CALL {database}.{schema}.{name}();",
+                after=("KEDRO.PUBLIC.DEFAULT_START_TASK",),
+                resume=True,
+                **compute.task_options(DEFAULT_WAREHOUSE)
+            ))
+
+        planner = self._get_planner(database, schema)
+        planner.apply(planner.plan(sprocs=sprocs, tasks=tasks, warehouses=warehouses))
+
+    def _get_planner(self, database: str, schema: str) -> DeployPlanner:
+        key = (database, schema)
+        if key not in self._planners:
+            self._planners[key] = DeployPlanner(self.session, database=database, schema=schema)
+        return self._planners[key]
+
+    def _sproc_registration(self, func, name, database, schema, imports, packages):
+        # Nodes without incremental runs take no mode, they always rebuild in full
+        takes_mode = "mode" in inspect.signature(func).parameters
+
+        def wrapper(session: Session, input_data: list, output_data: list, is_local: bool = False, mode: str = "full") -> str:
+            if takes_mode:
+                func(session, input_data, output_data, is_local, mode=mode)
+            elif mode != "full":
+                raise ValueError(f"Node {name} does not support mode '{mode}'.")
+            else:
+                func(session, input_data, output_data, is_local)
+            return "OK"
 
-    def _upload_dependencies_to_stage(self):
-        stage_path = Path(".snowflake_dependency")
-        if not stage_path.exists():
-            stage_path.mkdir()
+        def register():
+            self.session.sproc.register(
+                func=wrapper,
+                name=name,
+                stage_location=self.stage,
+                is_permanent=True,
+                replace=True,
+                packages=packages,
+                imports=imports,
+                database=database,
+                schema=schema
+            )
 
-        # Dependencies to zip
-        dependencies = ["helper", "de_pipeline", 'conf']
-        for dep in dependencies:
-            exclude_dirs = ["local"] if dep == "conf" else []
-            self._compress_folder_to_zip(Path(dep), stage_path / f"{dep}.zip", exclude_dirs=exclude_dirs)
+        return register
 
-        for file in stage_path.glob("*"):
+    def _generate_imports_for_sproc(self, name: str, files: List[Path]) -> List[str]:
+        return [f"{self.stage}/{bundle}" for bundle in self._upload_dependencies_to_stage(name, files)]
+
+    def _upload_dependencies_to_stage(self, name: str, files: List[Path]) -> List[str]:
+        """
+        Build the shared conf bundle and the node's code bundle, holding only the
+        modules the node imports, and upload the ones whose content hash is not
+        on the stage yet.
+
+        Returns:
+            List[str]: Staged file names of the bundles.
+        """
+        bundles = [
+            self._build_bundle("conf", [Path(file) for file in _CONF_FILES]),
+            self._build_bundle(name, files),
+        ]
+
+        if self._staged is None:
+            self._staged = self._list_stage_files()
+        for zip_path in bundles:
+            if zip_path.name in self._staged:
+                print(f"Dependency bundle up to date: {zip_path.name}")
+                continue
             self.session.file.put(
-                str(file),
+                str(zip_path),
                 self.stage,
                 auto_compress=False,
-                overwrite=True
+                overwrite=False
             )
+            self._staged.add(zip_path.name)
+            print(f"Uploaded dependency bundle: {zip_path.name}")
+
+        return [zip_path.name for zip_path in bundles]
 
-    def _compress_folder_to_zip(self, path: Path, zip_path: Path, exclude=None, exclude_dirs=None):
-        exclude = exclude or [".pyc", "__pycache__"]
-        exclude_dirs = exclude_dirs or []
-
-        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as zip_file:
-            for root, dirs, files in os.walk(path):
-                # Skip excluded directories
-                if any(Path(root).resolve().as_posix().startswith(Path(path / ed).resolve().as_posix()) for ed in exclude_dirs):
-                    continue
-
-                for file in files:
-                    if not any(file.endswith(pattern) for pattern in exclude):
-                        file_path = Path(root) / file
-                        arcname = os.path.join(path.name, os.path.relpath(file_path, path))
-                        zip_file.write(file_path, arcname=arcname)
+    def _build_bundle(self, name: str, files: List[Path]) -> Path:
+        stage_path = Path(".snowflake_dependency")
+        if not stage_path.exists():
+            stage_path.mkdir()
+
+        zip_bytes = self._compress_files_to_zip(files)
+        digest = hashlib.sha256(zip_bytes).hexdigest()[:16]
+        zip_path = stage_path / f"{name}-{digest}.zip"
+
+        # Drop bundles of previous builds of this dependency
+        for stale in stage_path.glob(f"{name}-*.zip"):
+            if stale != zip_path:
+                stale.unlink()
+        if not zip_path.exists():
+            zip_path.write_bytes(zip_bytes)
+        return zip_path
+
+    def _list_stage_files(self) -> set:
+        try:
+            rows = self.session.sql(f"LIST {self.stage}").collect()
+        except Exception as e:
+            print(f"Could not list {self.stage}, uploading all bundles: {e}")
+            return set()
+        return {row["name"].rsplit("/", 1)[-1] for row in rows}
+
+    def _compress_files_to_zip(self, files: List[Path]) -> bytes:
+        """
+        Zip files under their path relative to the project root, reproducibly:
+        entries are sorted and carry a fixed timestamp and permissions, so
+        identical sources always give identical bytes.
+        """
+        root = Path.cwd().resolve()
+        arcnames = sorted({Path(file).resolve().relative_to(root).as_posix(): Path(file) for file in files}.items())
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as zip_file:
+            for arcname, file_path in arcnames:
+                info = zipfile.ZipInfo(arcname, date_time=_ZIP_TIMESTAMP)
+                info.external_attr = 0o644 << 16
+                info.compress_type = zipfile.ZIP_STORED
+                zip_file.writestr(info, file_path.read_bytes())
+        return buffer.getvalue()
 
     def _get_snowpark_package_version(self) -> str:
         env_path = Path("conda.yml")
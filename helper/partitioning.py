@@ -0,0 +1,98 @@
+import math
+from pathlib import PurePosixPath
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+from snowflake.snowpark import Column
+from snowflake.snowpark.functions import col, concat, floor, lit
+from snowflake.snowpark.types import LongType, StringType
+
+# Size of the latitude/longitude grid cells of the geo_bucket partition key
+GEO_BUCKET_DEGREES = 1.0
+
+PartitionFilter = dict[str, Union[str, Iterable[str]]]
+
+
+def geo_bucket(latitude: float, longitude: float, degrees: float = GEO_BUCKET_DEGREES) -> str:
+    """
+    geo_bucket partition value of a point, e.g. ``geo_bucket(37.8, -122.3) == "37_-123"``.
+    """
+    return f"{math.floor(latitude / degrees)}_{math.floor(longitude / degrees)}"
+
+
+def _geo_bucket_pandas(df: pd.DataFrame) -> pd.Series:
+    lat = np.floor(df["Latitude"].to_numpy(dtype=np.float64) / GEO_BUCKET_DEGREES).astype(np.int64)
+    lon = np.floor(df["Longitude"].to_numpy(dtype=np.float64) / GEO_BUCKET_DEGREES).astype(np.int64)
+    return pd.Series(lat.astype(str), index=df.index) + "_" + pd.Series(lon.astype(str), index=df.index)
+
+
+def _geo_bucket_snowpark() -> Column:
+    def cell(name: str) -> Column:
+        return floor(col(name) / GEO_BUCKET_DEGREES).cast(LongType()).cast(StringType())
+
+    return concat(cell("Latitude"), lit("_"), cell("Longitude"))
+
+
+# Partition key to its pandas and Snowpark derivations from the row's columns
+_PARTITION_KEYS = {
+    "geo_bucket": (_geo_bucket_pandas, _geo_bucket_snowpark),
+}
+
+
+def partition_paths(df: pd.DataFrame, partition_by: tuple[str, ...]) -> pd.Series:
+    """
+    Hive-style partition directory of every row, e.g. ``geo_bucket=37_-123``.
+    """
+    paths = None
+    for key in partition_by:
+        values = f"{key}=" + _PARTITION_KEYS[key][0](df)
+        paths = values if paths is None else paths + "/" + values
+    return paths
+
+
+def partition_expression(partition_by: tuple[str, ...]) -> Column:
+    """
+    Snowpark expression of the partition directory, for ``copy_into_location(partition_by=...)``.
+    """
+    parts = []
+    for key in partition_by:
+        if parts:
+            parts.append(lit("/"))
+        parts.extend([lit(f"{key}="), _PARTITION_KEYS[key][1]()])
+    return concat(*parts)
+
+
+def parse_partition_path(path: str) -> dict[str, str]:
+    """
+    Partition values of a file from the ``<key>=<value>`` directories of its path.
+    """
+    values = {}
+    for segment in PurePosixPath(str(path).replace("\\", "/")).parent.parts:
+        key, sep, value = segment.partition("=")
+        if sep:
+            values[key] = value
+    return values
+
+
+def matches_partitions(path: str, partitions: Optional[PartitionFilter]) -> bool:
+    """
+    Whether a file lies in partitions accepted by ``partitions``, a mapping of
+    partition keys to one accepted value or a list of them.
+    """
+    if not partitions:
+        return True
+    values = parse_partition_path(path)
+    for key, accepted in partitions.items():
+        accepted = {accepted} if isinstance(accepted, str) else {str(v) for v in accepted}
+        if values.get(key) not in accepted:
+            return False
+    return True
+
+
+def validate_partition_filter(partition_by: Optional[tuple[str, ...]], partitions: Optional[PartitionFilter], asset_name: str) -> None:
+    if not partitions:
+        return
+    unknown = set(partitions) - set(partition_by or ())
+    if unknown:
+        raise ValueError(f"Data asset '{asset_name}' is not partitioned by {sorted(unknown)}.")
@@ -1,53 +1,94 @@
+from typing import List, Optional
 from snowflake.snowpark import Session
+from helper.compute import NodeCompute, WarehouseSizePlanner, warehouse_specs
+from helper.deploy import DeployPlanner, TaskSpec
+from helper.monitor import PipelineRunMonitor, RunReport
+from helper.node import SPROC_ARGUMENTS
 
 
 class SnowflakePipelineBuilder:
     def __init__(self, session: Session, pipeline_definition: dict, warehouse: str):
+        """
+        Args:
+            session (Session): Snowpark session.
+            pipeline_definition (dict): Nodes of the pipeline; a node's optional
+                ``compute`` entry picks its warehouse, size or serverless task
+                parameters (see helper/compute.py), others run on ``warehouse``.
+            warehouse (str): Default warehouse, also running the start task.
+        """
         self.session = session
         self.pipeline_definition = pipeline_definition
         self.warehouse = warehouse
+        self._planner: Optional[DeployPlanner] = None
+
+    @property
+    def planner(self) -> DeployPlanner:
+        if self._planner is None:
+            self._planner = DeployPlanner(self.session)
+        return self._planner
 
     def _serialize_param_dict(self, param_dict):
         serialized = []
-        for key in ["input_data", "output_data", "is_local"]:
-            value = param_dict.get(key)
+        for key in SPROC_ARGUMENTS:
+            value = param_dict.get(key, "full" if key == "mode" else None)
             if isinstance(value, list):
                 serialized.append(f"ARRAY_CONSTRUCT({', '.join(repr(v) for v in value)})")
             else:
                 serialized.append(repr(value))  # For bools or scalars
         return ", ".join(serialized)
 
-    def build_tasks(self, pipeline_name: str):
-        self.build_dummy_start_task(pipeline_name=pipeline_name)
+    def task_specs(self, pipeline_name: str) -> List[TaskSpec]:
+        """
+        Tasks of the pipeline, start task first. Builds the SQL without a session.
+        """
+        tasks = [self._dummy_start_task_spec(pipeline_name)]
 
         # Create actual pipeline tasks
         for node_name, config in self.pipeline_definition.items():
             sproc_name = f"{pipeline_name}_{config['function']}_sproc"
-            after_clause = ""
 
             if config.get("depends_on"):
-                after_clause = "AFTER " + ", ".join(f"task_{pipeline_name}_{dep}" for dep in config["depends_on"])
+                after = tuple(f"task_{pipeline_name}_{dep}" for dep in config["depends_on"])
             else:
-                after_clause = f"AFTER START_{pipeline_name}"
+                after = (f"START_{pipeline_name}",)
 
             params_dict = config.get("params", {})
             params_str = self._serialize_param_dict(params_dict)
 
-            sql = f"""
-                CREATE OR REPLACE TASK task_{pipeline_name}_{node_name}
-                WAREHOUSE = {self.warehouse}
-                {after_clause}
-                AS
-                CALL {sproc_name}({params_str});
-            """
-            self.session.sql(sql).collect()
-            print(f"Created task: task_{pipeline_name}_{node_name}")
+            compute = NodeCompute.from_config(config.get("compute"), node_name)
+            tasks.append(TaskSpec(
+                name=f"task_{pipeline_name}_{node_name}",
+                body=f"CALL {sproc_name}({params_str});",
+                after=after,
+                **compute.task_options(self.warehouse)
+            ))
+        return tasks
+
+    def build_tasks(self, pipeline_name: str):
+        """
+        Create the pipeline's tasks, and the sized warehouses they run on, only
+        replacing the ones that changed since the last deploy.
+        """
+        self.planner.apply(self.planner.plan(
+            tasks=self.task_specs(pipeline_name),
+            warehouses=warehouse_specs(self.pipeline_definition)
+        ))
     
     
-    def run_pipeline(self, pipeline_name: str):
+    def run_pipeline(self, pipeline_name: str, wait: bool = False, timeout: Optional[float] = None) -> Optional[RunReport]:
         """
         Trigger root task(s) in the pipeline to begin execution.
+
+        Args:
+            pipeline_name (str): Pipeline name used in task names.
+            wait (bool): Block until the task graph finishes and return its report.
+            timeout (float, optional): Seconds to wait when ``wait`` is set.
+
+        Returns:
+            RunReport: Per-node timings and critical path when ``wait`` is set.
         """
+        monitor = self.monitor(pipeline_name)
+        since = monitor.current_time() if wait else None
         entry_nodes = [node for node, cfg in self.pipeline_definition.items() if not cfg.get("depends_on")]
 
         try:
@@ -60,16 +101,28 @@ class SnowflakePipelineBuilder:
             self.session.sql(f"call SYSTEM$TASK_DEPENDENTS_ENABLE('START_{pipeline_name}');").collect()
             self.session.sql(f"alter task START_{pipeline_name} resume;").collect()
             self.session.sql(f"EXECUTE TASK START_{pipeline_name}").collect()
+
+        if not wait:
+            return None
+        report = monitor.wait(since, timeout=timeout)
+        print(report.summary())
+        return report
+
+    def monitor(self, pipeline_name: str) -> PipelineRunMonitor:
+        return PipelineRunMonitor(self.session, self.pipeline_definition, pipeline_name)
+
+    def size_planner(self, pipeline_name: str, lookback_days: int = 7) -> WarehouseSizePlanner:
+        return WarehouseSizePlanner(self.session, self.pipeline_definition, pipeline_name, lookback_days)
                 
                 
+    def _dummy_start_task_spec(self, pipeline_name) -> TaskSpec:
+        return TaskSpec(
+            name=f"KEDRO.PUBLIC.START_{pipeline_name}",
+            body="SELECT 1;",
+            warehouse=self.warehouse,
+            schedule="11520 MINUTE"
+        )
+
     def build_dummy_start_task(self, pipeline_name):
-        dummy_start_sql = f"""
-            CREATE OR REPLACE TASK KEDRO.PUBLIC.START_{pipeline_name}
-            WAREHOUSE = {self.warehouse}
-            SCHEDULE = '11520 MINUTE'
-            AS
-            SELECT 1;
-            """
-        self.session.sql(dummy_start_sql).collect()
+        self.planner.apply(self.planner.plan(tasks=[self._dummy_start_task_spec(pipeline_name)]))
         # self.session.sql(f"ALTER TASK START_{pipeline_name} RESUME").collect()
-        print(f"Created and resumed dummy task: START_{pipeline_name}")
\ No newline at end of file
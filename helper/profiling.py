@@ -0,0 +1,261 @@
+import contextlib
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Set to "1" to enable profiling without calling configure()
+PROFILE_ENV = "PIPELINE_PROFILE"
+# Set to "1" to also trace Python allocation peaks (slower)
+TRACE_ALLOC_ENV = "PIPELINE_PROFILE_TRACEMALLOC"
+DEFAULT_PROFILE_PATH = "data/08_reporting/node_profiles.jsonl"
+# Seconds between resident memory samples taken while a node runs
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Current resident memory of the process, None where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class RssSampler:
+    """
+    Peak resident memory of the process while a block runs, sampled from a
+    background thread, relative to its resident memory when the block started.
+    """
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.start_bytes: Optional[int] = None
+        self.peak_bytes: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        rss = current_rss_bytes()
+        if rss is not None and rss > self.peak_bytes:
+            self.peak_bytes = rss
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "RssSampler":
+        self.start_bytes = self.peak_bytes = current_rss_bytes()
+        if self.start_bytes is not None:
+            self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    @property
+    def peak_delta_bytes(self) -> Optional[int]:
+        if self.start_bytes is None:
+            return None
+        return self.peak_bytes - self.start_bytes
+
+
+@dataclass
+class NodeProfile:
+    node: str
+    started_at: str
+    wall_seconds: Optional[float] = None
+    cpu_seconds: Optional[float] = None
+    # Resident memory when the node started, and its peak growth while it ran.
+    # Sampled process-wide, so nodes running concurrently count each other's memory
+    rss_start_mb: Optional[float] = None
+    rss_peak_delta_mb: Optional[float] = None
+    # Peak resident memory over the whole process lifetime, up to the node's end
+    process_peak_rss_mb: Optional[float] = None
+    alloc_peak_mb: Optional[float] = None
+    snowflake_queries: Optional[int] = None
+    status: str = "running"
+    io: List[dict] = field(default_factory=list)
+    memory: List[dict] = field(default_factory=list)
+
+    def record_io(self, asset: str, direction: str, rows: Optional[int], bytes: Optional[int]) -> None:
+        for entry in self.io:
+            if entry["asset"] == asset and entry["direction"] == direction:
+                entry["rows"] = rows if rows is not None else entry["rows"]
+                entry["bytes"] = bytes if bytes is not None else entry["bytes"]
+                return
+        self.io.append({"asset": asset, "direction": direction, "rows": rows, "bytes": bytes})
+
+    def record_memory(self, asset: str, before_bytes: int, after_bytes: int) -> None:
+        self.memory.append({"asset": asset, "before_bytes": before_bytes, "after_bytes": after_bytes})
+
+
+class JsonLinesSink:
+    """
+    Append one JSON record per node run to a local file.
+    """
+
+    def __init__(self, path: str = DEFAULT_PROFILE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def write(self, profile: NodeProfile) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps(asdict(profile)) + "\n")
+
+
+class SnowflakeTableSink:
+    """
+    Append one VARIANT record per node run to a Snowflake table.
+    """
+
+    def __init__(self, session, table_name: str = "PIPELINE_NODE_PROFILES"):
+        self.session = session
+        self.table_name = table_name
+        self._created = False
+
+    def write(self, profile: NodeProfile) -> None:
+        if not self._created:
+            self.session.sql(f"CREATE TABLE IF NOT EXISTS {self.table_name} (RECORD VARIANT)").collect()
+            self._created = True
+        self.session.sql(
+            f"INSERT INTO {self.table_name} SELECT PARSE_JSON(?)",
+            params=[json.dumps(asdict(profile))]
+        ).collect()
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = os.getenv(PROFILE_ENV) == "1"
+        self.trace_alloc = os.getenv(TRACE_ALLOC_ENV) == "1"
+        self.sink = JsonLinesSink()
+        self._local = threading.local()
+
+    def configure(self, enabled: Optional[bool] = None, sink=None, trace_alloc: Optional[bool] = None) -> None:
+        """
+        Args:
+            enabled (bool, optional): Turn profiling on or off.
+            sink (optional): Object with a ``write(NodeProfile)`` method.
+            trace_alloc (bool, optional): Record Python allocation peaks with tracemalloc.
+        """
+        if enabled is not None:
+            self.enabled = enabled
+        if sink is not None:
+            self.sink = sink
+        if trace_alloc is not None:
+            self.trace_alloc = trace_alloc
+
+    @property
+    def current(self) -> Optional[NodeProfile]:
+        return getattr(self._local, "profile", None)
+
+    def record_io(self, asset: str, direction: str, rows: Optional[int] = None, bytes: Optional[int] = None) -> None:
+        """
+        Attach rows/bytes read or written for an asset to the node running in this thread.
+        """
+        profile = self.current
+        if profile is not None:
+            profile.record_io(asset, direction, rows, bytes)
+
+    def record_memory(self, asset: str, before_bytes: int, after_bytes: int) -> None:
+        """
+        Attach the in-memory size of an asset before and after dtype compaction
+        to the node running in this thread.
+        """
+        profile = self.current
+        if profile is not None:
+            profile.record_memory(asset, before_bytes, after_bytes)
+
+    def run(self, func, args: tuple, kwargs: dict):
+        bound = inspect.signature(func).bind_partial(*args, **kwargs)
+        session = bound.arguments.get("session")
+
+        profile = NodeProfile(node=func.__name__, started_at=datetime.now(timezone.utc).isoformat())
+        self._local.profile = profile
+
+        trace_alloc = self.trace_alloc
+        if trace_alloc:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        history = session.query_history() if session is not None else contextlib.nullcontext()
+        queries = None
+        rss = RssSampler()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            with rss, history as queries:
+                result = func(*args, **kwargs)
+            profile.status = "success"
+            return result
+        except BaseException:
+            profile.status = "failed"
+            raise
+        finally:
+            profile.wall_seconds = time.perf_counter() - wall_start
+            # Process-wide, so concurrent nodes share CPU time
+            profile.cpu_seconds = time.process_time() - cpu_start
+            if queries is not None:
+                profile.snowflake_queries = len(queries.queries)
+            if rss.start_bytes is not None:
+                profile.rss_start_mb = rss.start_bytes / (1024 * 1024)
+                profile.rss_peak_delta_mb = rss.peak_delta_bytes / (1024 * 1024)
+            if resource is not None:
+                # ru_maxrss is in KiB on Linux
+                profile.process_peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            if trace_alloc:
+                profile.alloc_peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            self._local.profile = None
+            try:
+                self.sink.write(profile)
+            except Exception as e:
+                logger.warning(f"Could not write profile of {profile.node}: {e}")
+
+
+profiler = Profiler()
+
+
+def record_io(asset: str, direction: str, rows: Optional[int] = None, bytes: Optional[int] = None) -> None:
+    if profiler.enabled:
+        profiler.record_io(asset, direction, rows, bytes)
+
+
+def record_memory(asset: str, before_bytes: int, after_bytes: int) -> None:
+    if profiler.enabled:
+        profiler.record_memory(asset, before_bytes, after_bytes)
+
+
+def profiled(func):
+    """
+    Profile a node when profiling is enabled, otherwise call it directly.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not profiler.enabled:
+            return func(*args, **kwargs)
+        return profiler.run(func, args, kwargs)
+
+    return wrapper
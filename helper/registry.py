@@ -0,0 +1,163 @@
+import ast
+import functools
+import importlib
+import importlib.util
+import inspect
+from pathlib import Path
+from typing import Callable, Dict, List, Set, Tuple, Union
+
+# A node given as a callable or as a lazy "package.module:function" reference
+NodeRef = Union[str, Callable]
+
+# Import names of the third-party packages nodes use, and their Anaconda package names
+PACKAGE_NAMES = {
+    "numpy": "numpy",
+    "pandas": "pandas",
+    "pyarrow": "pyarrow",
+    "sklearn": "scikit-learn",
+    "yaml": "pyyaml",
+    "shap": "shap",
+    "matplotlib": "matplotlib",
+}
+
+
+def _split_ref(ref: str) -> Tuple[str, str]:
+    module_name, sep, func_name = ref.partition(":")
+    if not sep or not module_name or not func_name:
+        raise ValueError(f"Node reference '{ref}' must look like 'package.module:function'.")
+    return module_name, func_name
+
+
+def validate_node_ref(ref: NodeRef) -> None:
+    """
+    Check a node reference points to an existing module, without importing it.
+    """
+    if callable(ref):
+        return
+    module_name, _ = _split_ref(ref)
+    if importlib.util.find_spec(module_name) is None:
+        raise ModuleNotFoundError(f"Node module '{module_name}' not found (reference '{ref}').")
+
+
+@functools.lru_cache(maxsize=None)
+def _import_node(ref: str) -> Callable:
+    module_name, func_name = _split_ref(ref)
+    module = importlib.import_module(module_name)
+    try:
+        return getattr(module, func_name)
+    except AttributeError:
+        raise AttributeError(f"Module '{module_name}' has no node function '{func_name}'.") from None
+
+
+def resolve_node(ref: NodeRef) -> Callable:
+    """
+    Return the node callable, importing its module on first use.
+    """
+    return ref if callable(ref) else _import_node(ref)
+
+
+def resolve_nodes(refs: Dict[str, NodeRef]) -> Dict[str, Callable]:
+    return {name: resolve_node(ref) for name, ref in refs.items()}
+
+
+def node_parameters(ref: NodeRef) -> List[str]:
+    """
+    Argument names of a node. Lazy references are read from their module's
+    source without importing it, unless the function is not defined there
+    with ``def`` (e.g. re-exported from another module).
+    """
+    if callable(ref):
+        return list(inspect.signature(ref).parameters)
+
+    module_name, func_name = _split_ref(ref)
+    spec = importlib.util.find_spec(module_name)
+    if spec is not None and spec.has_location and spec.origin and spec.origin.endswith(".py"):
+        tree = ast.parse(Path(spec.origin).read_text(), filename=spec.origin)
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == func_name:
+                args = node.args
+                names = [arg.arg for arg in args.posonlyargs + args.args + args.kwonlyargs]
+                if args.vararg:
+                    names.append(args.vararg.arg)
+                if args.kwarg:
+                    names.append(args.kwarg.arg)
+                return names
+    return list(inspect.signature(_import_node(ref)).parameters)
+
+
+def _module_file(module_name: str, root: Path):
+    """
+    Source file of a module living under ``root``, None for third-party or stdlib modules.
+    """
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not spec.has_location:
+        return None
+    origin = Path(spec.origin).resolve()
+    return origin if origin.is_relative_to(root) else None
+
+
+def _imported_names(tree: ast.AST, module_name: str, is_package: bool) -> Set[str]:
+    names = set()
+    package = module_name if is_package else module_name.rpartition(".")[0]
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package.rsplit(".", node.level - 1)[0] if node.level > 1 else package
+                base = f"{base}.{node.module}" if node.module else base
+            else:
+                base = node.module
+            names.add(base)
+            # "from package import module" imports a submodule
+            names.update(f"{base}.{alias.name}" for alias in node.names)
+    return names
+
+
+def node_dependencies(ref: NodeRef, root: Union[str, Path] = ".") -> Tuple[List[Path], List[str]]:
+    """
+    Local source files and third-party packages a node needs, found by
+    following its module's imports (including imports inside functions).
+
+    Args:
+        ref (NodeRef): Node callable or "package.module:function" reference.
+        root (str | Path): Project root, modules outside it are third-party.
+
+    Returns:
+        Tuple[List[Path], List[str]]: Sorted local files (with the ``__init__.py``
+            of their packages) and the Anaconda names of the packages imported.
+    """
+    root = Path(root).resolve()
+    start = ref.__module__ if callable(ref) else _split_ref(ref)[0]
+
+    files: Set[Path] = set()
+    packages: Set[str] = set()
+    seen: Set[str] = set()
+    queue = [start]
+    while queue:
+        module_name = queue.pop()
+        if module_name in seen:
+            continue
+        seen.add(module_name)
+
+        # Importing a module runs its parent packages' __init__ first
+        parent = module_name.rpartition(".")[0]
+        if parent:
+            queue.append(parent)
+
+        top_level = module_name.partition(".")[0]
+        # Only resolve local names, finding a third-party submodule imports its parent
+        path = _module_file(module_name, root) if _module_file(top_level, root) else None
+        if path is None:
+            if top_level in PACKAGE_NAMES:
+                packages.add(PACKAGE_NAMES[top_level])
+            continue
+
+        files.add(path)
+        tree = ast.parse(path.read_text(), filename=str(path))
+        queue.extend(_imported_names(tree, module_name, path.name == "__init__.py"))
+
+    return sorted(files), sorted(packages)
@@ -0,0 +1,179 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from helper.catalogue import get_asset_spec
+from helper.data_helper import get_data_reference, read_pandas
+from helper.snowflake_data_helper import SnowflakeDataHelper
+
+logger = logging.getLogger(__name__)
+
+# Integer surrogate key joining housing rows to their lookup rows
+ROW_KEY = "row_key"
+
+# Source columns the key is derived from, in hashing order
+ROW_KEY_COLUMNS = ("Latitude", "Longitude", "Population", "AveOccup")
+
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    # Arithmetic on uint64 arrays wraps modulo 2**64
+    x = x + _GOLDEN_GAMMA
+    x = (x ^ (x >> np.uint64(30))) * _MIX_1
+    x = (x ^ (x >> np.uint64(27))) * _MIX_2
+    return x ^ (x >> np.uint64(31))
+
+
+def row_keys(df: pd.DataFrame, columns: tuple[str, ...] = ROW_KEY_COLUMNS) -> pd.Series:
+    """
+    Deterministic 64-bit key of every row, hashing the float64 bits of
+    ``columns`` with splitmix64. Generated once at ingest and written to both
+    sides of a join, so joins compare integers instead of floats.
+    """
+    h = np.zeros(len(df), dtype=np.uint64)
+    for name in columns:
+        # + 0.0 turns -0.0 into 0.0, both sides of a join hash equal values alike
+        values = np.ascontiguousarray(df[name].to_numpy(dtype=np.float64) + 0.0)
+        h = _splitmix64(h ^ values.view(np.uint64))
+    return pd.Series(h.view(np.int64), index=df.index, name=ROW_KEY)
+
+
+class SortedKeyIndex:
+    """
+    Rows of a lookup asset sorted by their integer key, joined to by binary
+    search. Built once per version of the asset's local files and saved next
+    to them (``.<asset>.index.npz``), so repeated local runs neither re-parse
+    the lookup nor rebuild a hash table.
+    """
+
+    def __init__(self, keys: np.ndarray, columns: dict[str, np.ndarray], stamp: str = ""):
+        self.keys = keys
+        self.columns = columns
+        self.stamp = stamp
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, key: str = ROW_KEY, stamp: str = "") -> "SortedKeyIndex":
+        keys = df[key].to_numpy(dtype=np.int64)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        if len(keys) > 1 and np.any(keys[1:] == keys[:-1]):
+            raise ValueError(f"Duplicate {key} values, the lookup must hold one row per key.")
+        columns = {}
+        for name in df.columns:
+            if name == key:
+                continue
+            values = df[name].to_numpy()[order]
+            # Saved without pickling, so strings are stored as fixed-width unicode
+            columns[name] = values.astype(str) if values.dtype == object else values
+        return cls(keys, columns, stamp)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                keys=self.keys,
+                names=np.array(list(self.columns), dtype=str),
+                stamp=np.array(self.stamp),
+                **{f"column_{i}": values for i, values in enumerate(self.columns.values())}
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path, stamp: str) -> Optional["SortedKeyIndex"]:
+        """
+        Saved index at ``path``, None when missing, unreadable or built from other files.
+        """
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as saved:
+                if str(saved["stamp"]) != stamp:
+                    return None
+                columns = {str(name): saved[f"column_{i}"] for i, name in enumerate(saved["names"])}
+                return cls(saved["keys"], columns, stamp)
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"Ignoring unreadable key index {path}: {e}")
+            return None
+
+    def join(self, df: pd.DataFrame, key: str = ROW_KEY) -> pd.DataFrame:
+        """
+        Inner join of ``df`` with the indexed rows on ``key``, in ``df``'s row order.
+        """
+        probe = df[key].to_numpy(dtype=np.int64)
+        if len(self.keys):
+            positions = np.minimum(np.searchsorted(self.keys, probe), len(self.keys) - 1)
+            found = self.keys[positions] == probe
+        else:
+            positions, found = np.zeros(len(probe), dtype=np.int64), np.zeros(len(probe), dtype=bool)
+
+        unmatched = int((~found).sum())
+        if unmatched:
+            logger.debug(f"{unmatched} row(s) have no {key} match")
+
+        joined = df.loc[found].reset_index(drop=True)
+        for name, values in self.columns.items():
+            joined[name] = values[positions[found]]
+        return joined
+
+
+_indexes: dict[Path, SortedKeyIndex] = {}
+_lock = threading.Lock()
+
+
+def _source_stamp(local_path: Path, file_type: str) -> str:
+    files = sorted(local_path.rglob(f"*.{file_type}")) if local_path.is_dir() else [local_path]
+    stamps = []
+    for file in files:
+        stat = file.stat()
+        stamps.append(f"{file.as_posix()}:{stat.st_size}:{stat.st_mtime_ns}")
+    return ";".join(stamps)
+
+
+def load_key_index(
+    asset_name: str,
+    sf_helper: Optional[SnowflakeDataHelper] = None,
+    key: str = ROW_KEY
+) -> SortedKeyIndex:
+    """
+    Sorted key index of a local asset: the one already loaded by this
+    process, the one saved next to the asset's files, or a new one built
+    from them, in that order, as long as the files did not change since.
+
+    Args:
+        asset_name (str): Asset name in catalogue.
+        sf_helper (SnowflakeDataHelper, optional): Brings the local copy of a
+            staged asset up to date first.
+        key (str): Integer key column.
+
+    Returns:
+        SortedKeyIndex: Index of the asset's rows.
+    """
+    asset_spec = get_asset_spec(asset_name)
+    get_data_reference(asset_spec.to_dict(), sf_helper, True)
+
+    local_path = Path(asset_spec.local_path)
+    stamp = _source_stamp(local_path, asset_spec.file_type)
+    index_path = (local_path if asset_spec.is_folder else local_path.parent) / f".{asset_name}.index.npz"
+
+    with _lock:
+        index = _indexes.get(index_path)
+        if index is not None and index.stamp == stamp:
+            return index
+
+        index = SortedKeyIndex.load(index_path, stamp)
+        if index is None:
+            print(f"Building {key} index of {asset_name}")
+            index = SortedKeyIndex.build(read_pandas(asset_name, True, sf_helper), key, stamp)
+            index.save(index_path)
+        _indexes[index_path] = index
+    return index
@@ -1,9 +1,166 @@
+import contextlib
+import logging
 import os
+import threading
+import time
 import yaml
-from typing import Dict, Optional
+from collections import deque
+from typing import Callable, Dict, Iterator, Optional
 from pathlib import Path
 from snowflake.snowpark import Session
 
+logger = logging.getLogger(__name__)
+
+
+class SessionPool:
+    def __init__(
+        self,
+        factory: Callable[[], Session],
+        size: int = 4,
+        health_check_interval: float = 300.0,
+        acquire_timeout: Optional[float] = None
+    ):
+        """
+        Thread-safe pool of Snowpark sessions, created lazily up to ``size``.
+
+        Idle sessions are reused most-recently-used first, so warm connections
+        stay warm. A session idle for longer than ``health_check_interval`` is
+        checked with ``SELECT 1`` before reuse and replaced if it is broken.
+
+        Args:
+            factory (callable): Creates a new logged-in session.
+            size (int): Maximum number of sessions, idle or checked out.
+            health_check_interval (float): Idle seconds after which a session is checked.
+            acquire_timeout (float, optional): Default seconds to wait for a free session.
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._factory = factory
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self._idle: deque = deque()
+        self._created = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._local = threading.local()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _is_healthy(self, session: Session) -> bool:
+        try:
+            session.sql("SELECT 1").collect()
+            return True
+        except Exception as e:
+            logger.debug(f"Discarding broken pooled session: {e}")
+            return False
+
+    def _discard(self, session: Session) -> None:
+        try:
+            session.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled session: {e}")
+        with self._condition:
+            self._created -= 1
+            self._condition.notify()
+
+    def acquire(self, timeout: Optional[float] = None) -> Session:
+        """
+        Check out a session, creating one if the pool is not full, otherwise
+        waiting up to ``timeout`` seconds for one to be released.
+        """
+        timeout = timeout if timeout is not None else self.acquire_timeout
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Session pool is closed.")
+                    if self._idle:
+                        session, last_used = self._idle.pop()
+                        break
+                    if self._created < self.size:
+                        self._created += 1
+                        session, last_used = None, None
+                        break
+                    remaining = deadline - time.monotonic() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No Snowpark session free after {timeout}s")
+                    self._condition.wait(remaining)
+
+            if session is None:
+                try:
+                    session = self._factory()
+                except BaseException:
+                    with self._condition:
+                        self._created -= 1
+                        self._condition.notify()
+                    raise
+                logger.debug(f"Created pooled session {self._created}/{self.size}")
+                return session
+
+            if time.monotonic() - last_used < self.health_check_interval or self._is_healthy(session):
+                return session
+            self._discard(session)
+
+    def release(self, session: Session) -> None:
+        with self._condition:
+            if not self._closed:
+                self._idle.append((session, time.monotonic()))
+                self._condition.notify()
+                return
+        self._discard(session)
+
+    @contextlib.contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[Session]:
+        """
+        Check out a session for the duration of a ``with`` block.
+        """
+        session = self.acquire(timeout)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def thread_session(self) -> Session:
+        """
+        Session bound to the calling thread, checked out on first use and kept
+        until ``release_thread_session`` (or ``close``).
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self.acquire()
+            self._local.session = session
+        return session
+
+    def release_thread_session(self) -> None:
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            self._local.session = None
+            self.release(session)
+
+    def close(self) -> None:
+        """
+        Close idle sessions and stop handing out new ones. Sessions still
+        checked out are closed when they are released.
+        """
+        with self._condition:
+            self._closed = True
+            idle = [session for session, _ in self._idle]
+            self._idle.clear()
+            self._condition.notify_all()
+        for session in idle:
+            self._discard(session)
+
+    def __enter__(self) -> "SessionPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
 
 class SnowflakeConnectionManager:
     def __init__(
@@ -26,6 +183,9 @@ class SnowflakeConnectionManager:
         )
         self.profile = profile
         self.env_prefix = env_prefix
+        self._lock = threading.Lock()
+        self._parameters: Optional[Dict[str, str]] = None
+        self._pool: Optional[SessionPool] = None
 
     def _from_yaml(self) -> Dict[str, str]:
         if not os.path.exists(self.config_file):
@@ -44,20 +204,50 @@ class SnowflakeConnectionManager:
             if os.getenv(f"{self.env_prefix}{key}")
         }
 
-    def get_connection_parameters(self) -> Dict[str, str]:
+    def get_connection_parameters(self, refresh: bool = False) -> Dict[str, str]:
         """
         Merge YAML and environment-based config.
         Environment variables override YAML config.
+        Read once per manager, pass ``refresh=True`` to read them again.
         """
-        params = self._from_yaml()
-        params.update(self._from_env())
-        return params
+        with self._lock:
+            if self._parameters is None or refresh:
+                params = self._from_yaml()
+                params.update(self._from_env())
+                self._parameters = params
+            return dict(self._parameters)
 
-    def create_session(self) -> Session:
+    def create_session(self, keep_alive: bool = False) -> Session:
         """
         Create and return a new Snowpark Session.
         """
         config = self.get_connection_parameters()
         if not config:
             raise ValueError("No valid Snowflake connection configuration found.")
+        if keep_alive:
+            config["client_session_keep_alive"] = True
         return Session.builder.configs(config).create()
+
+    def get_pool(self, size: int = 4, health_check_interval: float = 300.0) -> SessionPool:
+        """
+        Shared session pool of this manager, created on first call. Sessions are
+        created lazily and keep their connection alive while idle.
+
+        Args:
+            size (int): Maximum number of sessions.
+            health_check_interval (float): Idle seconds after which a session is checked before reuse.
+        """
+        with self._lock:
+            if self._pool is None or self._pool.closed:
+                self._pool = SessionPool(
+                    lambda: self.create_session(keep_alive=True),
+                    size=size,
+                    health_check_interval=health_check_interval
+                )
+            return self._pool
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
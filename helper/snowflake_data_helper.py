@@ -1,15 +1,99 @@
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Tuple, Union
 import snowflake.snowpark as sp
 from snowflake.snowpark import DataFrame as SPDataFrame
 from pathlib import Path
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import io
 import logging
+import re
+import tempfile
+import threading
+import time
+import weakref
 
 logger = logging.getLogger(__name__)
 
+
+class _StageCache:
+    """
+    Stages known to exist in a session, with the time they were last confirmed.
+    """
+
+    def __init__(self):
+        self._known: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def is_known(self, stage_name: str, ttl: Optional[float] = None) -> bool:
+        with self._lock:
+            confirmed_at = self._known.get(stage_name)
+        if confirmed_at is None:
+            return False
+        return ttl is None or time.monotonic() - confirmed_at < ttl
+
+    def add(self, stage_name: str) -> None:
+        with self._lock:
+            self._known[stage_name] = time.monotonic()
+
+    def invalidate(self, stage_name: Optional[str] = None) -> None:
+        with self._lock:
+            if stage_name is None:
+                self._known.clear()
+            else:
+                self._known.pop(stage_name, None)
+
+
+# One cache per Snowpark session, shared by every helper built on that session
+_stage_caches: "weakref.WeakKeyDictionary[sp.Session, _StageCache]" = weakref.WeakKeyDictionary()
+_stage_caches_lock = threading.Lock()
+
+
+def _get_stage_cache(session: sp.Session) -> _StageCache:
+    with _stage_caches_lock:
+        cache = _stage_caches.get(session)
+        if cache is None:
+            cache = _StageCache()
+            _stage_caches[session] = cache
+        return cache
+
+
+# Part files of the last save of each stage file by this process (0 for a single
+# file). Saves only clear old files when an earlier save may have left more.
+_part_counts: dict[str, int] = {}
+_part_counts_lock = threading.Lock()
+
+
+def _sql_regex_literal(text: str) -> str:
+    """
+    Regex matching ``text`` literally, inside a single-quoted SQL string
+    (where backslashes have to be doubled).
+    """
+    return re.escape(text).replace("\\", "\\\\").replace("'", "''")
+
+
+def _leaves_stale_parts(previous: Optional[int], current: int, may_be_chunked: bool) -> bool:
+    if previous is None:
+        # Unknown in this process, only saves that split files can have left parts
+        return may_be_chunked
+    if previous == current:
+        return False
+    # Part files 0..previous-1 are overwritten when the new save has as many or more
+    return not (0 < previous <= current)
+
+
 class SnowflakeDataHelper:
-    def __init__(self, session: sp.Session):
+    def __init__(self, session: sp.Session, stage_cache_ttl: Optional[float] = None):
+        """
+        Args:
+            session (Session): Snowpark session.
+            stage_cache_ttl (float, optional): Seconds a stage stays known to exist
+                before it is checked again. Defaults to the lifetime of the session.
+        """
         self._session = session
+        self._stage_cache = _get_stage_cache(session)
+        self._stage_cache_ttl = stage_cache_ttl
 
     @property
     def _snowflake_session(self) -> sp.Session:
@@ -20,9 +104,17 @@ class SnowflakeDataHelper:
             raise ValueError("Snowflake path must start with '@' for a named stage.")
         return stage_path.split("/")[0].strip("@")  # e.g., '@my_stage'
 
+    @staticmethod
+    def _normalise_stage_name(stage_name: str) -> str:
+        # Unquoted identifiers are case-insensitive in Snowflake
+        return stage_name if stage_name.startswith('"') else stage_name.upper()
+
     def _ensure_stage_exists(self, stage_path: str) -> None:
         stage_name = self._extract_stage_name(stage_path)
-        
+        cache_key = self._normalise_stage_name(stage_name)
+        if self._stage_cache.is_known(cache_key, self._stage_cache_ttl):
+            return
+
         try:
             logger.debug(f"Ensuring stage {stage_name} exists...")
             result = self._snowflake_session.sql(
@@ -36,10 +128,48 @@ class SnowflakeDataHelper:
                 ).collect()
             else:
                 logger.debug(f"Stage {stage_name} already exists.")
+            self._stage_cache.add(cache_key)
         except Exception as e:
             logger.error(f"Error checking/creating stage: {e}")
             raise
 
+    def prewarm_stages(self, stage_paths: Iterable[str]) -> None:
+        """
+        Check many stages with a single SHOW STAGES, create the missing ones
+        and mark them all as known in the session cache.
+
+        Args:
+            stage_paths (Iterable[str]): Stage names or paths, e.g. '@my_stage/01_raw/'.
+        """
+        stage_names = {self._extract_stage_name(path) for path in stage_paths}
+        pending = {
+            name for name in stage_names
+            if not self._stage_cache.is_known(self._normalise_stage_name(name), self._stage_cache_ttl)
+        }
+        if not pending:
+            return
+
+        logger.debug(f"Pre-warming stage cache for {sorted(pending)}...")
+        existing = {
+            self._normalise_stage_name(row["name"])
+            for row in self._snowflake_session.sql("SHOW STAGES").collect()
+        }
+        for stage_name in sorted(pending):
+            cache_key = self._normalise_stage_name(stage_name)
+            if cache_key not in existing:
+                logger.info(f"Creating stage {stage_name}...")
+                self._snowflake_session.sql(f"CREATE STAGE IF NOT EXISTS {stage_name}").collect()
+            self._stage_cache.add(cache_key)
+
+    def invalidate_stage_cache(self, stage_path: Optional[str] = None) -> None:
+        """
+        Forget one stage (or all of them) so the next write checks again.
+        """
+        if stage_path is None:
+            self._stage_cache.invalidate()
+        else:
+            self._stage_cache.invalidate(self._normalise_stage_name(self._extract_stage_name(stage_path)))
+
     def save_file_to_stage(self, local_path: str, stage_path: str) -> None:
         self._ensure_stage_exists(stage_path)
         self._snowflake_session.file.put(
@@ -55,39 +185,43 @@ class SnowflakeDataHelper:
         local_path: Union[str, Path], 
         stage_path: str, 
         file_type: str = "csv", 
-        table_name: str = None
+        table_name: str = None,
+        chunk_rows: Optional[int] = None,
+        max_workers: int = 4
     ) -> None:
+        """
+        Save a pandas or Snowpark DataFrame to a stage, and optionally to a table.
+
+        Pandas frames are serialised in memory and streamed to the stage, split
+        into ``chunk_rows`` part files uploaded concurrently when they are larger.
+
+        Args:
+            data (DataFrame): Pandas or Snowpark DataFrame.
+            local_path (str | Path): Local path of the asset, its name is used
+                when ``stage_path`` is a directory.
+            stage_path (str): Stage file or directory, e.g. '@my_stage/04_model_input/'.
+            file_type (str): 'csv' or 'parquet'.
+            table_name (str, optional): Table loaded with the data: pandas rows
+                are appended, as the COPY INTO load did, Snowpark frames replace it.
+            chunk_rows (int, optional): Maximum rows per uploaded part file.
+            max_workers (int): Concurrent uploads of part files.
+        """
         local_path = Path(local_path)
 
         self._ensure_stage_exists(stage_path)
 
         if isinstance(data, pd.DataFrame):
-            # Use in-memory temp file path
-            temp_path = Path(f"/tmp/temp_upload.{file_type}")
-            if file_type == "csv":
-                data.to_csv(temp_path, index=False)
-            elif file_type == "parquet":
-                data.to_parquet(temp_path, index=False)
-            else:
+            if file_type not in ("csv", "parquet"):
                 raise ValueError(f"Unsupported file type: {file_type}")
 
-            self._snowflake_session.file.put(
-                str(temp_path), stage_path, auto_compress=False, overwrite=True
-            )
+            stage_dir, file_name = self._split_stage_path(stage_path, local_path.name)
+            self._upload_pandas(data, stage_dir, file_name, file_type, chunk_rows, max_workers)
 
             if table_name:
-                # Load the file into a Snowflake table
-                format_type_options = (
-                    "TYPE=CSV FIELD_OPTIONALLY_ENCLOSED_BY='\"'"
-                    if file_type == "csv"
-                    else "TYPE=PARQUET"
+                # Bulk load the frame into a Snowflake table, appending to its rows
+                self._snowflake_session.write_pandas(
+                    data, table_name, auto_create_table=True, overwrite=False
                 )
-                self._snowflake_session.sql(f"""
-                    COPY INTO {table_name}
-                    FROM @{stage_path}/{temp_path.name}
-                    FILE_FORMAT = ({format_type_options})
-                    ON_ERROR = 'CONTINUE'
-                """).collect()
 
         elif isinstance(data, SPDataFrame):
             # Save Snowpark DataFrame to stage
@@ -96,6 +230,7 @@ class SnowflakeDataHelper:
                     stage_path, 
                     file_format_type="csv", # In production system use "file_format_name" and create a named file format
                     format_type_options={'COMPRESSION':'None'},
+                    header=True,
                     overwrite=True, 
                 )
             elif file_type == "parquet":
@@ -103,6 +238,7 @@ class SnowflakeDataHelper:
                     stage_path, 
                     file_format_type="parquet", # In production system use "file_format_name" and create a named file format
                     format_type_options={'COMPRESSION':'None'},
+                    header=True,  # Keep column names instead of _COL_0, _COL_1, ...
                     overwrite=True, 
                 )
 
@@ -114,6 +250,139 @@ class SnowflakeDataHelper:
         # self._snowflake_session.file.get(stage_path, str(local_path.parent))
         # print(f"Downloaded to local: {local_path.parent}")
 
+    def save_partitioned(self, data: SPDataFrame, stage_dir: str, file_type: str, partition_by) -> None:
+        """
+        Unload a Snowpark DataFrame into one subdirectory of ``stage_dir`` per
+        value of the ``partition_by`` expression, in a single COPY.
+
+        Unloads with PARTITION BY cannot overwrite, callers remove stale files first.
+        """
+        if file_type not in ("csv", "parquet"):
+            raise ValueError(f"Unsupported file type: {file_type}")
+        self._ensure_stage_exists(stage_dir)
+        data.write.copy_into_location(
+            stage_dir,
+            partition_by=partition_by,
+            file_format_type=file_type,
+            format_type_options={'COMPRESSION':'None'},
+            header=True,
+        )
+
+    def save_transient_table(
+        self,
+        data: Union[pd.DataFrame, SPDataFrame],
+        table_name: str,
+        append: bool = False
+    ) -> None:
+        """
+        (Re)create a transient table with the data, or append to it, skipping
+        the stage. Transient tables have no fail-safe period, which suits
+        intermediate assets.
+        """
+        if isinstance(data, pd.DataFrame):
+            self._snowflake_session.write_pandas(
+                data, table_name, auto_create_table=True, overwrite=not append, table_type="transient"
+            )
+        else:
+            data.write.save_as_table(table_name, mode="append" if append else "overwrite", table_type="transient")
+
+
+    @staticmethod
+    def _split_stage_path(stage_path: str, default_name: str) -> Tuple[str, str]:
+        """
+        Split a stage path into directory and file name. Paths ending in '/' or
+        without a file extension are directories and get ``default_name``.
+        """
+        head, _, tail = stage_path.rstrip("/").rpartition("/")
+        if stage_path.endswith("/") or "." not in tail or not head:
+            return stage_path.rstrip("/"), default_name
+        return head, tail
+
+    @staticmethod
+    def _serialize_pandas(data: pd.DataFrame, file_type: str) -> io.BytesIO:
+        buffer = io.BytesIO()
+        if file_type == "csv":
+            data.to_csv(buffer, index=False)
+        else:
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            pq.write_table(table, buffer)
+        buffer.seek(0)
+        return buffer
+
+    def _upload_pandas(
+        self,
+        data: pd.DataFrame,
+        stage_dir: str,
+        file_name: str,
+        file_type: str,
+        chunk_rows: Optional[int],
+        max_workers: int
+    ) -> None:
+        stem = Path(file_name).stem
+        if chunk_rows and len(data) > chunk_rows:
+            parts = [
+                (data.iloc[start:start + chunk_rows], f"{stem}_part{index:05d}.{file_type}")
+                for index, start in enumerate(range(0, len(data), chunk_rows))
+            ]
+        else:
+            parts = [(data, file_name)]
+
+        target = f"{stage_dir}/{stem}.{file_type}".upper()
+        with _part_counts_lock:
+            previous = _part_counts.get(target)
+        part_count = len(parts) if len(parts) > 1 else 0
+        if _leaves_stale_parts(previous, part_count, bool(chunk_rows)):
+            # Overwriting would leave the single file or extra part files of an
+            # earlier save, chunked differently, next to the new ones
+            self._remove_pandas_files(stage_dir, stem, file_type)
+
+        def upload(part: pd.DataFrame, name: str) -> None:
+            self._put_bytes(self._serialize_pandas(part, file_type), f"{stage_dir}/{name}")
+
+        if len(parts) == 1:
+            upload(*parts[0])
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                for future in [pool.submit(upload, part, name) for part, name in parts]:
+                    future.result()
+            logger.debug(f"Uploaded {len(parts)} part files to {stage_dir}")
+
+        with _part_counts_lock:
+            _part_counts[target] = part_count
+
+    def _remove_pandas_files(self, stage_dir: str, stem: str, file_type: str) -> None:
+        """
+        Remove the single file and the part files ``_upload_pandas`` wrote for
+        ``stem`` directly in ``stage_dir``.
+        """
+        # LIST names start with the stage name, followed by the path in the stage
+        _, _, directory = stage_dir.lstrip("@").partition("/")
+        prefix = f"{directory.strip('/')}/" if directory.strip("/") else ""
+        pattern = (
+            f"[^/]+/{_sql_regex_literal(prefix + stem)}(_part[0-9]+)?[.]{_sql_regex_literal(file_type)}"
+        )
+        self._snowflake_session.sql(f"REMOVE {stage_dir}/ PATTERN = '{pattern}'").collect()
+
+    def _put_bytes(self, buffer: io.BytesIO, stage_file: str) -> None:
+        """
+        Stream a buffer to a stage file, falling back to a per-call temporary
+        file when stream upload is not available.
+        """
+        try:
+            self._snowflake_session.file.put_stream(
+                buffer, stage_file, auto_compress=False, overwrite=True
+            )
+            return
+        except (AttributeError, NotImplementedError) as e:
+            logger.debug(f"Stream upload unavailable, using a temporary file: {e}")
+
+        stage_dir, file_name = stage_file.rsplit("/", 1)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir) / file_name
+            temp_path.write_bytes(buffer.getvalue())
+            self._snowflake_session.file.put(
+                str(temp_path), stage_dir, auto_compress=False, overwrite=True
+            )
 
     def load_file(self, local_path: Union[str, Path], stage_path: str, file_type: str = "csv") -> pd.DataFrame:
         local_path = Path(local_path)
@@ -0,0 +1,301 @@
+import base64
+import io
+import json
+import math
+import zlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from helper.catalogue import get_asset_spec
+from helper.data_helper import (
+    _open_source, count_rows, get_data_reference, iter_pandas_chunks, read_pandas
+)
+from helper.snowflake_data_helper import SnowflakeDataHelper
+
+SPLIT_STRATEGIES = ("mask", "hash")
+SPLIT_PARTITIONS = ("train", "test")
+
+
+def _encode(data: bytes) -> str:
+    return base64.b64encode(zlib.compress(data, 9)).decode("ascii")
+
+
+def _decode(data: str) -> bytes:
+    return zlib.decompress(base64.b64decode(data))
+
+
+@dataclass(frozen=True)
+class SplitManifest:
+    """
+    Train/test (or k-fold) assignment of the rows of a source asset, stored
+    instead of materialised copies of each partition.
+
+    Two strategies are supported:
+
+    - ``mask``: a seeded permutation, stored as one test bit per row
+      (``n_folds == 1``) or one fold id byte per row, zlib compressed. Relies
+      on the source keeping its row order.
+    - ``hash``: each row's fold is derived from a seeded hash of
+      ``key_columns``, nothing per row is stored and row order does not matter.
+    """
+    source: str
+    seed: int
+    strategy: str = "mask"
+    test_size: Optional[float] = 0.33
+    n_folds: int = 1
+    n_rows: Optional[int] = None
+    key_columns: Optional[list] = None
+    assignment: Optional[str] = field(default=None, repr=False)
+
+    @classmethod
+    def holdout(cls, source: str, n_rows: int, test_size: float = 0.33, seed: int = 42) -> "SplitManifest":
+        """
+        Random train/test split of ``n_rows`` rows, the test partition having
+        ``ceil(test_size * n_rows)`` rows as in sklearn's train_test_split.
+        """
+        if not 0 < test_size < 1:
+            raise ValueError("test_size must be between 0 and 1")
+        n_test = math.ceil(test_size * n_rows)
+        mask = np.zeros(n_rows, dtype=bool)
+        mask[np.random.default_rng(seed).permutation(n_rows)[:n_test]] = True
+        return cls(
+            source=source, seed=seed, strategy="mask", test_size=test_size,
+            n_rows=n_rows, assignment=_encode(np.packbits(mask).tobytes())
+        )
+
+    @classmethod
+    def kfold(cls, source: str, n_rows: int, n_folds: int = 5, seed: int = 42) -> "SplitManifest":
+        """
+        Random assignment of ``n_rows`` rows to ``n_folds`` folds of near-equal size.
+        """
+        if not 2 <= n_folds <= 255:
+            raise ValueError("n_folds must be between 2 and 255")
+        folds = np.empty(n_rows, dtype=np.uint8)
+        folds[np.random.default_rng(seed).permutation(n_rows)] = np.arange(n_rows) % n_folds
+        return cls(
+            source=source, seed=seed, strategy="mask", test_size=None,
+            n_folds=n_folds, n_rows=n_rows, assignment=_encode(folds.tobytes())
+        )
+
+    @classmethod
+    def hashed(
+        cls,
+        source: str,
+        key_columns: list,
+        test_size: Optional[float] = 0.33,
+        n_folds: int = 1,
+        seed: int = 42
+    ) -> "SplitManifest":
+        """
+        Assignment derived from a seeded hash of ``key_columns``. Partition
+        sizes are approximate and identical rows land in the same partition.
+        """
+        if n_folds == 1 and not (test_size and 0 < test_size < 1):
+            raise ValueError("test_size must be between 0 and 1")
+        if not 1 <= n_folds <= 255:
+            raise ValueError("n_folds must be between 1 and 255")
+        return cls(
+            source=source, seed=seed, strategy="hash", n_folds=n_folds,
+            test_size=test_size if n_folds == 1 else None, key_columns=list(key_columns)
+        )
+
+    def __post_init__(self):
+        if self.strategy not in SPLIT_STRATEGIES:
+            raise ValueError(f"Unsupported split strategy: {self.strategy}")
+        if self.strategy == "mask" and (self.assignment is None or self.n_rows is None):
+            raise ValueError("A mask split manifest needs 'assignment' and 'n_rows'.")
+        if self.strategy == "hash" and not self.key_columns:
+            raise ValueError("A hash split manifest needs 'key_columns'.")
+
+    def _stored_ids(self) -> np.ndarray:
+        # Decoded once per manifest, frozen dataclasses still allow this cache
+        ids = self.__dict__.get("_ids")
+        if ids is None:
+            raw = np.frombuffer(_decode(self.assignment), dtype=np.uint8)
+            ids = np.unpackbits(raw)[:self.n_rows] if self.n_folds == 1 else raw
+            object.__setattr__(self, "_ids", ids)
+        return ids
+
+    def _hashed_ids(self, data: pd.DataFrame) -> np.ndarray:
+        missing = set(self.key_columns) - set(data.columns)
+        if missing:
+            raise ValueError(f"Hash split needs the key columns {sorted(missing)}.")
+        hashes = pd.util.hash_pandas_object(
+            data[self.key_columns], index=False, hash_key=f"{self.seed:016x}"[-16:]
+        ).to_numpy()
+        if self.n_folds == 1:
+            # Top 53 bits as a uniform draw in [0, 1)
+            return ((hashes >> np.uint64(11)) / float(1 << 53) < self.test_size).astype(np.uint8)
+        return (hashes % np.uint64(self.n_folds)).astype(np.uint8)
+
+    def fold_ids(self, data: pd.DataFrame, offset: int = 0) -> np.ndarray:
+        """
+        Fold id of each row of ``data``, rows starting at position ``offset`` of
+        the source. For a holdout split, 1 marks a test row.
+        """
+        if self.strategy == "hash":
+            return self._hashed_ids(data)
+        if offset + len(data) > self.n_rows:
+            raise ValueError(
+                f"Split manifest covers {self.n_rows} rows of '{self.source}', "
+                f"got rows up to {offset + len(data)}. Rerun training_split."
+            )
+        return self._stored_ids()[offset:offset + len(data)]
+
+    def partition_mask(self, data: pd.DataFrame, partition: str, fold: int = 0, offset: int = 0) -> np.ndarray:
+        """
+        Boolean mask of the rows of ``data`` in ``partition`` ('train' or 'test').
+        With k folds, ``fold`` is the test fold and the others are training rows.
+        """
+        if partition not in SPLIT_PARTITIONS:
+            raise ValueError(f"Unsupported partition: {partition}")
+        if not 0 <= fold < max(self.n_folds, 1):
+            raise ValueError(f"fold must be between 0 and {self.n_folds - 1}")
+        test = self.fold_ids(data, offset) == (1 if self.n_folds == 1 else fold)
+        return test if partition == "test" else ~test
+
+    def select(self, data: pd.DataFrame, partition: str, fold: int = 0, offset: int = 0) -> pd.DataFrame:
+        """
+        Rows of ``data`` in ``partition``, indexed by their position in the
+        source asset (``source_row``) so they can be joined back to it.
+        """
+        mask = self.partition_mask(data, partition, fold, offset)
+        selected = data[mask]
+        selected.index = pd.Index(offset + np.flatnonzero(mask), name="source_row")
+        return selected
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SplitManifest":
+        return cls(**data)
+
+
+def save_split_manifest(
+    manifest: SplitManifest,
+    asset_name: str,
+    is_local: bool,
+    sf_helper: Optional[SnowflakeDataHelper] = None
+) -> None:
+    asset_spec = get_asset_spec(asset_name)
+    payload = json.dumps(manifest.to_dict(), indent=2).encode("utf-8")
+
+    if is_local:
+        local_path = Path(asset_spec.local_path)
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        local_path.write_bytes(payload)
+    else:
+        if sf_helper is None:
+            raise ValueError("SnowflakeDataHelper must be provided for Snowflake save.")
+        target_path = get_data_reference(asset_spec.to_dict(), sf_helper, is_local)
+        sf_helper._ensure_stage_exists(target_path)
+        sf_helper._put_bytes(io.BytesIO(payload), target_path)
+
+
+def load_split_manifest(
+    asset_name: str,
+    is_local: bool,
+    sf_helper: Optional[SnowflakeDataHelper] = None
+) -> SplitManifest:
+    asset_spec = get_asset_spec(asset_name)
+    source = _open_source(get_data_reference(asset_spec.to_dict(), sf_helper, is_local), sf_helper)
+    if isinstance(source, io.BytesIO):
+        return SplitManifest.from_dict(json.load(source))
+    with open(source, "r") as f:
+        return SplitManifest.from_dict(json.load(f))
+
+
+def _read_columns(manifest: SplitManifest, columns: Optional[list]) -> Optional[list]:
+    if columns is None or manifest.strategy != "hash":
+        return columns
+    return list(dict.fromkeys(list(columns) + manifest.key_columns))
+
+
+def read_split(
+    manifest: SplitManifest,
+    partition: str,
+    is_local: bool,
+    fold: int = 0,
+    columns: Optional[list] = None,
+    sf_helper: Optional[SnowflakeDataHelper] = None
+) -> pd.DataFrame:
+    """
+    Read one partition of the manifest's source asset.
+
+    Args:
+        manifest (SplitManifest): Split of the source asset.
+        partition (str): 'train' or 'test'.
+        is_local (bool): Read local files, otherwise stream the files from the stage.
+        fold (int): Test fold of a k-fold manifest.
+        columns (list, optional): Columns to project.
+        sf_helper (SnowflakeDataHelper, optional): Required when not local.
+
+    Returns:
+        pd.DataFrame: Rows of the partition.
+    """
+    df = read_pandas(manifest.source, is_local, sf_helper, columns=_read_columns(manifest, columns))
+    if manifest.strategy == "mask" and len(df) != manifest.n_rows:
+        raise ValueError(
+            f"Split manifest covers {manifest.n_rows} rows of '{manifest.source}', "
+            f"found {len(df)}. Rerun training_split."
+        )
+    df = manifest.select(df, partition, fold)
+    return df[columns] if columns else df
+
+
+def iter_split_chunks(
+    manifest: SplitManifest,
+    partition: str,
+    is_local: bool,
+    chunk_rows: int,
+    fold: int = 0,
+    columns: Optional[list] = None,
+    sf_helper: Optional[SnowflakeDataHelper] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream one partition of the manifest's source asset. Each chunk holds the
+    partition's rows among ``chunk_rows`` consecutive source rows.
+    """
+    offset = 0
+    read_columns = _read_columns(manifest, columns)
+    for chunk in iter_pandas_chunks(manifest.source, is_local, chunk_rows, sf_helper, columns=read_columns):
+        selected = manifest.select(chunk, partition, fold, offset)
+        offset += len(chunk)
+        if len(selected):
+            yield selected[columns] if columns else selected
+    if manifest.strategy == "mask" and offset != manifest.n_rows:
+        raise ValueError(
+            f"Split manifest covers {manifest.n_rows} rows of '{manifest.source}', "
+            f"found {offset}. Rerun training_split."
+        )
+
+
+def create_split_manifest(
+    source: str,
+    is_local: bool,
+    strategy: str = "mask",
+    test_size: float = 0.33,
+    n_folds: int = 1,
+    seed: int = 42,
+    key_columns: Optional[list] = None,
+    sf_helper: Optional[SnowflakeDataHelper] = None
+) -> SplitManifest:
+    """
+    Build a manifest for ``source``. The mask strategy only counts the source
+    rows, from file metadata where available, and the hash strategy reads nothing.
+    """
+    if strategy == "hash":
+        key_columns = key_columns or list(get_asset_spec(source).columns)
+        return SplitManifest.hashed(source, key_columns, test_size, n_folds, seed)
+    if strategy != "mask":
+        raise ValueError(f"Unsupported split strategy: {strategy}")
+
+    n_rows = count_rows(source, is_local, sf_helper)
+    if n_folds > 1:
+        return SplitManifest.kfold(source, n_rows, n_folds, seed)
+    return SplitManifest.holdout(source, n_rows, test_size, seed)
@@ -0,0 +1,232 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import snowflake.snowpark as sp
+
+from helper.partitioning import PartitionFilter, matches_partitions
+
+logger = logging.getLogger(__name__)
+
+# Stage files downloaded at the same time
+DEFAULT_DOWNLOAD_WORKERS = 8
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _md5_file(path: Path) -> str:
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _local_stamp(path: Path) -> dict:
+    stat = path.stat()
+    return {"local_size": stat.st_size, "local_mtime_ns": stat.st_mtime_ns}
+
+
+def _stage_path_in_stage(stage_path: str) -> str:
+    """
+    Path of a stage location below the stage name, as it appears in LIST
+    output after the stage name ('@my_stage/01_raw/a.csv' -> '01_raw/a.csv').
+    """
+    return stage_path.lstrip("@").split("/", 1)[1] if "/" in stage_path else ""
+
+
+class StageMirror:
+    """
+    Local copies of stage assets kept in sync with the stage's LIST metadata.
+
+    Each asset has a manifest (``.<asset>.mirror.json`` next to its local
+    files) recording the stage md5, size and last_modified of every file the
+    mirror downloaded, with the local size and mtime it wrote. Missing files
+    and files changed on the stage are downloaded; files removed from the
+    stage are removed locally. When the local copy holds files the mirror did
+    not write (outputs of local runs, local edits) and that differ from the
+    stage, it is left alone. Downloads run concurrently into temporary files
+    renamed into place, so readers never see partial files.
+
+    One mirror serves the whole process: an asset is listed once per run
+    (or once per ``ttl`` seconds), whatever session or node asks for it.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_DOWNLOAD_WORKERS, ttl: Optional[float] = None):
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self._synced: dict[tuple, float] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _asset_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def invalidate(self, target_path: Optional[str] = None) -> None:
+        with self._lock:
+            if target_path is None:
+                self._synced.clear()
+            else:
+                self._synced = {key: at for key, at in self._synced.items() if key[0] != target_path}
+
+    @staticmethod
+    def _load_manifest(path: Path) -> dict:
+        if not path.exists():
+            return {}
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable mirror manifest {path}: {e}")
+            return {}
+
+    @staticmethod
+    def _save_manifest(path: Path, manifest: dict) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _stage_meta(row) -> dict:
+        return {"md5": row["md5"], "size": row["size"], "last_modified": str(row["last_modified"])}
+
+    @staticmethod
+    def _is_mirrored(manifest: dict, local_file: Path, relative: str) -> bool:
+        entry = manifest.get(relative)
+        return entry is not None and _local_stamp(local_file) == {
+            k: entry.get(k) for k in ("local_size", "local_mtime_ns")
+        }
+
+    @staticmethod
+    def _download(session: sp.Session, stage_file: str, local_file: Path) -> None:
+        local_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=local_file.parent, prefix=f".{local_file.name}.", suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(session.file.get_stream(stage_file), f, _HASH_CHUNK_SIZE)
+            os.replace(tmp_name, local_file)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def sync(
+        self,
+        session: sp.Session,
+        asset_details: dict,
+        partitions: Optional[PartitionFilter] = None
+    ) -> None:
+        """
+        Bring the local copy of an asset (only the requested partitions of a
+        partitioned one) up to date with the stage. Failing to list the stage,
+        e.g. offline, leaves the local files as they are.
+        """
+        target_path = asset_details["target_path"]
+        local_path = Path(asset_details["local_path"])
+        is_folder = asset_details.get("is_folder", False)
+        file_type = asset_details.get("file_type", "csv")
+        if not is_folder and target_path.endswith("/"):
+            target_path = f"{target_path}{local_path.name}"
+
+        key = (target_path, json.dumps(partitions, sort_keys=True, default=list))
+        with self._lock:
+            synced_at = self._synced.get(key)
+        if synced_at is not None and (self.ttl is None or time.monotonic() - synced_at < self.ttl):
+            return
+
+        with self._asset_lock(target_path):
+            try:
+                rows = session.sql(f"LIST {target_path}").collect()
+            except Exception as e:
+                logger.debug(f"Could not list {target_path}, using local files: {e}")
+                return
+
+            local_dir = local_path if is_folder else local_path.parent
+            prefix = _stage_path_in_stage(target_path)
+            stage_files = {}
+            for row in rows:
+                path_in_stage = row["name"].split("/", 1)[1] if "/" in row["name"] else row["name"]
+                if is_folder:
+                    if not path_in_stage.startswith(prefix) or not path_in_stage.endswith(f".{file_type}"):
+                        continue
+                    relative = path_in_stage[len(prefix):].lstrip("/")
+                    if not matches_partitions(relative, partitions):
+                        continue
+                elif path_in_stage != prefix:
+                    continue
+                else:
+                    relative = local_path.name
+                stage_files[relative] = row
+
+            manifest_path = local_dir / f".{asset_details.get('name', local_path.stem)}.mirror.json"
+            manifest = self._load_manifest(manifest_path)
+
+            # Adopt local files the mirror did not download when they match the stage
+            local_files = (
+                [f.relative_to(local_dir).as_posix() for f in local_dir.rglob(f"*.{file_type}")]
+                if is_folder and local_dir.exists()
+                else [local_path.name] if local_path.exists() else []
+            )
+            local_files = [relative for relative in local_files if matches_partitions(relative, partitions)]
+            for relative in local_files:
+                row = stage_files.get(relative)
+                local_file = local_dir / relative
+                if relative not in manifest and row is not None and local_file.stat().st_size == row["size"] \
+                        and _md5_file(local_file) == row["md5"]:
+                    manifest[relative] = {**self._stage_meta(row), **_local_stamp(local_file)}
+
+            # Files written by local runs, or edited since download, make the local copy authoritative
+            owned = [relative for relative in local_files if not self._is_mirrored(manifest, local_dir / relative, relative)]
+            if owned:
+                logger.debug(f"Keeping local copy of {target_path}, {len(owned)} file(s) not from the stage")
+                self._save_manifest(manifest_path, manifest)
+                with self._lock:
+                    self._synced[key] = time.monotonic()
+                return
+
+            to_fetch = [
+                relative for relative, row in stage_files.items()
+                if relative not in local_files or manifest[relative]["md5"] != row["md5"]
+                or {k: manifest[relative].get(k) for k in ("size", "last_modified")}
+                != {k: self._stage_meta(row)[k] for k in ("size", "last_modified")}
+            ]
+
+            if to_fetch:
+                print(f"Downloading {len(to_fetch)} file(s) of {target_path}")
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(to_fetch))) as pool:
+                    list(pool.map(
+                        lambda relative: self._download(session, f"@{stage_files[relative]['name']}", local_dir / relative),
+                        to_fetch
+                    ))
+                for relative in to_fetch:
+                    manifest[relative] = {**self._stage_meta(stage_files[relative]), **_local_stamp(local_dir / relative)}
+
+            # Drop mirrored copies of files removed from the stage
+            for relative in list(manifest):
+                if relative in stage_files or not matches_partitions(relative, partitions):
+                    continue
+                manifest.pop(relative)
+                if is_folder:
+                    (local_dir / relative).unlink(missing_ok=True)
+
+            self._save_manifest(manifest_path, manifest)
+
+        with self._lock:
+            self._synced[key] = time.monotonic()
+
+
+_mirror = StageMirror()
+
+
+def get_stage_mirror() -> StageMirror:
+    return _mirror
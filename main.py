@@ -1,8 +1,5 @@
-from de_pipeline.pipeline import run_de_pipeline, register_de_nodes
-from ds_pipeline.pipeline import run_ds_pipeline
 import argparse
 import logging
-from helper.snowflake_connect_manager import SnowflakeConnectionManager
 
 def parse_args():
     # Set up arg parser
@@ -11,6 +8,10 @@ def parse_args():
     # Add arguemnts
     parser.add_argument("--local", action="store_true")
     parser.add_argument("--debug", action="store_true")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel nodes for --local runs")
+    parser.add_argument("--profile", action="store_true", help="Record per-node profiles to data/08_reporting")
+    parser.add_argument("--fuse", action="store_true", help="Hand DataFrames between DE nodes in memory")
+    parser.add_argument("--incremental", action="store_true", help="Only process rows added since the last DE run")
     
     # Parse Args
     return parser.parse_args()
@@ -27,17 +28,38 @@ if __name__  == "__main__":
             if not lib.startswith("helper"):
                 logging.getLogger(lib).setLevel(logging.WARNING)
     
+    # Imported after parsing so --help and argument errors do not pay for snowpark
+    from de_pipeline.pipeline import run_de_pipeline, register_de_nodes
+    from helper.profiling import profiler
+    from helper.snowflake_connect_manager import SnowflakeConnectionManager
+
+    if args.profile:
+        profiler.configure(enabled=True)
+
     conn_mgr = SnowflakeConnectionManager()
-    session = conn_mgr.create_session()
+    # Warm sessions shared by the driver and, in local runs, the parallel nodes
+    pool = conn_mgr.get_pool(size=(args.workers or 2) + 1)
+    session = pool.thread_session()
     
-    register_de_nodes(
-        session
-    )
-    run_de_pipeline(
-        session=session,
-        is_local=args.local
-    )
+    try:
+        if not args.local and not args.fuse:
+            register_de_nodes(
+                session
+            )
+        run_de_pipeline(
+            session=session,
+            is_local=args.local,
+            max_workers=args.workers,
+            session_pool=pool,
+            fuse=args.fuse,
+            mode="incremental" if args.incremental else "full"
+        )
+    finally:
+        pool.release_thread_session()
+        conn_mgr.close()
 
+    # from ds_pipeline.pipeline import run_ds_pipeline
     # run_ds_pipeline(
-    #     is_local=args.local
+    #     is_local=args.local,
+    #     max_workers=args.workers
     # )
\ No newline at end of file
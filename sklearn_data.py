@@ -2,6 +2,8 @@
 import pandas as pd
 from sklearn.datasets import fetch_california_housing
 
+from helper.row_key import ROW_KEY, row_keys
+
 # %%
 main_data_path = "data/01_raw/housing_main.csv"
 lookup_data_path = "data/01_raw/housing_lookup.csv"
@@ -12,7 +14,8 @@ housing = fetch_california_housing()
 data=pd.DataFrame(housing['data'],columns=housing['feature_names'])
 data['MedHouseVal']=housing['target']
 
-data["data_id"] = data['Latitude'] + data['Longitude'] + data['Population'] + data['AveOccup']
+# Integer join key hashed from the source columns, written to both files
+data[ROW_KEY] = row_keys(data)
 # %%
 df_2 = data.copy()
 df_2.drop(columns=["HouseAge", "AveRooms", "Latitude",'Longitude','Population','AveOccup', 'AveBedrms']).to_csv(main_data_path, index=False)
@@ -27,6 +30,6 @@ master_df.head(3)
 lookup_df.head(3)
 
 # %%
-joined_df = master_df.merge(lookup_df, on="data_id")
+joined_df = master_df.merge(lookup_df, on=ROW_KEY)
 
 joined_df
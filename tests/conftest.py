@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Tests import the pipeline packages from the project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def install_catalogue(monkeypatch):
+    """
+    Make a catalogue parsed from YAML text the process-wide one for a test.
+    """
+    from helper import catalogue
+
+    def install(yaml_text: str):
+        parsed = catalogue.DataCatalogue.from_yaml(yaml_text)
+        monkeypatch.setitem(catalogue._catalogues, "data_catalogue.yml", parsed)
+        return parsed
+
+    return install
+
+
+@pytest.fixture(scope="session")
+def local_session():
+    """
+    Snowpark session in local-testing mode, no Snowflake account needed.
+    """
+    snowpark = pytest.importorskip("snowflake.snowpark")
+    session = snowpark.Session.builder.config("local_testing", True).create()
+    yield session
+    session.close()
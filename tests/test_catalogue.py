@@ -0,0 +1,37 @@
+import pytest
+
+from helper.catalogue import AssetSpec, get_catalogue
+
+
+def _spec(**entry) -> AssetSpec:
+    return AssetSpec.from_dict("asset", {
+        "local_path": "data/asset.csv",
+        "target_path": "@stage/asset.csv",
+        "columns": {"A": "float64", "B": "int64"},
+        **entry
+    })
+
+
+def test_float_atol_of_float64_columns():
+    assert _spec(float_atol={"A": 1}).float_atol == {"A": 1.0}
+
+
+@pytest.mark.parametrize("float_atol", [
+    {"B": 0.1},
+    {"C": 0.1},
+    {"A": -0.1},
+    {"A": "small"},
+    {"A": True},
+    [0.1],
+])
+def test_invalid_float_atol_is_rejected(float_atol):
+    with pytest.raises(ValueError):
+        _spec(float_atol=float_atol)
+
+
+def test_compacted_assets_declare_float_tolerances():
+    # Without them compacted reads only narrow floats that round-trip exactly
+    for spec in get_catalogue():
+        if spec.compact:
+            float_columns = {name for name, dtype in spec.columns.items() if dtype == "float64"}
+            assert set(spec.float_atol or {}) == float_columns, spec.name
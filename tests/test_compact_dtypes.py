@@ -0,0 +1,54 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+pytest.importorskip("snowflake.snowpark")
+
+from helper.catalogue import get_asset_spec
+from helper.data_helper import compact_dtypes, iter_pandas_chunks
+
+CATALOGUE = """
+rows:
+  local_path: {root}/rows.csv
+  target_path: "@test_stage/rows.csv"
+  compact: True
+  float_atol:
+    Tolerated: 1.0e-4
+  columns:
+    Tolerated: float64
+    Exact: float64
+"""
+
+
+@pytest.fixture
+def root(tmp_path, install_catalogue):
+    install_catalogue(CATALOGUE.format(root=tmp_path.as_posix()))
+    return tmp_path
+
+
+def test_declared_columns_are_float32_in_every_chunk(root):
+    # Only the second chunk holds values that round-trip exactly
+    pd.DataFrame({"Tolerated": [0.1, 0.2, 0.5, 0.25], "Exact": [0.1, 0.2, 0.5, 0.25]}).to_csv(root / "rows.csv", index=False)
+
+    chunks = list(iter_pandas_chunks("rows", True, chunk_rows=2))
+
+    assert [str(chunk["Tolerated"].dtype) for chunk in chunks] == ["float32", "float32"]
+    assert [str(chunk["Exact"].dtype) for chunk in chunks] == ["float64", "float64"]
+
+
+def test_declared_tolerance_is_enforced(root):
+    df = pd.DataFrame({"Tolerated": [40000.1], "Exact": [1.0]})
+
+    with pytest.raises(ValueError, match="Tolerated"):
+        compact_dtypes(df, get_asset_spec("rows"))
+
+
+def test_compaction_halves_declared_columns(root):
+    df = pd.DataFrame({"Tolerated": np.linspace(-124.35, 41.95, 1000), "Exact": np.linspace(-124.35, 41.95, 1000)})
+
+    compacted = compact_dtypes(df, get_asset_spec("rows"))
+
+    assert compacted["Tolerated"].nbytes == df["Tolerated"].nbytes // 2
+    assert compacted["Exact"].dtype == np.float64
+    assert np.abs(compacted["Tolerated"].to_numpy(np.float64) - df["Tolerated"]).max() <= 1e-4
@@ -0,0 +1,191 @@
+import pytest
+
+pytest.importorskip("snowflake.snowpark")
+
+from helper.compute import NodeCompute, NodeUsage, WarehouseSizePlanner, suggest_size, warehouse_specs
+from helper.deploy import DeployPlanner, TaskSpec, WarehouseSpec
+
+DEFINITION = {
+    "light": {"function": "light", "compute": {"serverless": True, "initial_size": "X-Small", "timeout_ms": 1800000}},
+    "heavy": {"function": "heavy", "depends_on": ["light"], "compute": {"warehouse_size": "medium"}},
+    "plain": {"function": "plain", "depends_on": ["heavy"]},
+}
+
+
+def _task(compute: NodeCompute, **kwargs) -> TaskSpec:
+    return TaskSpec(name="task_de_node", body="CALL node_sproc();", **compute.task_options("COMPUTE_WH"), **kwargs)
+
+
+def test_task_render_orders_clauses():
+    task = TaskSpec(
+        name="task_de_node",
+        body="CALL node_sproc();",
+        warehouse="WH",
+        after=("task_de_a", "task_de_b"),
+        schedule="5 MINUTE",
+        parameters=(("USER_TASK_TIMEOUT_MS", 60000), ("SERVERLESS_TASK_MAX_STATEMENT_SIZE", "LARGE")),
+    )
+    assert task.render(comment="deploy_hash=abc") == "\n".join([
+        "CREATE OR REPLACE TASK task_de_node",
+        "WAREHOUSE = WH",
+        "SCHEDULE = '5 MINUTE'",
+        "USER_TASK_TIMEOUT_MS = 60000",
+        "SERVERLESS_TASK_MAX_STATEMENT_SIZE = 'LARGE'",
+        "COMMENT = 'deploy_hash=abc'",
+        "AFTER task_de_a, task_de_b",
+        "AS CALL node_sproc();",
+    ])
+
+
+def test_task_deploy_hash_follows_parameters():
+    task = TaskSpec(name="t", body="CALL s();", warehouse="WH")
+    timed = TaskSpec(name="t", body="CALL s();", warehouse="WH", parameters=(("USER_TASK_TIMEOUT_MS", 1),))
+    assert task.deploy_hash != timed.deploy_hash
+
+
+def test_default_compute_runs_on_the_default_warehouse():
+    assert NodeCompute.from_config(None).task_options("COMPUTE_WH") == {"warehouse": "COMPUTE_WH", "parameters": ()}
+    assert _task(NodeCompute()).render().splitlines()[1] == "WAREHOUSE = COMPUTE_WH"
+
+
+def test_named_warehouse():
+    compute = NodeCompute.from_config({"warehouse": "ETL_WH", "timeout_ms": 1000}, "node")
+    assert compute.warehouse_spec() is None
+    assert compute.task_options("COMPUTE_WH") == {"warehouse": "ETL_WH", "parameters": (("USER_TASK_TIMEOUT_MS", 1000),)}
+
+
+def test_sized_warehouse_is_shared_by_size():
+    compute = NodeCompute.from_config({"warehouse_size": "Medium"}, "node")
+    assert compute.task_options("COMPUTE_WH")["warehouse"] == "PIPELINE_WH_MEDIUM"
+    assert compute.warehouse_spec().render() == "\n".join([
+        "CREATE WAREHOUSE IF NOT EXISTS PIPELINE_WH_MEDIUM",
+        "WAREHOUSE_SIZE = MEDIUM",
+        "AUTO_SUSPEND = 60",
+        "AUTO_RESUME = TRUE",
+        "INITIALLY_SUSPENDED = TRUE",
+    ])
+
+
+def test_sized_named_warehouse():
+    compute = NodeCompute.from_config({"warehouse": "ETL_WH", "warehouse_size": "2X-Large"}, "node")
+    assert compute.warehouse_spec() == WarehouseSpec(name="ETL_WH", size="XXLARGE")
+    assert compute.task_options("COMPUTE_WH")["warehouse"] == "ETL_WH"
+
+
+def test_serverless_task_has_no_warehouse():
+    compute = NodeCompute.from_config(
+        {"serverless": True, "initial_size": "x-small", "timeout_ms": 1800000,
+         "task_parameters": {"TASK_AUTO_RETRY_ATTEMPTS": 2}},
+        "node"
+    )
+    assert compute.warehouse_spec() is None
+    assert compute.task_options("COMPUTE_WH") == {
+        "warehouse": None,
+        "parameters": (
+            ("USER_TASK_MANAGED_INITIAL_WAREHOUSE_SIZE", "XSMALL"),
+            ("USER_TASK_TIMEOUT_MS", 1800000),
+            ("TASK_AUTO_RETRY_ATTEMPTS", 2),
+        ),
+    }
+    assert _task(compute).render().splitlines()[1:4] == [
+        "USER_TASK_MANAGED_INITIAL_WAREHOUSE_SIZE = 'XSMALL'",
+        "USER_TASK_TIMEOUT_MS = 1800000",
+        "TASK_AUTO_RETRY_ATTEMPTS = 2",
+    ]
+
+
+@pytest.mark.parametrize("config", [
+    {"cluster": "ETL_WH"},
+    {"serverless": True, "warehouse": "ETL_WH"},
+    {"serverless": True, "warehouse_size": "SMALL"},
+    {"initial_size": "SMALL"},
+    {"warehouse_size": "HUGE"},
+    {"serverless": True, "initial_size": "X4LARGE"},
+    {"task_parameters": {"STATEMENT_TIMEOUT_IN_SECONDS": 10}},
+    {"task_parameters": {"USER_TASK_TIMEOUT_MS": 10}},
+])
+def test_invalid_compute_is_rejected(config):
+    with pytest.raises(ValueError):
+        NodeCompute.from_config(config, "node")
+
+
+def test_warehouse_specs_of_a_definition():
+    assert warehouse_specs(DEFINITION) == [WarehouseSpec(name="PIPELINE_WH_MEDIUM", size="MEDIUM")]
+
+
+@pytest.mark.parametrize("usage, expected", [
+    (NodeUsage("n", 5, 300.0, "Medium", remote_spill_bytes=1), "XLARGE"),
+    (NodeUsage("n", 5, 300.0, "Medium", local_spill_bytes=1), "LARGE"),
+    (NodeUsage("n", 5, 900.0, "Medium"), "LARGE"),
+    (NodeUsage("n", 5, 10.0, "Medium"), "SMALL"),
+    (NodeUsage("n", 5, 10.0, "X-Small"), "XSMALL"),
+    (NodeUsage("n", 5, 300.0, "Medium"), "MEDIUM"),
+    (NodeUsage("n", 0, 0.0, None), None),
+])
+def test_suggest_size(usage, expected):
+    assert suggest_size(usage) == expected
+
+
+def test_size_planner_leaves_serverless_nodes_alone():
+    planner = WarehouseSizePlanner(None, DEFINITION, "de")
+    assert "'TASK_DE_LIGHT', 'TASK_DE_HEAVY', 'TASK_DE_PLAIN'" in planner.history_sql()
+
+    usage = planner.usage_from_rows([
+        {"NAME": "TASK_DE_LIGHT", "RUNS": 3, "MEDIAN_SECONDS": 900, "WAREHOUSE_SIZE": "X-Small",
+         "LOCAL_SPILL_BYTES": 0, "REMOTE_SPILL_BYTES": 0},
+        {"NAME": "TASK_DE_HEAVY", "RUNS": 3, "MEDIAN_SECONDS": 120, "WAREHOUSE_SIZE": "Medium",
+         "LOCAL_SPILL_BYTES": 10, "REMOTE_SPILL_BYTES": 0},
+    ])
+    assert planner.suggest(usage) == {"heavy": "LARGE"}
+
+    definition = planner.apply({"light": "LARGE", "heavy": "LARGE"})
+    assert definition["heavy"]["compute"]["warehouse_size"] == "LARGE"
+    assert "warehouse_size" not in definition["light"]["compute"]
+    assert DEFINITION["heavy"]["compute"]["warehouse_size"] == "medium"
+
+
+class _Rows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def collect(self):
+        return self.rows
+
+    def collect_nowait(self):
+        return self
+
+    def result(self):
+        return self.rows
+
+
+class WarehouseSession:
+    """
+    Session answering SHOW WAREHOUSES and recording the statements it runs.
+    """
+
+    def __init__(self, warehouses):
+        self.warehouses = warehouses
+        self.queries = []
+
+    def sql(self, query: str):
+        self.queries.append(query)
+        if query == "SHOW WAREHOUSES":
+            return _Rows([{"name": name, "size": size} for name, size in self.warehouses.items()])
+        return _Rows([])
+
+
+def test_existing_warehouse_of_another_size_is_resized():
+    session = WarehouseSession({"ETL_WH": "X-Small", "PIPELINE_WH_MEDIUM": "Medium"})
+    planner = DeployPlanner(session, database="DB", schema="S")
+
+    plan = planner.plan(warehouses=[
+        WarehouseSpec(name="ETL_WH", size="MEDIUM"),
+        WarehouseSpec(name="PIPELINE_WH_MEDIUM", size="MEDIUM"),
+        WarehouseSpec(name="NEW_WH", size="SMALL"),
+    ])
+    assert plan.resizes == [WarehouseSpec(name="ETL_WH", size="MEDIUM")]
+    assert plan.warehouses == [WarehouseSpec(name="NEW_WH", size="SMALL")]
+
+    planner.apply(plan)
+    assert "ALTER WAREHOUSE ETL_WH SET WAREHOUSE_SIZE = MEDIUM" in session.queries
+    assert not any(query.startswith("ALTER WAREHOUSE PIPELINE_WH_MEDIUM") for query in session.queries)
@@ -0,0 +1,79 @@
+import hashlib
+import io
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+pytest.importorskip("snowflake.snowpark")
+
+from helper.fingerprint import fingerprinted
+from helper.stage_mirror import get_stage_mirror
+
+CATALOGUE = """
+source:
+  local_path: {root}/source.csv
+  target_path: "@test_stage/source.csv"
+
+result:
+  local_path: {root}/result.csv
+  target_path: "@test_stage/result.csv"
+"""
+
+
+class _Rows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def collect(self):
+        return self.rows
+
+
+class StageSession:
+    """
+    Session answering LIST and stage downloads from an in-memory stage.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.file = self
+
+    def sql(self, query: str):
+        assert query.startswith("LIST "), query
+        return _Rows([
+            {"name": name, "size": len(data), "md5": hashlib.md5(data).hexdigest(), "last_modified": "Mon, 1 Jan 2024 00:00:00 GMT"}
+            for name, data in self.files.items()
+        ])
+
+    def get_stream(self, stage_file: str):
+        return io.BytesIO(self.files[stage_file.lstrip("@")])
+
+
+@pytest.fixture
+def root(tmp_path, install_catalogue):
+    install_catalogue(CATALOGUE.format(root=tmp_path.as_posix()))
+    get_stage_mirror().invalidate()
+    yield tmp_path
+    get_stage_mirror().invalidate()
+
+
+def test_changed_stage_input_is_mirrored_before_fingerprinting(root):
+    runs = []
+
+    @fingerprinted
+    def node(session, input_data, output_data, is_local):
+        data = (root / "source.csv").read_text()
+        runs.append(data)
+        (root / "result.csv").write_text(data)
+
+    session = StageSession()
+    session.files["test_stage/source.csv"] = b"a\n1\n"
+    node(session, ["source"], ["result"], True)
+    node(session, ["source"], ["result"], True)
+    assert runs == ["a\n1\n"]
+
+    # The stage copy changes, the local one is stale until the mirror syncs it
+    session.files["test_stage/source.csv"] = b"a\n2\n"
+    get_stage_mirror().invalidate()
+    node(session, ["source"], ["result"], True)
+    assert runs == ["a\n1\n", "a\n2\n"]
@@ -0,0 +1,173 @@
+import json
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+pytest.importorskip("snowflake.snowpark")
+
+from snowflake.snowpark.functions import col
+
+from helper.incremental import IncrementalReader
+
+# Mixed-case columns, as in the shipped catalogue
+CATALOGUE = """
+events:
+  local_path: {root}/events.csv
+  target_path: "@test_stage/events.csv"
+  incremental:
+    strategy: key
+    key: RowId
+  columns:
+    RowId: int64
+    AveRooms: float64
+
+parts:
+  local_path: {root}/parts
+  target_path: "@test_stage/parts/"
+  is_folder: True
+  incremental:
+    strategy: files
+  columns:
+    RowId: int64
+    AveRooms: float64
+
+log:
+  local_path: {root}/log.csv
+  target_path: "@test_stage/log.csv"
+  incremental:
+    strategy: files
+    append_only: True
+  columns:
+    RowId: int64
+    AveRooms: float64
+
+out:
+  local_path: {root}/out/out.csv
+  target_path: "@test_stage/out/"
+"""
+
+
+@pytest.fixture
+def root(tmp_path, install_catalogue):
+    install_catalogue(CATALOGUE.format(root=tmp_path.as_posix()))
+    return tmp_path
+
+
+def _write(path, ids):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({"RowId": ids, "AveRooms": [float(i) for i in ids]}).to_csv(path, index=False)
+
+
+def _ids(df) -> list:
+    # Resolved the way node code refers to catalogue columns
+    rows = df.select(col("RowId"), col("AveRooms")).collect()
+    assert all(float(row[0]) == row[1] for row in rows)
+    return sorted(int(row[0]) for row in rows)
+
+
+def _reader(session, input_data, mode="incremental") -> IncrementalReader:
+    return IncrementalReader("node", input_data, ["out"], session, True, mode=mode)
+
+
+def _watermarks(root) -> dict:
+    with open(root / "out" / ".node.watermarks.json") as f:
+        return json.load(f)["assets"]
+
+
+def test_key_strategy_reads_rows_above_the_watermark(root, local_session):
+    _write(root / "events.csv", [1, 2, 3])
+    reader = _reader(local_session, ["events"])
+    assert reader.full_refresh
+    assert _ids(reader.read("events")) == [1, 2, 3]
+    reader.commit()
+    assert int(_watermarks(root)["events"]["watermark"]) == 3
+
+    _write(root / "events.csv", [1, 2, 3, 4, 5])
+    reader = _reader(local_session, ["events"])
+    assert not reader.full_refresh
+    assert _ids(reader.read("events")) == [4, 5]
+    reader.commit()
+    assert int(_watermarks(root)["events"]["watermark"]) == 5
+
+
+def test_key_watermark_is_kept_until_commit(root, local_session):
+    _write(root / "events.csv", [1, 2])
+    reader = _reader(local_session, ["events"])
+    reader.read("events")
+    reader.commit()
+
+    _write(root / "events.csv", [1, 2, 3])
+    _reader(local_session, ["events"]).read("events")  # failed run, never committed
+
+    assert _ids(_reader(local_session, ["events"]).read("events")) == [3]
+
+
+def test_full_mode_ignores_watermarks(root, local_session):
+    _write(root / "events.csv", [1, 2])
+    reader = _reader(local_session, ["events"])
+    reader.read("events")
+    reader.commit()
+
+    reader = _reader(local_session, ["events"], mode="full")
+    assert reader.full_refresh
+    assert _ids(reader.read("events")) == [1, 2]
+
+
+def test_files_strategy_reads_new_files_only(root, local_session):
+    _write(root / "parts" / "a.csv", [1, 2])
+    reader = _reader(local_session, ["parts"])
+    assert _ids(reader.read("parts")) == [1, 2]
+    reader.commit()
+    assert set(_watermarks(root)["parts"]["files"]) == {"a.csv"}
+
+    _write(root / "parts" / "b.csv", [3])
+    reader = _reader(local_session, ["parts"])
+    assert not reader.full_refresh
+    assert _ids(reader.read("parts")) == [3]
+    reader.commit()
+    assert set(_watermarks(root)["parts"]["files"]) == {"a.csv", "b.csv"}
+
+
+def test_files_strategy_refreshes_when_a_file_is_rewritten(root, local_session):
+    _write(root / "parts" / "a.csv", [1, 2])
+    reader = _reader(local_session, ["parts"])
+    reader.read("parts")
+    reader.commit()
+
+    _write(root / "parts" / "a.csv", [1, 2, 9])
+    reader = _reader(local_session, ["parts"])
+    assert reader.full_refresh
+    assert _ids(reader.read("parts")) == [1, 2, 9]
+
+
+def test_append_only_files_read_rows_past_the_last_read_row(root, local_session):
+    _write(root / "log.csv", [1, 2, 3])
+    reader = _reader(local_session, ["log"])
+    reader.read("log")
+    reader.commit()
+    assert _watermarks(root)["log"]["files"]["log.csv"]["last_row"] == 3
+
+    _write(root / "log.csv", [1, 2, 3, 4, 5])
+    reader = _reader(local_session, ["log"])
+    assert not reader.full_refresh
+    assert _ids(reader.read("log")) == [4, 5]
+    reader.commit()
+    assert _watermarks(root)["log"]["files"]["log.csv"]["last_row"] == 5
+
+
+def test_append_only_tail_has_the_catalogue_schema(root, local_session):
+    _write(root / "log.csv", [1, 2])
+    reader = _reader(local_session, ["log"])
+    full = reader.read("log")
+    reader.commit()
+
+    _write(root / "log.csv", [1, 2, 3])
+    tail = _reader(local_session, ["log"]).read("log")
+    assert tail.columns == full.columns
+    assert _ids(full.union_all_by_name(tail)) == [1, 2, 3]
+
+
+def test_batch_ids_of_runs_started_together_differ(root, local_session):
+    _write(root / "events.csv", [1])
+    assert _reader(local_session, ["events"]).batch_id != _reader(local_session, ["events"]).batch_id
@@ -0,0 +1,43 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("snowflake.snowpark")
+
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+
+from helper.model_sql import prediction_parity, regression_metrics
+
+# Upper-case names, as unquoted Snowflake identifiers resolve
+FEATURES = ["X1", "X2", "X3"]
+TARGET = "TARGET"
+
+
+@pytest.fixture
+def data() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(200, len(FEATURES))), columns=FEATURES)
+    df[TARGET] = df.to_numpy() @ np.array([1.5, -2.0, 0.25]) + 0.5 + rng.normal(scale=0.1, size=len(df))
+    return df
+
+
+@pytest.fixture
+def model(data: pd.DataFrame) -> LinearRegression:
+    return LinearRegression().fit(data[FEATURES], data[TARGET])
+
+
+def test_prediction_parity_with_sklearn_predict(local_session, data, model):
+    max_diff = prediction_parity(local_session.create_dataframe(data), model, sample_rows=50)
+
+    assert max_diff <= 1e-6
+
+
+def test_regression_metrics_match_sklearn(local_session, data, model):
+    scores = regression_metrics(local_session.create_dataframe(data), model, TARGET)
+
+    y_pred = model.predict(data[FEATURES])
+    assert scores["n_rows"] == len(data)
+    assert scores["rmse"] == pytest.approx(np.sqrt(mean_squared_error(data[TARGET], y_pred)), rel=1e-9)
+    assert scores["r2"] == pytest.approx(r2_score(data[TARGET], y_pred), rel=1e-9)
@@ -0,0 +1,67 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("numpy")
+pytest.importorskip("pyarrow")
+pytest.importorskip("snowflake.snowpark")
+
+from snowflake.snowpark.functions import col
+
+from de_pipeline.nodes.process_data import join_housing_lookup, join_housing_lookup_indexed
+from helper.data_helper import read_snowpark
+
+# Mixed-case columns, as in the shipped catalogue
+CATALOGUE = """
+processed_housing:
+  local_path: {root}/processed_housing.csv
+  target_path: "@test_stage/processed_housing.csv"
+  columns:
+    HouseAge: float64
+    row_key: int64
+
+lookup:
+  local_path: {root}/lookup.csv
+  target_path: "@test_stage/lookup.csv"
+  columns:
+    MedInc: float64
+    row_key: int64
+
+mastertable:
+  local_path: {root}/mastertable.csv
+  target_path: "@test_stage/mastertable.csv"
+  columns:
+    HouseAge: float64
+    MedInc: float64
+"""
+
+
+@pytest.fixture
+def housing(tmp_path, install_catalogue, local_session):
+    install_catalogue(CATALOGUE.format(root=tmp_path.as_posix()))
+    pd.DataFrame({"HouseAge": [10.0, 20.0, 30.0], "row_key": [-7, 3, 11]}).to_csv(
+        tmp_path / "processed_housing.csv", index=False
+    )
+    # Shuffled, with a key no housing row has
+    pd.DataFrame({"MedInc": [1.1, 3.3, 2.2, 9.9], "row_key": [-7, 11, 3, 42]}).to_csv(
+        tmp_path / "lookup.csv", index=False
+    )
+    return read_snowpark(local_session, "processed_housing", tmp_path / "processed_housing.csv")
+
+
+def _rows(df) -> list:
+    return sorted(tuple(row) for row in df.select(col("HouseAge"), col("MedInc")).collect())
+
+
+def test_indexed_join_of_snowpark_read_housing(housing, local_session, tmp_path):
+    mastertable = join_housing_lookup_indexed(local_session, housing, None)
+
+    assert _rows(mastertable) == [(10.0, 1.1), (20.0, 2.2), (30.0, 3.3)]
+    assert (tmp_path / ".lookup.index.npz").exists()
+
+
+def test_indexed_join_matches_the_snowpark_join(housing, local_session, tmp_path):
+    lookup = read_snowpark(local_session, "lookup", tmp_path / "lookup.csv")
+
+    indexed = join_housing_lookup_indexed(local_session, housing, None)
+    assert _rows(indexed) == _rows(join_housing_lookup(housing, lookup))
+    assert indexed.columns == ["HOUSEAGE", "MEDINC"]
@@ -0,0 +1,32 @@
+import sys
+
+import pytest
+
+from helper.registry import node_parameters
+
+PROCESS_DATA = "de_pipeline.nodes.process_data:process_data"
+
+
+def test_lazy_reference_parameters_are_read_without_importing():
+    sys.modules.pop("de_pipeline.nodes.process_data", None)
+
+    assert node_parameters(PROCESS_DATA) == ["session", "input_data", "output_data", "is_local", "mode"]
+    assert "de_pipeline.nodes.process_data" not in sys.modules
+
+
+def test_callable_parameters():
+    def node(input_data, output_data, is_local, *, fold=0):
+        pass
+
+    assert node_parameters(node) == ["input_data", "output_data", "is_local", "fold"]
+
+
+def test_process_pool_rejects_lazy_session_nodes_before_dispatch():
+    pytest.importorskip("snowflake.snowpark")
+    from helper.local_executor import LocalPipelineExecutor
+
+    definition = {"process_data": {"function": "process_data", "params": {}}}
+    executor = LocalPipelineExecutor(definition, {"process_data": PROCESS_DATA}, executor_type="process")
+
+    with pytest.raises(ValueError, match="needs a Snowpark session"):
+        executor.run()
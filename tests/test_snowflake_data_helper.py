@@ -0,0 +1,76 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+pytest.importorskip("snowflake.snowpark")
+
+from helper import snowflake_data_helper
+from helper.snowflake_data_helper import SnowflakeDataHelper
+
+
+class _Rows:
+    def collect(self):
+        return [{"name": "MY_STAGE"}]
+
+
+class RecordingSession:
+    """
+    Session recording the SQL it runs and the stage files it uploads.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.uploads = []
+        self.file = self
+
+    def sql(self, query: str):
+        self.queries.append(query)
+        return _Rows()
+
+    def put_stream(self, buffer, stage_file, auto_compress=False, overwrite=False):
+        self.uploads.append(stage_file)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setattr(snowflake_data_helper, "_part_counts", {})
+    return RecordingSession()
+
+
+def _save(session, rows: int, stage_path: str = "@my_stage/03_primary/mastertable/", name: str = "mastertable.csv"):
+    SnowflakeDataHelper(session).save_dataframe(
+        pd.DataFrame({"A": range(rows)}), name, stage_path, file_type="csv", chunk_rows=2
+    )
+
+
+def _removes(session) -> list:
+    return [query for query in session.queries if query.startswith("REMOVE")]
+
+
+def test_single_files_never_split_are_not_cleared(session):
+    SnowflakeDataHelper(session).save_dataframe(pd.DataFrame({"A": [1]}), "x.csv", "@my_stage/04_model_input/")
+
+    assert _removes(session) == []
+    assert session.uploads == ["@my_stage/04_model_input/x.csv"]
+
+
+def test_saves_only_clear_when_an_earlier_save_left_more_parts(session):
+    _save(session, 5)  # unknown to this process, a previous run may have left parts
+    assert len(_removes(session)) == 1
+    assert session.uploads[-3:] == [f"@my_stage/03_primary/mastertable/mastertable_part0000{i}.csv" for i in range(3)]
+
+    _save(session, 6)  # three parts again, all overwritten
+    _save(session, 8)  # four parts, a superset
+    assert len(_removes(session)) == 1
+
+    _save(session, 3)  # two parts, part 3 would be left behind
+    _save(session, 1)  # single file next to parts
+    assert len(_removes(session)) == 3
+
+
+def test_remove_pattern_is_escaped_and_anchored(session):
+    _save(session, 1, stage_path="@my_stage/", name="a.b+1.csv")
+
+    assert _removes(session) == [
+        "REMOVE @my_stage/ PATTERN = '[^/]+/a\\\\.b\\\\+1(_part[0-9]+)?[.]csv'"
+    ]